@@ -6,26 +6,58 @@ pragma solidity 0.6.12;
 pragma experimental ABIEncoderV2;
 
 import "./MorphoStrategy.sol";
+import "../interfaces/IPriceOracleGetter.sol";
 import "../interfaces/lens/ILensAave.sol";
 
-contract MorphoAaveStrategy is MorphoStrategy {
+abstract contract BaseMorphoAaveStrategy is MorphoStrategy {
     // used to downscale APR value to match Compound APR precision
     uint256 private constant COMPOUND_DOWNSCALE = 10**9;
+    // Aave price oracle used for converting gas cost to `want`
+    IPriceOracleGetter public immutable priceOracle;
 
     constructor(
         address _vault,
         address _poolToken,
-        string memory _strategyName
+        string memory _strategyName,
+        address _morpho,
+        address _lens,
+        address _morphoToken,
+        address _priceOracle
     )
         public
         MorphoStrategy(
             _vault,
             _poolToken,
             _strategyName,
-            0x777777c9898D384F785Ee44Acfe945efDFf5f3E0,
-            0x507fA343d0A90786d86C7cd885f5C49263A91FF4
+            _morpho,
+            _lens,
+            _morphoToken
         )
-    {}
+    {
+        priceOracle = IPriceOracleGetter(_priceOracle);
+    }
+
+    /**
+     * @notice
+     *  Converts `_amtInWei` to `want` with `want` price in ETH from Aave price oracle.
+     * @param _amtInWei The amount (in wei/1e-18 ETH) to convert to `want`
+     * @return The amount in `want` of `_amtInEth` converted to `want`
+     **/
+    function ethToWant(uint256 _amtInWei)
+        public
+        view
+        override
+        returns (uint256)
+    {
+        if (_amtInWei == 0) {
+            return 0;
+        }
+        uint256 wantPriceInEth = priceOracle.getAssetPrice(address(want));
+        if (wantPriceInEth == 0) {
+            return 0;
+        }
+        return _amtInWei.mul(10**vault.decimals()).div(wantPriceInEth);
+    }
 
     function getSupplyBalancesForAmount(uint256 _amount)
         public
@@ -44,4 +76,63 @@ contract MorphoAaveStrategy is MorphoStrategy {
             .getNextUserSupplyRatePerYear(poolToken, address(this), _amount);
         _apr = nextSupplyRatePerYear.div(COMPOUND_DOWNSCALE);
     }
+
+    function getSupplyRates()
+        public
+        view
+        override
+        returns (uint256 _p2pSupplyApr, uint256 _poolSupplyApr)
+    {
+        (_p2pSupplyApr, , _poolSupplyApr, ) = ILensAave(address(lens))
+            .getRatesPerYear(poolToken);
+        _p2pSupplyApr = _p2pSupplyApr.div(COMPOUND_DOWNSCALE);
+        _poolSupplyApr = _poolSupplyApr.div(COMPOUND_DOWNSCALE);
+    }
+}
+
+contract MorphoAaveStrategy is BaseMorphoAaveStrategy {
+    constructor(
+        address _vault,
+        address _poolToken,
+        string memory _strategyName
+    )
+        public
+        BaseMorphoAaveStrategy(
+            _vault,
+            _poolToken,
+            _strategyName,
+            0x777777c9898D384F785Ee44Acfe945efDFf5f3E0,
+            0x507fA343d0A90786d86C7cd885f5C49263A91FF4,
+            0x9994E35Db50125E0DF82e4c2dde62496CE330999,
+            0xA50ba011c48153De246E5192C8f9258A2ba79Ca9
+        )
+    {}
+}
+
+/**
+ * @notice
+ *  Same as MorphoAaveStrategy with Morpho, Lens, MORPHO token and price oracle addresses set in constructor.
+ *  Used for deployments on other networks and local mocks, see contracts/mocks.
+ */
+contract MorphoAaveStrategyConfigurable is BaseMorphoAaveStrategy {
+    constructor(
+        address _vault,
+        address _poolToken,
+        string memory _strategyName,
+        address _morpho,
+        address _lens,
+        address _morphoToken,
+        address _priceOracle
+    )
+        public
+        BaseMorphoAaveStrategy(
+            _vault,
+            _poolToken,
+            _strategyName,
+            _morpho,
+            _lens,
+            _morphoToken,
+            _priceOracle
+        )
+    {}
 }
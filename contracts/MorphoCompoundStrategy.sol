@@ -9,18 +9,27 @@ import "./MorphoStrategy.sol";
 import "../interfaces/IUniswapV2Router01.sol";
 import "../interfaces/lens/ILensCompound.sol";
 
-contract MorphoCompoundStrategy is MorphoStrategy {
+abstract contract BaseMorphoCompoundStrategy is MorphoStrategy {
+    // Addresses of Morpho contracts, reward tokens and routers for swapping COMP
+    struct CompoundAddresses {
+        address morpho;
+        address lens;
+        address morphoToken;
+        address comp;
+        address weth;
+        address uniV2Router;
+        address sushiV2Router;
+    }
+
     // Router used for swapping reward token (COMP)
     IUniswapV2Router01 public currentV2Router;
     // Minimum amount of COMP to be claimed or sold
     uint256 public minCompToClaimOrSell = 0.1 ether;
 
-    address private constant COMP = 0xc00e94Cb662C3520282E6f5717214004A7f26888;
-    address private constant WETH = 0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2;
-    IUniswapV2Router01 private constant UNI_V2_ROUTER =
-        IUniswapV2Router01(0x7a250d5630B4cF539739dF2C5dAcb4c659F2488D);
-    IUniswapV2Router01 private constant SUSHI_V2_ROUTER =
-        IUniswapV2Router01(0xd9e1cE17f2641f24aE83637ab66a2cca9C378B9F);
+    address private immutable COMP;
+    address private immutable WETH;
+    IUniswapV2Router01 private immutable UNI_V2_ROUTER;
+    IUniswapV2Router01 private immutable SUSHI_V2_ROUTER;
 
     // use aave metric for seconds per year: https://docs.aave.com/developers/v/2.0/guides/apy-and-apr#compute-data
     // block per year = seconds per year / 12 = 31536000 / 12 = 2628000
@@ -29,22 +38,29 @@ contract MorphoCompoundStrategy is MorphoStrategy {
     constructor(
         address _vault,
         address _poolToken,
-        string memory _strategyName
+        string memory _strategyName,
+        CompoundAddresses memory _addresses
     )
         public
         MorphoStrategy(
             _vault,
             _poolToken,
             _strategyName,
-            0x8888882f8f843896699869179fB6E4f7e3B58888,
-            0x930f1b46e1D081Ec1524efD95752bE3eCe51EF67
+            _addresses.morpho,
+            _addresses.lens,
+            _addresses.morphoToken
         )
     {
-        currentV2Router = SUSHI_V2_ROUTER;
-        IERC20 comp = IERC20(COMP);
+        COMP = _addresses.comp;
+        WETH = _addresses.weth;
+        UNI_V2_ROUTER = IUniswapV2Router01(_addresses.uniV2Router);
+        SUSHI_V2_ROUTER = IUniswapV2Router01(_addresses.sushiV2Router);
+        // immutables cannot be read in constructor
+        currentV2Router = IUniswapV2Router01(_addresses.sushiV2Router);
+        IERC20 comp = IERC20(_addresses.comp);
         // COMP max allowance is uint96
-        comp.safeApprove(address(SUSHI_V2_ROUTER), type(uint96).max);
-        comp.safeApprove(address(UNI_V2_ROUTER), type(uint96).max);
+        comp.safeApprove(_addresses.sushiV2Router, type(uint96).max);
+        comp.safeApprove(_addresses.uniV2Router, type(uint96).max);
     }
 
     // ---------------------- MorphoStrategy overriden contract function ----------------
@@ -95,6 +111,85 @@ contract MorphoCompoundStrategy is MorphoStrategy {
         _apr = nextSupplyRatePerBlock.mul(BLOCKS_PER_YEAR);
     }
 
+    function getSupplyRates()
+        public
+        view
+        override
+        returns (uint256 _p2pSupplyApr, uint256 _poolSupplyApr)
+    {
+        (_p2pSupplyApr, , _poolSupplyApr, ) = ILensCompound(address(lens))
+            .getRatesPerBlock(poolToken);
+        _p2pSupplyApr = _p2pSupplyApr.mul(BLOCKS_PER_YEAR);
+        _poolSupplyApr = _poolSupplyApr.mul(BLOCKS_PER_YEAR);
+    }
+
+    /**
+     * @notice
+     *  Converts `_amtInWei` to `want` with WETH to `want` price of the current swap router.
+     * @param _amtInWei The amount (in wei/1e-18 ETH) to convert to `want`
+     * @return The amount in `want` of `_amtInEth` converted to `want`
+     **/
+    function ethToWant(uint256 _amtInWei)
+        public
+        view
+        override
+        returns (uint256)
+    {
+        if (_amtInWei == 0 || address(want) == WETH) {
+            return _amtInWei;
+        }
+        uint256[] memory amounts = currentV2Router.getAmountsOut(
+            _amtInWei,
+            getTokenOutPathV2(WETH, address(want))
+        );
+        return amounts[amounts.length - 1];
+    }
+
+    /**
+     * @notice
+     *  Value of COMP in `want`, priced by the current swap router.
+     * @dev Value is the same when COMP is sold by ySwap TradeFactory.
+     * @param _amount amount of COMP
+     * @return `_amount` of COMP priced in `want`
+     */
+    function rewardsToWant(uint256 _amount)
+        public
+        view
+        override
+        returns (uint256)
+    {
+        if (_amount == 0) {
+            return 0;
+        }
+        uint256[] memory amounts = currentV2Router.getAmountsOut(
+            _amount,
+            getTokenOutPathV2(COMP, address(want))
+        );
+        return amounts[amounts.length - 1];
+    }
+
+    /**
+     * @notice
+     *  COMP held by the strategy and unclaimed COMP that harvest claims.
+     * @dev
+     *  Harvest claims COMP above `minCompToClaimOrSell`. Without ySwap, harvest sells COMP only above
+     *  `minCompToClaimOrSell`, ySwap TradeFactory sells any amount.
+     * @return amount of COMP turned into `want` by next harvest or ySwap
+     */
+    function getRewardsToSell() public view override returns (uint256) {
+        uint256 unclaimed = getUnclaimedRewards();
+        uint256 compBalance = IERC20(COMP).balanceOf(address(this));
+        if (unclaimed > minCompToClaimOrSell) {
+            compBalance = compBalance.add(unclaimed);
+        }
+        if (
+            tradeFactory == address(0) && compBalance <= minCompToClaimOrSell
+        ) {
+            return 0;
+        }
+        return compBalance;
+    }
+
     function protectedTokens()
         internal
         view
@@ -162,7 +257,7 @@ contract MorphoCompoundStrategy is MorphoStrategy {
 
     function getTokenOutPathV2(address _tokenIn, address _tokenOut)
         internal
-        pure
+        view
         returns (address[] memory _path)
     {
         bool isWeth = _tokenIn == address(WETH) || _tokenOut == address(WETH);
@@ -188,3 +283,49 @@ contract MorphoCompoundStrategy is MorphoStrategy {
         super._removeTradeFactoryPermissions();
     }
 }
+
+contract MorphoCompoundStrategy is BaseMorphoCompoundStrategy {
+    constructor(
+        address _vault,
+        address _poolToken,
+        string memory _strategyName
+    )
+        public
+        BaseMorphoCompoundStrategy(
+            _vault,
+            _poolToken,
+            _strategyName,
+            BaseMorphoCompoundStrategy.CompoundAddresses(
+                0x8888882f8f843896699869179fB6E4f7e3B58888,
+                0x930f1b46e1D081Ec1524efD95752bE3eCe51EF67,
+                0x9994E35Db50125E0DF82e4c2dde62496CE330999,
+                0xc00e94Cb662C3520282E6f5717214004A7f26888,
+                0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2,
+                0x7a250d5630B4cF539739dF2C5dAcb4c659F2488D,
+                0xd9e1cE17f2641f24aE83637ab66a2cca9C378B9F
+            )
+        )
+    {}
+}
+
+/**
+ * @notice
+ *  Same as MorphoCompoundStrategy with Morpho, Lens, reward tokens and swap routers set in constructor.
+ *  Used for deployments on other networks and local mocks, see contracts/mocks.
+ */
+contract MorphoCompoundStrategyConfigurable is BaseMorphoCompoundStrategy {
+    constructor(
+        address _vault,
+        address _poolToken,
+        string memory _strategyName,
+        CompoundAddresses memory _addresses
+    )
+        public
+        BaseMorphoCompoundStrategy(
+            _vault,
+            _poolToken,
+            _strategyName,
+            _addresses
+        )
+    {}
+}
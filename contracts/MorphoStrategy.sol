@@ -30,8 +30,8 @@ abstract contract MorphoStrategy is BaseStrategy {
 
     address public rewardsDistributor =
         0x3B14E5C73e0A56D607A8688098326fD4b4292135;
-    address public constant MORPHO_TOKEN =
-        0x9994E35Db50125E0DF82e4c2dde62496CE330999;
+    // MORPHO token, rewards from Morpho protocol
+    address public immutable MORPHO_TOKEN;
 
     // ySwap TradeFactory:
     address public tradeFactory;
@@ -43,19 +43,49 @@ abstract contract MorphoStrategy is BaseStrategy {
     address public immutable poolToken;
     // Max gas used for matching with p2p deals
     uint256 public maxGasForMatching = 100000;
+    // Min period in seconds between rematches of supply on pool, P2P rate gain is counted over it, 0 disables rematching
+    uint256 public rematchPeriod = 7 days;
+    // Min gain in `want` of P2P rate over pool rate during `rematchPeriod` that pays for gas of rematching
+    uint256 public minRematchGain;
+    // Timestamp of the last rematch in `tend()`
+    uint256 public lastRematch;
+    // Max amount of want supplied in one harvest or tend, 0 supplies all idle want at once
+    uint256 public supplyChunkSize;
     string internal strategyName;
 
+    uint256 private constant SECONDS_PER_YEAR = 31536000;
+    // Max number of chunks returned by `getSupplyChunks`
+    uint256 private constant MAX_SUPPLY_CHUNKS = 20;
+
+    // All strategy metrics returned by `getStrategyMetrics` in one call
+    struct StrategyMetrics {
+        uint256 wantBalance;
+        uint256 balanceOnPool;
+        uint256 balanceInP2P;
+        uint256 totalSupplyBalance;
+        uint256 estimatedTotalAssets;
+        uint256 p2pSupplyAmount;
+        uint256 p2pBorrowAmount;
+        uint256 poolSupplyAmount;
+        uint256 poolBorrowAmount;
+        uint256 maxP2PSupply;
+        uint256 unclaimedRewards;
+        uint256 apr;
+    }
+
     constructor(
         address _vault,
         address _poolToken,
         string memory _strategyName,
         address _morpho,
-        address _lens
+        address _lens,
+        address _morphoToken
     ) public BaseStrategy(_vault) {
         poolToken = _poolToken;
         strategyName = _strategyName;
         lens = ILens(_lens);
         morpho = IMorpho(_morpho);
+        MORPHO_TOKEN = _morphoToken;
         want.safeApprove(_morpho, type(uint256).max);
     }
 
@@ -82,13 +112,18 @@ abstract contract MorphoStrategy is BaseStrategy {
         )
     {
         uint256 totalDebt = vault.strategies(address(this)).totalDebt;
-        uint256 totalAssetsAfterProfit = estimatedTotalAssets();
+        // supply balance is fetched from lens once and reused for liquidating position
+        uint256 wantBalance = want.balanceOf(address(this));
+        uint256 supplyBalance = getTotalSupplyBalance();
+        uint256 totalAssetsAfterProfit = wantBalance.add(supplyBalance);
         _profit = totalAssetsAfterProfit > totalDebt
             ? totalAssetsAfterProfit.sub(totalDebt)
             : 0;
 
-        (_debtPayment, _loss) = liquidatePosition(
-            _debtOutstanding.add(_profit)
+        (_debtPayment, _loss) = _liquidatePosition(
+            _debtOutstanding.add(_profit),
+            wantBalance,
+            supplyBalance
         );
         _debtPayment = Math.min(_debtPayment, _debtOutstanding);
 
@@ -104,12 +139,30 @@ abstract contract MorphoStrategy is BaseStrategy {
 
     // NOTE: Try to adjust positions so that `_debtOutstanding` can be freed up on *next* harvest (not immediately)
     function adjustPosition(uint256 _debtOutstanding) internal override {
-        uint256 wantBalance = want.balanceOf(address(this));
-        if (wantBalance > _debtOutstanding) {
+        uint256 toSupply = _getIdleWant(_debtOutstanding);
+        uint256 chunkSize = supplyChunkSize == 0
+            ? type(uint256).max
+            : supplyChunkSize;
+        // only tend rematches, harvest fetches supply balance from lens once
+        if (msg.sig == this.tend.selector && toSupply < chunkSize) {
+            // supply on pool that can be matched P2P is withdrawn and supplied again with idle want
+            uint256 rematchAmount = Math.min(
+                _getRematchAmount(),
+                chunkSize.sub(toSupply)
+            );
+            if (rematchAmount > 0) {
+                lastRematch = block.timestamp;
+                morpho.withdraw(poolToken, rematchAmount);
+                toSupply = toSupply.add(rematchAmount);
+            }
+        }
+        // each chunk gets its own `maxGasForMatching`, the rest is supplied by next tends
+        toSupply = Math.min(toSupply, chunkSize);
+        if (toSupply > 0) {
             morpho.supply(
                 poolToken,
                 address(this),
-                wantBalance.sub(_debtOutstanding),
+                toSupply,
                 maxGasForMatching
             );
         }
@@ -121,10 +174,31 @@ abstract contract MorphoStrategy is BaseStrategy {
         returns (uint256 _liquidatedAmount, uint256 _loss)
     {
         uint256 wantBalance = want.balanceOf(address(this));
-        if (_amountNeeded > wantBalance) {
+        // lens is called only if there is not enough want
+        return
+            _liquidatePosition(
+                _amountNeeded,
+                wantBalance,
+                _amountNeeded > wantBalance ? getTotalSupplyBalance() : 0
+            );
+    }
+
+    /**
+     * @notice
+     *  Withdraws from Morpho amount of want needed above the current want balance.
+     * @param _amountNeeded amount of `want` to free up
+     * @param _wantBalance current `want` balance of the strategy
+     * @param _supplyBalance current supply balance in Morpho, needed only if `_amountNeeded` is above `_wantBalance`
+     */
+    function _liquidatePosition(
+        uint256 _amountNeeded,
+        uint256 _wantBalance,
+        uint256 _supplyBalance
+    ) internal returns (uint256 _liquidatedAmount, uint256 _loss) {
+        if (_amountNeeded > _wantBalance) {
             _liquidatedAmount = Math.min(
-                _amountNeeded.sub(wantBalance),
-                getTotalSupplyBalance()
+                _amountNeeded.sub(_wantBalance),
+                _supplyBalance
             );
             morpho.withdraw(poolToken, _liquidatedAmount);
             _liquidatedAmount = Math.min(
@@ -147,7 +221,126 @@ abstract contract MorphoStrategy is BaseStrategy {
         return want.balanceOf(address(this));
     }
 
-    // NOTE: Can override `tendTrigger` and `harvestTrigger` if necessary
+    /**
+     * @notice
+     *  Provide a signal to the keeper that `harvest()` should be called.
+     *  Same as `BaseStrategy.harvestTrigger` with unclaimed rewards of the underlying protocol,
+     *  valued in `want`, added to the profit. Harvest is triggered by profit only when
+     *  profit and rewards cover `profitFactor` times the call cost.
+     * @param callCostInWei The keeper's estimated gas cost to call `harvest()` (in wei).
+     * @return `true` if `harvest()` should be called, `false` otherwise.
+     */
+    function harvestTrigger(uint256 callCostInWei)
+        public
+        view
+        virtual
+        override
+        returns (bool)
+    {
+        StrategyParams memory params = vault.strategies(address(this));
+
+        // Should not trigger if Strategy is not activated
+        if (params.activation == 0) return false;
+
+        // Should not trigger if we haven't waited long enough since previous harvest
+        if (block.timestamp.sub(params.lastReport) < minReportDelay)
+            return false;
+
+        // Should trigger if hasn't been called in a while
+        if (block.timestamp.sub(params.lastReport) >= maxReportDelay)
+            return true;
+
+        // If some amount is owed, pay it back
+        if (vault.debtOutstanding() > debtThreshold) return true;
+
+        // Trigger if we have a loss to report
+        uint256 total = estimatedTotalAssets();
+        if (total.add(debtThreshold) < params.totalDebt) return true;
+
+        uint256 profit = rewardsToWant(getRewardsToSell());
+        if (total > params.totalDebt) {
+            profit = profit.add(total.sub(params.totalDebt));
+        }
+
+        // Otherwise, only trigger if profit with rewards pays for the call
+        uint256 credit = vault.creditAvailable();
+        return
+            profitFactor.mul(ethToWant(callCostInWei)) < credit.add(profit);
+    }
+
+    /**
+     * @notice
+     *  Provide a signal to the keeper that `tend()` should be called.
+     *  Triggered while idle want is at least one chunk of `supplyChunkSize`, smaller rest is supplied by next harvest
+     *  so keepers don't pay a tend for dust.
+     *  Tend also withdraws supply on pool that can be matched P2P, see `getRematchAmount`, and supplies it again.
+     *  Rematching is triggered at most once per `rematchPeriod` when the gain of P2P rate over pool rate
+     *  during `rematchPeriod` is at least `minRematchGain`, the same check as in `tend()`.
+     * @dev Call cost is not used, gas of rematching is priced by `minRematchGain` for both trigger and `tend()`.
+     * @return `true` if `tend()` should be called, `false` otherwise.
+     */
+    function tendTrigger(uint256)
+        public
+        view
+        virtual
+        override
+        returns (bool)
+    {
+        if (
+            supplyChunkSize > 0 &&
+            _getIdleWant(vault.debtOutstanding()) >= supplyChunkSize
+        ) {
+            return true;
+        }
+        return _getRematchAmount() > 0;
+    }
+
+    /**
+     * @notice Want balance above `_debtOutstanding` that can be supplied to Morpho.
+     */
+    function _getIdleWant(uint256 _debtOutstanding)
+        internal
+        view
+        returns (uint256)
+    {
+        uint256 wantBalance = want.balanceOf(address(this));
+        return
+            wantBalance > _debtOutstanding
+                ? wantBalance.sub(_debtOutstanding)
+                : 0;
+    }
+
+    /**
+     * @notice
+     *  Amount of supply on pool to rematch if `rematchPeriod` passed since the last rematch and
+     *  P2P rate gain during `rematchPeriod` is at least `minRematchGain`.
+     * @dev Lens doesn't limit matching by gas, supply left on pool is retried after `rematchPeriod`.
+     * @return _amount amount to withdraw and supply again, 0 if rematching doesn't pay for the gas
+     */
+    function _getRematchAmount() internal view returns (uint256 _amount) {
+        if (
+            rematchPeriod == 0 ||
+            block.timestamp < lastRematch.add(rematchPeriod)
+        ) {
+            return 0;
+        }
+        _amount = getRematchAmount();
+        if (_amount == 0) {
+            return 0;
+        }
+        (uint256 p2pSupplyApr, uint256 poolSupplyApr) = getSupplyRates();
+        if (p2pSupplyApr <= poolSupplyApr) {
+            return 0;
+        }
+        uint256 gain = _amount
+            .mul(p2pSupplyApr.sub(poolSupplyApr))
+            .mul(rematchPeriod)
+            .div(SECONDS_PER_YEAR.mul(1e18));
+        if (gain == 0 || gain < minRematchGain) {
+            return 0;
+        }
+    }
+
     // NOTE: `migrate` will automatically forward all `want` in this strategy to the new one
     function prepareMigration(address _newStrategy) internal virtual override {
         liquidateAllPositions();
@@ -168,27 +361,29 @@ abstract contract MorphoStrategy is BaseStrategy {
 
     /**
      * @notice
-     *  Provide an accurate conversion from `_amtInWei` (denominated in wei)
-     *  to `want` (using the native decimal characteristics of `want`).
-     * @dev
-     *  Care must be taken when working with decimals to assure that the conversion
-     *  is compatible. As an example:
-     *
-     *      given 1e17 wei (0.1 ETH) as input, and want is USDC (6 decimals),
-     *      with USDC/ETH = 1800, this should give back 1800000000 (180 USDC)
-     *
-     * @param _amtInWei The amount (in wei/1e-18 ETH) to convert to `want`
-     * @return The amount in `want` of `_amtInEth` converted to `want`
-     **/
-    function ethToWant(uint256 _amtInWei)
+     *  Value of `_amount` rewards of the underlying protocol in `want`,
+     *  counted as profit in `harvestTrigger`.
+     * @dev Returns 0 for protocols without rewards sold for `want`.
+     * @param _amount amount of reward token, see `getRewardsToSell`
+     * @return `_amount` of reward token priced in `want`
+     */
+    function rewardsToWant(uint256 _amount)
         public
         view
         virtual
-        override
         returns (uint256)
     {
-        // TODO create an accurate price oracle
-        return _amtInWei;
+        return 0;
+    }
+
+    /**
+     * @notice
+     *  Rewards of the underlying protocol that are turned into `want` by next harvest or ySwap,
+     *  valued by `rewardsToWant` in `harvestTrigger`.
+     * @return amount of reward token, unclaimed rewards by default
+     */
+    function getRewardsToSell() public view virtual returns (uint256) {
+        return getUnclaimedRewards();
     }
 
     /**
@@ -207,6 +402,45 @@ abstract contract MorphoStrategy is BaseStrategy {
         maxGasForMatching = _maxGasForMatching;
     }
 
+    /**
+     * @notice
+     *  Set the min period in seconds between rematches of supply on pool in `tend()`,
+     *  P2P rate gain is counted over this period.
+     * @dev Set to 0 to disable rematching.
+     * @param _rematchPeriod new rematch period in seconds
+     */
+    function setRematchPeriod(uint256 _rematchPeriod) external onlyAuthorized {
+        rematchPeriod = _rematchPeriod;
+    }
+
+    /**
+     * @notice
+     *  Set the min gain of P2P rate over pool rate during `rematchPeriod` to rematch supply on pool.
+     * @dev Should cover gas of withdrawing from pool and supplying again with `maxGasForMatching`.
+     * @param _minRematchGain new min gain in `want` precision
+     */
+    function setMinRematchGain(uint256 _minRematchGain)
+        external
+        onlyAuthorized
+    {
+        minRematchGain = _minRematchGain;
+    }
+
+    /**
+     * @notice
+     *  Set the max amount of want supplied in one harvest or tend.
+     * @dev
+     *  Large deposits are supplied in chunks by consecutive tends, each chunk is matched P2P with
+     *  its own `maxGasForMatching`. Set to 0 to supply all idle want at once.
+     * @param _supplyChunkSize new chunk size in `want` precision
+     */
+    function setSupplyChunkSize(uint256 _supplyChunkSize)
+        external
+        onlyAuthorized
+    {
+        supplyChunkSize = _supplyChunkSize;
+    }
+
     /**
      * @notice Set new rewards distributor contract
      * @param _rewardsDistributor address of new contract
@@ -284,7 +518,7 @@ abstract contract MorphoStrategy is BaseStrategy {
      * @return _poolBorrowAmount borrowed amount of pool token in pool deals, non P2P deals
      */
     function getCurrentMarketLiquidity()
-        external
+        public
         view
         returns (
             uint256 _p2pSupplyAmount,
@@ -308,10 +542,132 @@ abstract contract MorphoStrategy is BaseStrategy {
      *  Caluclates the maximum amount that can be supplied to just P2P deals.
      * @return _maxP2PSupply maximum amount that can be supplied to P2P deals
      */
-    function getMaxP2PSupply() external view returns (uint256 _maxP2PSupply) {
+    function getMaxP2PSupply() public view returns (uint256 _maxP2PSupply) {
         (_maxP2PSupply, , ) = getSupplyBalancesForAmount(type(uint128).max);
     }
 
+    /**
+     * @notice
+     *  Supply on pool that would be matched P2P if withdrawn and supplied again.
+     * @dev `getMaxP2PSupply` includes strategy balance already in P2P.
+     * @return _amount minimum of strategy balance on pool and P2P supply still available
+     */
+    function getRematchAmount() public view returns (uint256 _amount) {
+        (
+            uint256 balanceOnPool,
+            uint256 balanceInP2P,
+
+        ) = getStrategySupplyBalance();
+        if (balanceOnPool > 0) {
+            uint256 maxP2PSupply = getMaxP2PSupply();
+            if (maxP2PSupply > balanceInP2P) {
+                _amount = Math.min(
+                    balanceOnPool,
+                    maxP2PSupply.sub(balanceInP2P)
+                );
+            }
+        }
+    }
+
+    /**
+     * @notice
+     *  Chunks of idle want supplied by next tends and expected P2P fraction of each chunk,
+     *  computed from `getSupplyBalancesForAmount` assuming the market doesn't change between tends.
+     * @dev Lens doesn't limit matching by gas so the fraction is the upper bound with enough `maxGasForMatching`.
+     *  At most `MAX_SUPPLY_CHUNKS` (20) chunks are returned.
+     * @return _amounts amount of each chunk, all idle want in one chunk if `supplyChunkSize` is 0
+     * @return _p2pRatios expected P2P fraction of each chunk in 1e18 precision
+     */
+    function getSupplyChunks()
+        external
+        view
+        returns (uint256[] memory _amounts, uint256[] memory _p2pRatios)
+    {
+        uint256 toSupply = _getIdleWant(vault.debtOutstanding());
+        if (toSupply == 0) {
+            return (new uint256[](0), new uint256[](0));
+        }
+        uint256 chunkSize = supplyChunkSize == 0 ? toSupply : supplyChunkSize;
+        uint256 chunks = Math.min(
+            toSupply.sub(1).div(chunkSize).add(1),
+            MAX_SUPPLY_CHUNKS
+        );
+        _amounts = new uint256[](chunks);
+        _p2pRatios = new uint256[](chunks);
+        (, uint256 balanceInP2P, ) = getStrategySupplyBalance();
+        uint256 supplied;
+        for (uint256 i = 0; i < chunks; i++) {
+            _amounts[i] = Math.min(chunkSize, toSupply.sub(supplied));
+            supplied = supplied.add(_amounts[i]);
+            (uint256 nextBalanceInP2P, , ) = getSupplyBalancesForAmount(
+                supplied
+            );
+            if (nextBalanceInP2P > balanceInP2P) {
+                _p2pRatios[i] = Math.min(
+                    nextBalanceInP2P.sub(balanceInP2P).mul(1e18).div(
+                        _amounts[i]
+                    ),
+                    1e18
+                );
+                balanceInP2P = nextBalanceInP2P;
+            }
+        }
+    }
+
+    /**
+     * @notice
+     *  Unclaimed rewards of the underlying protocol, COMP for Compound, accrued by strategy supply.
+     * @dev Returns 0 if the market has no rewards and lens call reverts.
+     * @return _unclaimedRewards amount of reward token that can be claimed from Morpho
+     */
+    function getUnclaimedRewards()
+        public
+        view
+        returns (uint256 _unclaimedRewards)
+    {
+        address[] memory pools = new address[](1);
+        pools[0] = poolToken;
+        try lens.getUserUnclaimedRewards(pools, address(this)) returns (
+            uint256 _rewards
+        ) {
+            _unclaimedRewards = _rewards;
+        } catch {}
+    }
+
+    /**
+     * @notice
+     *  Returns strategy balances, market liquidity, max P2P supply, estimated total assets,
+     *  unclaimed rewards and current APR in one call.
+     * @dev
+     *  Supply balance is fetched from lens once and reused for `estimatedTotalAssets`.
+     *  APR is the current supply rate of the strategy, `getSupplyBalancesForAmount(0)`.
+     * @return _metrics all strategy metrics, see `StrategyMetrics`
+     */
+    function getStrategyMetrics()
+        external
+        view
+        returns (StrategyMetrics memory _metrics)
+    {
+        _metrics.wantBalance = want.balanceOf(address(this));
+        (
+            _metrics.balanceOnPool,
+            _metrics.balanceInP2P,
+            _metrics.totalSupplyBalance
+        ) = getStrategySupplyBalance();
+        _metrics.estimatedTotalAssets = _metrics.wantBalance.add(
+            _metrics.totalSupplyBalance
+        );
+        (
+            _metrics.p2pSupplyAmount,
+            _metrics.p2pBorrowAmount,
+            _metrics.poolSupplyAmount,
+            _metrics.poolBorrowAmount
+        ) = getCurrentMarketLiquidity();
+        _metrics.maxP2PSupply = getMaxP2PSupply();
+        _metrics.unclaimedRewards = getUnclaimedRewards();
+        (, , _metrics.apr) = getSupplyBalancesForAmount(0);
+    }
+
     /**
      * @notice
      *  For a given amount of pool tokens it will return balance that will end in P2P deal and balance of pool deal.
@@ -331,6 +687,19 @@ abstract contract MorphoStrategy is BaseStrategy {
             uint256 _apr
         );
 
+    /**
+     * @notice
+     *  Current P2P and pool supply rates per year of the market, in the same precision as `_apr`
+     *  of `getSupplyBalancesForAmount`.
+     * @return _p2pSupplyApr supply rate of P2P deals
+     * @return _poolSupplyApr supply rate of the pool, underlying protocol
+     */
+    function getSupplyRates()
+        public
+        view
+        virtual
+        returns (uint256 _p2pSupplyApr, uint256 _poolSupplyApr);
+
     // ---------------------- YSWAPS FUNCTIONS ----------------------
     function setTradeFactory(address _tradeFactory) external onlyGovernance {
         if (tradeFactory != address(0)) {
@@ -0,0 +1,27 @@
+// SPDX-License-Identifier: MIT
+pragma solidity 0.6.12;
+
+import "@openzeppelin/contracts/token/ERC20/ERC20.sol";
+
+/**
+ * @notice
+ *  Mintable ERC20 used instead of mainnet tokens on a local development chain.
+ *  Sent ETH is minted as tokens so it can also stand in for WETH.
+ */
+contract MockERC20 is ERC20 {
+    constructor(
+        string memory _name,
+        string memory _symbol,
+        uint8 _decimals
+    ) public ERC20(_name, _symbol) {
+        _setupDecimals(_decimals);
+    }
+
+    function mint(address _to, uint256 _amount) external {
+        _mint(_to, _amount);
+    }
+
+    receive() external payable {
+        _mint(msg.sender, msg.value);
+    }
+}
@@ -0,0 +1,261 @@
+// SPDX-License-Identifier: MIT
+pragma solidity 0.6.12;
+pragma experimental ABIEncoderV2;
+
+import "@openzeppelin/contracts/math/SafeMath.sol";
+import "@openzeppelin/contracts/math/Math.sol";
+
+import "../../interfaces/lens/ILensAave.sol";
+import "../../interfaces/lens/ILensCompound.sol";
+import "./MockMorpho.sol";
+
+/**
+ * @notice
+ *  Lens views computed from MockMorpho state, shared by Aave and Compound mock lenses.
+ *  Rates are yearly in 1e18 precision and converted to protocol precision by each lens.
+ */
+abstract contract MockLens is ILens {
+    using SafeMath for uint256;
+
+    MockMorpho public immutable morpho;
+
+    constructor(MockMorpho _morpho) public {
+        morpho = _morpho;
+    }
+
+    function getUserUnclaimedRewards(address[] calldata, address _user)
+        external
+        view
+        override
+        returns (uint256 unclaimedRewards)
+    {
+        unclaimedRewards = morpho.unclaimedRewards(_user);
+    }
+
+    function getCurrentSupplyBalanceInOf(address _poolToken, address _user)
+        external
+        view
+        override
+        returns (
+            uint256 balanceOnPool,
+            uint256 balanceInP2P,
+            uint256 totalBalance
+        )
+    {
+        (balanceOnPool, balanceInP2P) = morpho.supplyBalanceInOf(
+            _poolToken,
+            _user
+        );
+        totalBalance = balanceOnPool.add(balanceInP2P);
+    }
+
+    function getMainMarketData(address _poolToken)
+        external
+        view
+        override
+        returns (
+            uint256 avgSupplyRatePerBlock,
+            uint256 avgBorrowRatePerBlock,
+            uint256 p2pSupplyAmount,
+            uint256 p2pBorrowAmount,
+            uint256 poolSupplyAmount,
+            uint256 poolBorrowAmount
+        )
+    {
+        MockMorpho.Market memory market = morpho.getMarket(_poolToken);
+        p2pSupplyAmount = market.p2pSupply;
+        p2pBorrowAmount = market.p2pBorrow;
+        poolSupplyAmount = market.poolSupply;
+        poolBorrowAmount = market.poolBorrow;
+        avgSupplyRatePerBlock = _toProtocolRate(
+            _averageRate(
+                market.p2pSupplyRate,
+                p2pSupplyAmount,
+                market.poolSupplyRate,
+                poolSupplyAmount
+            )
+        );
+        avgBorrowRatePerBlock = avgSupplyRatePerBlock;
+    }
+
+    /**
+     * @notice P2P and pool rates of the market, borrow rates are the same as supply rates.
+     */
+    function _rates(address _poolToken)
+        internal
+        view
+        returns (
+            uint256 _p2pSupplyRate,
+            uint256 _p2pBorrowRate,
+            uint256 _poolSupplyRate,
+            uint256 _poolBorrowRate
+        )
+    {
+        MockMorpho.Market memory market = morpho.getMarket(_poolToken);
+        _p2pSupplyRate = _toProtocolRate(market.p2pSupplyRate);
+        _p2pBorrowRate = _p2pSupplyRate;
+        _poolSupplyRate = _toProtocolRate(market.poolSupplyRate);
+        _poolBorrowRate = _poolSupplyRate;
+    }
+
+    /**
+     * @notice Balances and yearly rate after supplying `_amount`, matched P2P first like MockMorpho.supply.
+     */
+    function _nextSupply(
+        address _poolToken,
+        address _user,
+        uint256 _amount
+    )
+        internal
+        view
+        returns (
+            uint256 _ratePerYear,
+            uint256 _balanceInP2P,
+            uint256 _balanceOnPool
+        )
+    {
+        MockMorpho.Market memory market = morpho.getMarket(_poolToken);
+        (_balanceOnPool, _balanceInP2P) = morpho.supplyBalanceInOf(
+            _poolToken,
+            _user
+        );
+        uint256 toP2P = Math.min(_amount, market.poolBorrow);
+        _balanceInP2P = _balanceInP2P.add(toP2P);
+        _balanceOnPool = _balanceOnPool.add(_amount.sub(toP2P));
+        _ratePerYear = _averageRate(
+            market.p2pSupplyRate,
+            _balanceInP2P,
+            market.poolSupplyRate,
+            _balanceOnPool
+        );
+    }
+
+    function _averageRate(
+        uint256 _p2pRate,
+        uint256 _p2pAmount,
+        uint256 _poolRate,
+        uint256 _poolAmount
+    ) internal pure returns (uint256) {
+        uint256 total = _p2pAmount.add(_poolAmount);
+        if (total == 0) {
+            return _poolRate;
+        }
+        return
+            _p2pRate.mul(_p2pAmount).add(_poolRate.mul(_poolAmount)).div(
+                total
+            );
+    }
+
+    function _toProtocolRate(uint256 _ratePerYear)
+        internal
+        pure
+        virtual
+        returns (uint256);
+}
+
+contract MockLensAave is MockLens, ILensAave {
+    constructor(MockMorpho _morpho) public MockLens(_morpho) {}
+
+    function getNextUserSupplyRatePerYear(
+        address _poolToken,
+        address _user,
+        uint256 _amount
+    )
+        external
+        view
+        override
+        returns (
+            uint256 nextSupplyRatePerYear,
+            uint256 balanceInP2P,
+            uint256 balanceOnPool,
+            uint256 totalBalance
+        )
+    {
+        (nextSupplyRatePerYear, balanceInP2P, balanceOnPool) = _nextSupply(
+            _poolToken,
+            _user,
+            _amount
+        );
+        nextSupplyRatePerYear = _toProtocolRate(nextSupplyRatePerYear);
+        totalBalance = balanceInP2P.add(balanceOnPool);
+    }
+
+    function getRatesPerYear(address _poolToken)
+        external
+        view
+        override
+        returns (
+            uint256 p2pSupplyRate,
+            uint256 p2pBorrowRate,
+            uint256 poolSupplyRate,
+            uint256 poolBorrowRate
+        )
+    {
+        return _rates(_poolToken);
+    }
+
+    // Aave rates are in ray, 1e27
+    function _toProtocolRate(uint256 _ratePerYear)
+        internal
+        pure
+        override
+        returns (uint256)
+    {
+        return _ratePerYear.mul(1e9);
+    }
+}
+
+contract MockLensCompound is MockLens, ILensCompound {
+    // same as BLOCKS_PER_YEAR in MorphoCompoundStrategy
+    uint256 public constant BLOCKS_PER_YEAR = 2628000;
+
+    constructor(MockMorpho _morpho) public MockLens(_morpho) {}
+
+    function getNextUserSupplyRatePerBlock(
+        address _poolToken,
+        address _user,
+        uint256 _amount
+    )
+        external
+        view
+        override
+        returns (
+            uint256 nextSupplyRatePerBlock,
+            uint256 balanceOnPool,
+            uint256 balanceInP2P,
+            uint256 totalBalance
+        )
+    {
+        (nextSupplyRatePerBlock, balanceInP2P, balanceOnPool) = _nextSupply(
+            _poolToken,
+            _user,
+            _amount
+        );
+        nextSupplyRatePerBlock = _toProtocolRate(nextSupplyRatePerBlock);
+        totalBalance = balanceInP2P.add(balanceOnPool);
+    }
+
+    function getRatesPerBlock(address _poolToken)
+        external
+        view
+        override
+        returns (
+            uint256 p2pSupplyRate,
+            uint256 p2pBorrowRate,
+            uint256 poolSupplyRate,
+            uint256 poolBorrowRate
+        )
+    {
+        return _rates(_poolToken);
+    }
+
+    // Compound rates are per block in 1e18
+    function _toProtocolRate(uint256 _ratePerYear)
+        internal
+        pure
+        override
+        returns (uint256)
+    {
+        return _ratePerYear.div(BLOCKS_PER_YEAR);
+    }
+}
@@ -0,0 +1,198 @@
+// SPDX-License-Identifier: MIT
+pragma solidity 0.6.12;
+pragma experimental ABIEncoderV2;
+
+import {
+    SafeERC20,
+    SafeMath,
+    IERC20
+} from "@openzeppelin/contracts/token/ERC20/SafeERC20.sol";
+import "@openzeppelin/contracts/math/Math.sol";
+
+import "../../interfaces/IMorpho.sol";
+import "./MockERC20.sol";
+
+/**
+ * @notice
+ *  Local stand-in for Morpho supply side.
+ *  Supply is matched P2P with borrowers on pool, `poolBorrow` of the market, and the rest is supplied to pool.
+ *  Withdraw takes from pool first. Balances accrue interest every second with yearly rates in 1e18 precision,
+ *  interest is minted when withdrawn.
+ */
+contract MockMorpho is IMorpho {
+    using SafeERC20 for IERC20;
+    using SafeMath for uint256;
+
+    uint256 public constant SECONDS_PER_YEAR = 31536000;
+
+    struct Market {
+        address underlying;
+        uint256 p2pSupplyRate;
+        uint256 poolSupplyRate;
+        uint256 p2pSupply;
+        uint256 p2pBorrow;
+        uint256 poolSupply;
+        uint256 poolBorrow;
+    }
+
+    struct SupplyBalance {
+        uint256 inP2P;
+        uint256 onPool;
+        uint256 lastUpdate;
+    }
+
+    address public rewardToken;
+    mapping(address => Market) internal markets;
+    mapping(address => uint256) public unclaimedRewards;
+    mapping(address => mapping(address => SupplyBalance))
+        internal supplyBalances;
+
+    constructor(address _rewardToken) public {
+        rewardToken = _rewardToken;
+    }
+
+    // ---------------------- functions to set up the mock ----------------------
+    function createMarket(
+        address _poolToken,
+        address _underlying,
+        uint256 _poolBorrow,
+        uint256 _p2pSupplyRate,
+        uint256 _poolSupplyRate
+    ) external {
+        Market storage market = markets[_poolToken];
+        market.underlying = _underlying;
+        market.poolBorrow = _poolBorrow;
+        market.p2pSupplyRate = _p2pSupplyRate;
+        market.poolSupplyRate = _poolSupplyRate;
+    }
+
+    function setPoolBorrow(address _poolToken, uint256 _poolBorrow) external {
+        markets[_poolToken].poolBorrow = _poolBorrow;
+    }
+
+    function setUnclaimedRewards(address _user, uint256 _amount) external {
+        unclaimedRewards[_user] = _amount;
+    }
+
+    // ---------------------- IMorpho ----------------------
+    function supply(
+        address _poolToken,
+        address _onBehalf,
+        uint256 _amount,
+        uint256 _maxGasForMatching
+    ) external override {
+        require(_amount > 0, "AmountIsZero");
+        Market storage market = markets[_poolToken];
+        IERC20(market.underlying).safeTransferFrom(
+            msg.sender,
+            address(this),
+            _amount
+        );
+        SupplyBalance storage balance = _accrue(_poolToken, _onBehalf);
+
+        uint256 inP2P = _maxGasForMatching > 0
+            ? Math.min(_amount, market.poolBorrow)
+            : 0;
+        uint256 onPool = _amount.sub(inP2P);
+        balance.inP2P = balance.inP2P.add(inP2P);
+        balance.onPool = balance.onPool.add(onPool);
+        market.poolBorrow = market.poolBorrow.sub(inP2P);
+        market.p2pSupply = market.p2pSupply.add(inP2P);
+        market.p2pBorrow = market.p2pBorrow.add(inP2P);
+        market.poolSupply = market.poolSupply.add(onPool);
+    }
+
+    function withdraw(address _poolToken, uint256 _amount) external override {
+        Market storage market = markets[_poolToken];
+        SupplyBalance storage balance = _accrue(_poolToken, msg.sender);
+        _amount = Math.min(_amount, balance.onPool.add(balance.inP2P));
+        require(_amount > 0, "AmountIsZero");
+
+        uint256 fromPool = Math.min(_amount, balance.onPool);
+        uint256 fromP2P = _amount.sub(fromPool);
+        balance.onPool = balance.onPool.sub(fromPool);
+        balance.inP2P = balance.inP2P.sub(fromP2P);
+        market.poolSupply = market.poolSupply.sub(
+            Math.min(fromPool, market.poolSupply)
+        );
+        fromP2P = Math.min(fromP2P, market.p2pSupply);
+        market.p2pSupply = market.p2pSupply.sub(fromP2P);
+        market.p2pBorrow = market.p2pBorrow.sub(fromP2P);
+        // unmatched borrowers go back to pool
+        market.poolBorrow = market.poolBorrow.add(fromP2P);
+
+        IERC20 underlying = IERC20(market.underlying);
+        uint256 available = underlying.balanceOf(address(this));
+        if (available < _amount) {
+            MockERC20(payable(market.underlying)).mint(
+                address(this),
+                _amount - available
+            );
+        }
+        underlying.safeTransfer(msg.sender, _amount);
+    }
+
+    function claimRewards(address[] calldata, bool)
+        external
+        override
+        returns (uint256 claimedAmount)
+    {
+        claimedAmount = unclaimedRewards[msg.sender];
+        require(claimedAmount > 0, "AmountIsZero");
+        unclaimedRewards[msg.sender] = 0;
+        MockERC20(payable(rewardToken)).mint(msg.sender, claimedAmount);
+    }
+
+    // ---------------------- views used by mock lens ----------------------
+    function getMarket(address _poolToken)
+        external
+        view
+        returns (Market memory)
+    {
+        return markets[_poolToken];
+    }
+
+    function supplyBalanceInOf(address _poolToken, address _user)
+        public
+        view
+        returns (uint256 _balanceOnPool, uint256 _balanceInP2P)
+    {
+        Market storage market = markets[_poolToken];
+        SupplyBalance storage balance = supplyBalances[_poolToken][_user];
+        uint256 elapsed = block.timestamp.sub(balance.lastUpdate);
+        _balanceOnPool = _withInterest(
+            balance.onPool,
+            market.poolSupplyRate,
+            elapsed
+        );
+        _balanceInP2P = _withInterest(
+            balance.inP2P,
+            market.p2pSupplyRate,
+            elapsed
+        );
+    }
+
+    function _accrue(address _poolToken, address _user)
+        internal
+        returns (SupplyBalance storage _balance)
+    {
+        (uint256 onPool, uint256 inP2P) = supplyBalanceInOf(_poolToken, _user);
+        _balance = supplyBalances[_poolToken][_user];
+        _balance.onPool = onPool;
+        _balance.inP2P = inP2P;
+        _balance.lastUpdate = block.timestamp;
+    }
+
+    function _withInterest(
+        uint256 _amount,
+        uint256 _ratePerYear,
+        uint256 _elapsed
+    ) internal pure returns (uint256) {
+        return
+            _amount.add(
+                _amount.mul(_ratePerYear).mul(_elapsed).div(
+                    SECONDS_PER_YEAR.mul(1e18)
+                )
+            );
+    }
+}
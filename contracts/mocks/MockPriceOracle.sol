@@ -0,0 +1,26 @@
+// SPDX-License-Identifier: MIT
+pragma solidity 0.6.12;
+
+import "../../interfaces/IPriceOracleGetter.sol";
+
+/**
+ * @notice
+ *  Local stand-in for Aave V2 price oracle with prices set by tests.
+ */
+contract MockPriceOracle is IPriceOracleGetter {
+    // asset => price of one whole asset in ETH with 18 decimals
+    mapping(address => uint256) public prices;
+
+    function setAssetPrice(address _asset, uint256 _price) external {
+        prices[_asset] = _price;
+    }
+
+    function getAssetPrice(address _asset)
+        external
+        view
+        override
+        returns (uint256)
+    {
+        return prices[_asset];
+    }
+}
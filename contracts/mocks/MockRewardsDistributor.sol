@@ -0,0 +1,35 @@
+// SPDX-License-Identifier: MIT
+pragma solidity 0.6.12;
+pragma experimental ABIEncoderV2;
+
+import "@openzeppelin/contracts/math/SafeMath.sol";
+
+import "../../interfaces/IRewardsDistributor.sol";
+import "./MockERC20.sol";
+
+/**
+ * @notice
+ *  Local stand-in for MORPHO rewards distributor. Merkle proof is not verified,
+ *  claiming mints the difference between `_claimable` and already claimed amount.
+ */
+contract MockRewardsDistributor is IRewardsDistributor {
+    using SafeMath for uint256;
+
+    MockERC20 public immutable morphoToken;
+    mapping(address => uint256) public claimed;
+
+    constructor(MockERC20 _morphoToken) public {
+        morphoToken = _morphoToken;
+    }
+
+    function claim(
+        address _account,
+        uint256 _claimable,
+        bytes32[] calldata
+    ) external override {
+        uint256 amount = _claimable.sub(claimed[_account]);
+        require(amount > 0, "AlreadyClaimed");
+        claimed[_account] = _claimable;
+        morphoToken.mint(_account, amount);
+    }
+}
@@ -0,0 +1,95 @@
+// SPDX-License-Identifier: MIT
+pragma solidity 0.6.12;
+pragma experimental ABIEncoderV2;
+
+import {
+    SafeERC20,
+    SafeMath,
+    IERC20
+} from "@openzeppelin/contracts/token/ERC20/SafeERC20.sol";
+
+import "../../interfaces/ySwap/ITradeFactory.sol";
+import "./MockERC20.sol";
+import "./MockUniswapV2Router.sol";
+
+/**
+ * @notice
+ *  Local stand-in for ySwap TradeFactory. Records roles and enabled swaps,
+ *  trades are executed directly from token in to token out at prices of `router`.
+ */
+contract MockTradeFactory is ITradeFactory {
+    using SafeERC20 for IERC20;
+    using SafeMath for uint256;
+
+    struct AsyncTradeExecutionDetails {
+        address _strategy;
+        address _tokenIn;
+        address _tokenOut;
+        uint256 _amount;
+        uint256 _minAmountOut;
+    }
+
+    bytes32 public constant override STRATEGY = keccak256("STRATEGY");
+
+    MockUniswapV2Router public immutable router;
+    mapping(bytes32 => mapping(address => bool)) public hasRole;
+    // strategy => token in => token out
+    mapping(address => mapping(address => mapping(address => bool)))
+        public enabled;
+
+    constructor(MockUniswapV2Router _router) public {
+        router = _router;
+    }
+
+    function grantRole(bytes32 _role, address _account) external override {
+        hasRole[_role][_account] = true;
+    }
+
+    function enable(address _tokenIn, address _tokenOut) external override {
+        require(hasRole[STRATEGY][msg.sender], "!strategy");
+        enabled[msg.sender][_tokenIn][_tokenOut] = true;
+    }
+
+    // swapper and swap data are ignored
+    function execute(
+        AsyncTradeExecutionDetails calldata _details,
+        address,
+        bytes calldata
+    ) external returns (uint256 _receivedAmount) {
+        _receivedAmount = _execute(_details);
+    }
+
+    function execute(
+        AsyncTradeExecutionDetails[] calldata _details,
+        address,
+        bytes calldata
+    ) external {
+        for (uint256 i = 0; i < _details.length; i++) {
+            _execute(_details[i]);
+        }
+    }
+
+    function _execute(AsyncTradeExecutionDetails calldata _details)
+        internal
+        returns (uint256 _receivedAmount)
+    {
+        require(
+            enabled[_details._strategy][_details._tokenIn][_details._tokenOut],
+            "!enabled"
+        );
+        IERC20(_details._tokenIn).safeTransferFrom(
+            _details._strategy,
+            address(this),
+            _details._amount
+        );
+        _receivedAmount = _details
+            ._amount
+            .mul(router.prices(_details._tokenIn, _details._tokenOut))
+            .div(1e18);
+        require(_receivedAmount >= _details._minAmountOut, "!minAmountOut");
+        MockERC20(payable(_details._tokenOut)).mint(
+            _details._strategy,
+            _receivedAmount
+        );
+    }
+}
@@ -0,0 +1,74 @@
+// SPDX-License-Identifier: MIT
+pragma solidity 0.6.12;
+pragma experimental ABIEncoderV2;
+
+import {
+    SafeERC20,
+    SafeMath,
+    IERC20
+} from "@openzeppelin/contracts/token/ERC20/SafeERC20.sol";
+
+import "../../interfaces/IUniswapV2Router01.sol";
+import "./MockERC20.sol";
+
+/**
+ * @notice
+ *  Local stand-in for Uniswap V2 and Sushiswap routers. Swaps at fixed prices without pools,
+ *  output token is minted to the receiver.
+ */
+contract MockUniswapV2Router is IUniswapV2Router01 {
+    using SafeERC20 for IERC20;
+    using SafeMath for uint256;
+
+    // token in => token out => amount out for 1e18 of token in
+    mapping(address => mapping(address => uint256)) public prices;
+
+    function setPrice(
+        address _tokenIn,
+        address _tokenOut,
+        uint256 _price
+    ) external {
+        prices[_tokenIn][_tokenOut] = _price;
+    }
+
+    function swapExactTokensForTokens(
+        uint256 _amountIn,
+        uint256 _amountOutMin,
+        address[] calldata _path,
+        address _to,
+        uint256 _deadline
+    ) external override returns (uint256[] memory _amounts) {
+        require(_deadline >= block.timestamp, "UniswapV2Router: EXPIRED");
+        _amounts = _getAmountsOut(_amountIn, _path);
+        uint256 amountOut = _amounts[_amounts.length - 1];
+        require(
+            amountOut >= _amountOutMin,
+            "UniswapV2Router: INSUFFICIENT_OUTPUT_AMOUNT"
+        );
+        IERC20(_path[0]).safeTransferFrom(msg.sender, address(this), _amountIn);
+        MockERC20(payable(_path[_path.length - 1])).mint(_to, amountOut);
+    }
+
+    function getAmountsOut(uint256 _amountIn, address[] calldata _path)
+        external
+        view
+        override
+        returns (uint256[] memory _amounts)
+    {
+        return _getAmountsOut(_amountIn, _path);
+    }
+
+    function _getAmountsOut(uint256 _amountIn, address[] memory _path)
+        internal
+        view
+        returns (uint256[] memory _amounts)
+    {
+        _amounts = new uint256[](_path.length);
+        _amounts[0] = _amountIn;
+        for (uint256 i = 1; i < _path.length; i++) {
+            _amounts[i] = _amounts[i - 1].mul(prices[_path[i - 1]][_path[i]]).div(
+                1e18
+            );
+        }
+    }
+}
@@ -0,0 +1,76 @@
+// SPDX-License-Identifier: MIT
+pragma solidity 0.6.12;
+pragma experimental ABIEncoderV2;
+
+/**
+ * @notice
+ *  Local stand-in for MakerDAO Multicall2 deployed on mainnet at 0x5BA1e12693Dc8F9c48aAD8770482f4739bEeD696.
+ *  Aggregates results from multiple calls in one request, all calls are executed in the same block.
+ */
+contract Multicall2 {
+    struct Call {
+        address target;
+        bytes callData;
+    }
+
+    struct Result {
+        bool success;
+        bytes returnData;
+    }
+
+    function aggregate(Call[] memory _calls)
+        public
+        returns (uint256 _blockNumber, bytes[] memory _returnData)
+    {
+        _blockNumber = block.number;
+        _returnData = new bytes[](_calls.length);
+        for (uint256 i = 0; i < _calls.length; i++) {
+            (bool success, bytes memory ret) = _calls[i].target.call(
+                _calls[i].callData
+            );
+            require(success, "Multicall aggregate: call failed");
+            _returnData[i] = ret;
+        }
+    }
+
+    function tryAggregate(bool _requireSuccess, Call[] memory _calls)
+        public
+        returns (Result[] memory _returnData)
+    {
+        _returnData = new Result[](_calls.length);
+        for (uint256 i = 0; i < _calls.length; i++) {
+            (bool success, bytes memory ret) = _calls[i].target.call(
+                _calls[i].callData
+            );
+            if (_requireSuccess) {
+                require(success, "Multicall2 aggregate: call failed");
+            }
+            _returnData[i] = Result(success, ret);
+        }
+    }
+
+    function tryBlockAndAggregate(bool _requireSuccess, Call[] memory _calls)
+        public
+        returns (
+            uint256 _blockNumber,
+            bytes32 _blockHash,
+            Result[] memory _returnData
+        )
+    {
+        _blockNumber = block.number;
+        _blockHash = blockhash(block.number);
+        _returnData = tryAggregate(_requireSuccess, _calls);
+    }
+
+    function getBlockNumber() public view returns (uint256 _blockNumber) {
+        _blockNumber = block.number;
+    }
+
+    function getCurrentBlockTimestamp()
+        public
+        view
+        returns (uint256 _timestamp)
+    {
+        _timestamp = block.timestamp;
+    }
+}
@@ -0,0 +1,9 @@
+// SPDX-License-Identifier: AGPL-3.0
+pragma solidity 0.6.12;
+
+/**
+ * @notice Aave V2 price oracle, asset prices are in ETH with 18 decimals
+ */
+interface IPriceOracleGetter {
+    function getAssetPrice(address asset) external view returns (uint256);
+}
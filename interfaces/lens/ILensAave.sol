@@ -18,4 +18,14 @@ interface ILensAave is ILens {
             uint256 balanceOnPool,
             uint256 totalBalance
         );
+
+    function getRatesPerYear(address _poolTokenAddress)
+        external
+        view
+        returns (
+            uint256 p2pSupplyRate,
+            uint256 p2pBorrowRate,
+            uint256 poolSupplyRate,
+            uint256 poolBorrowRate
+        );
 }
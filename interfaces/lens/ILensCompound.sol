@@ -18,4 +18,14 @@ interface ILensCompound is ILens {
             uint256 balanceInP2P,
             uint256 totalBalance
         );
+
+    function getRatesPerBlock(address _poolTokenAddress)
+        external
+        view
+        returns (
+            uint256 p2pSupplyRate,
+            uint256 p2pBorrowRate,
+            uint256 poolSupplyRate,
+            uint256 poolBorrowRate
+        );
 }
@@ -0,0 +1,36 @@
+import os
+from brownie import Contract, Multicall2, chain
+from scripts.liquidity.abi_cache import strategy_contract
+from scripts.liquidity.backfill import backfill, backfill_blocks
+from scripts.liquidity.multicall import MULTICALL2_ADDRESS
+from scripts.write_liquidity import DATA_PATH, getEnvVariable
+
+# one day of blocks with 12 seconds block time
+DEFAULT_STRIDE = 7200
+
+
+def main():
+    addresses = [
+        address.strip() for address in getEnvVariable("STRATEGY_ADDRESSES").split(",")
+    ]
+    fromBlock = int(getEnvVariable("BACKFILL_FROM_BLOCK"))
+    toBlock = int(os.environ.get("BACKFILL_TO_BLOCK", chain.height))
+    stride = int(os.environ.get("BACKFILL_STRIDE", DEFAULT_STRIDE))
+
+    multicall = Contract.from_abi(
+        "Multicall2",
+        os.environ.get("MULTICALL_ADDRESS", MULTICALL2_ADDRESS),
+        Multicall2.abi,
+    )
+    strategies = [strategy_contract(address) for address in addresses]
+    lastBlock = backfill(
+        multicall,
+        strategies,
+        backfill_blocks(fromBlock, toBlock, stride),
+        DATA_PATH / "backfill",
+        chunk_size=int(os.environ.get("BACKFILL_CHUNK_SIZE", "50")),
+        concurrency=int(os.environ.get("LIQUIDITY_CONCURRENCY", "8")),
+        timeout=float(os.environ.get("LIQUIDITY_TIMEOUT", "30")),
+        retries=int(os.environ.get("LIQUIDITY_RETRIES", "3")),
+    )
+    print("Last backfilled block:", lastBlock)
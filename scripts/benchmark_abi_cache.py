@@ -0,0 +1,32 @@
+import time
+from brownie import Contract
+from scripts.liquidity.abi_cache import (
+    build_abi_cache,
+    load_abi_cache,
+    strategy_contract,
+)
+from scripts.write_liquidity import getEnvVariable
+
+
+def main():
+    addresses = [
+        address.strip() for address in getEnvVariable("STRATEGY_ADDRESSES").split(",")
+    ]
+
+    explorerTime = timeStartup(addresses, Contract.from_explorer)
+
+    build_abi_cache()
+    load_abi_cache.cache_clear()
+    cacheTime = timeStartup(addresses, strategy_contract)
+
+    print("Strategies:", len(addresses))
+    print("Contract.from_explorer: {:.2f} ms per strategy".format(explorerTime))
+    print("ABI cache:              {:.2f} ms per strategy".format(cacheTime))
+
+
+def timeStartup(addresses, createContract):
+    # returns average time in milliseconds to create a contract object with all view functions
+    start = time.perf_counter()
+    for address in addresses:
+        createContract(address).getMaxP2PSupply
+    return (time.perf_counter() - start) * 1000 / len(addresses)
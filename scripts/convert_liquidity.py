@@ -0,0 +1,16 @@
+import os
+from scripts.liquidity.storage import convert_csv
+from scripts.write_liquidity import DATA_PATH, getStorage
+
+
+def main():
+    # converts all data/strategy_<address>.csv files to storage set by LIQUIDITY_STORAGE
+    csvStorage = getStorage(name="csv")
+    targetStorage = getStorage(name=os.environ.get("LIQUIDITY_STORAGE", "columnar"))
+    for csvPath in sorted(DATA_PATH.glob("strategy_*.csv")):
+        address = csvPath.stem[len("strategy_") :]
+        if targetStorage.path(address).exists():
+            print("Skipping already converted strategy:", address)
+            continue
+        count = convert_csv(csvStorage, targetStorage, address)
+        print("Converted", count, "rows to:", targetStorage.path(address))
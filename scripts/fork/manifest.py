@@ -0,0 +1,35 @@
+import json
+import re
+from pathlib import Path
+
+PROJECT_PATH = Path(__file__).resolve().parents[2]
+MANIFEST_PATH = PROJECT_PATH / "tests" / "fork_manifest.json"
+
+
+def load_manifest(path=MANIFEST_PATH):
+    """
+    Manifest of the pinned fork: `block` and for each token symbol its `address` and
+    `balance_slot`, the storage slot of `balanceOf` mapping.
+    """
+    return json.loads(Path(path).read_text())
+
+
+def fork_block(fork_url):
+    """Block of a pinned fork url `<rpc url>@<block>`, `None` if the fork follows the head."""
+    match = re.search(r"@(\d+)$", fork_url)
+    return int(match.group(1)) if match else None
+
+
+def pin_fork_url(fork_url, block):
+    """
+    Appends `@<block>` to `fork_url`. Raises `ValueError` if the url is pinned to a different block,
+    balance slots of the manifest are valid only at its block.
+    """
+    pinned = fork_block(fork_url)
+    if pinned is None:
+        return f"{fork_url}@{block}"
+    if pinned != block:
+        raise ValueError(
+            f"fork is pinned to block {pinned}, fork manifest block is {block}"
+        )
+    return fork_url
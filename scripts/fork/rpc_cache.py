@@ -0,0 +1,229 @@
+import argparse
+import hashlib
+import json
+import os
+import threading
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+PROJECT_PATH = Path(__file__).resolve().parents[2]
+CACHE_PATH = PROJECT_PATH / "build" / "fork_cache"
+DEFAULT_PORT = 8546
+
+# methods with results fixed at the pinned block, mapped to the index of their block parameter
+CACHED_METHODS = {
+    "eth_chainId": None,
+    "net_version": None,
+    "eth_getCode": 1,
+    "eth_getBalance": 1,
+    "eth_getTransactionCount": 1,
+    "eth_getStorageAt": 2,
+    "eth_call": 1,
+    "eth_getBlockByNumber": 0,
+    "eth_getBlockByHash": None,
+    "eth_getTransactionByHash": None,
+    "eth_getTransactionReceipt": None,
+}
+BLOCK_TAGS = ("latest", "pending", "safe", "finalized")
+
+
+class ForkCacheMiss(Exception):
+    pass
+
+
+def pin_block(method, params, block):
+    """Replaces block tags in `params` with the pinned `block`, so results don't change between runs."""
+    index = CACHED_METHODS.get(method)
+    params = list(params)
+    if index is None or len(params) < index:
+        return params
+    if len(params) == index:
+        # block parameter is optional and defaults to latest
+        params.append(hex(block))
+    elif params[index] in BLOCK_TAGS:
+        params[index] = hex(block)
+    return params
+
+
+def cache_key(method, params):
+    # content address of a request, params are already pinned to a block
+    # hex values and addresses are case insensitive, so the request is lowercased
+    data = json.dumps([method, params], sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(data.lower().encode()).hexdigest()
+
+
+class RpcCache:
+    """
+    Results of JSON-RPC requests at `block`, stored in `<path>/<block>/cache.jsonl`.
+    Every new result is appended to the file, so recorded state survives interrupted runs.
+    """
+
+    def __init__(self, block, path=CACHE_PATH):
+        self.block = block
+        self.path = Path(path) / str(block) / "cache.jsonl"
+        self._results = {}
+        self._lock = threading.Lock()
+        if self.path.is_file():
+            with self.path.open() as fp:
+                for line in fp:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self._results[entry["key"]] = entry["result"]
+
+    def __len__(self):
+        return len(self._results)
+
+    def __contains__(self, key):
+        return key in self._results
+
+    def get(self, key):
+        return self._results[key]
+
+    def set(self, key, result):
+        with self._lock:
+            if key in self._results:
+                return
+            self._results[key] = result
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("a") as fp:
+                fp.write(json.dumps({"key": key, "result": result}) + "\n")
+
+
+class CachingRpcProxy:
+    """
+    Answers JSON-RPC requests of a forking node from `cache` and forwards missing ones to
+    `upstream_url`. Requests are pinned to `cache.block`, so the fork always starts at that block.
+    In `offline` mode nothing is forwarded and a missing request is returned as an error.
+    """
+
+    def __init__(self, cache, upstream_url=None, offline=False, timeout=30):
+        if not offline and not upstream_url:
+            raise ValueError("upstream_url is required when not offline")
+        self.cache = cache
+        self.upstream_url = upstream_url
+        self.offline = offline
+        self.timeout = timeout
+        self.hits = 0
+        self.misses = 0
+
+    def handle(self, payload):
+        # JSON-RPC batch is a list of requests, responses are returned in the same order
+        if isinstance(payload, list):
+            return [self.handle_request(request) for request in payload]
+        return self.handle_request(payload)
+
+    def handle_request(self, request):
+        method = request.get("method")
+        params = request.get("params") or []
+        try:
+            result = self.result(method, params)
+        except ForkCacheMiss as e:
+            return _response(request, error={"code": -32000, "message": str(e)})
+        except _UpstreamError as e:
+            return _response(request, error=e.error)
+        except OSError as e:
+            return _response(
+                request, error={"code": -32603, "message": f"Upstream failed: {e}"}
+            )
+        return _response(request, result=result)
+
+    def result(self, method, params):
+        if method == "eth_blockNumber":
+            return hex(self.cache.block)
+        if method not in CACHED_METHODS:
+            return self._forward(method, params)
+        params = pin_block(method, params, self.cache.block)
+        key = cache_key(method, params)
+        if key in self.cache:
+            self.hits += 1
+            return self.cache.get(key)
+        self.misses += 1
+        result = self._forward(method, params)
+        # empty results are not final, e.g. a receipt of a transaction that is not mined
+        if result is not None:
+            self.cache.set(key, result)
+        return result
+
+    def _forward(self, method, params):
+        if self.offline:
+            raise ForkCacheMiss(
+                f"{method} {json.dumps(params)} is not in fork cache at block {self.cache.block}"
+            )
+        data = json.dumps(
+            {"jsonrpc": "2.0", "id": 1, "method": method, "params": params}
+        ).encode()
+        request = urllib.request.Request(
+            self.upstream_url, data=data, headers={"Content-Type": "application/json"}
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            body = json.loads(response.read())
+        if "error" in body:
+            raise _UpstreamError(body["error"])
+        return body.get("result")
+
+
+class _UpstreamError(Exception):
+    def __init__(self, error):
+        super().__init__(error.get("message"))
+        self.error = error
+
+
+def _response(request, result=None, error=None):
+    response = {"jsonrpc": "2.0", "id": request.get("id")}
+    if error is not None:
+        response["error"] = error
+    else:
+        response["result"] = result
+    return response
+
+
+def make_server(proxy, host="127.0.0.1", port=DEFAULT_PORT):
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            body = json.dumps(proxy.handle(payload)).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return ThreadingHTTPServer((host, port), Handler)
+
+
+def main(argv=None):
+    # python -m scripts.fork.rpc_cache --block 15000000 --upstream https://mainnet.infura.io/v3/<id>
+    parser = argparse.ArgumentParser(
+        description="Caching JSON-RPC proxy for mainnet forks"
+    )
+    parser.add_argument("--block", type=int, default=os.environ.get("FORK_BLOCK"))
+    parser.add_argument("--upstream", default=os.environ.get("FORK_UPSTREAM_URL"))
+    parser.add_argument("--offline", action="store_true")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--cache-path", default=CACHE_PATH)
+    args = parser.parse_args(argv)
+    if args.block is None:
+        parser.error("--block or FORK_BLOCK is required, cache is keyed by block")
+
+    cache = RpcCache(int(args.block), args.cache_path)
+    proxy = CachingRpcProxy(cache, args.upstream, offline=args.offline)
+    server = make_server(proxy, port=args.port)
+    print(
+        f"Serving fork cache of block {cache.block} with {len(cache)} entries",
+        f"on http://127.0.0.1:{args.port}",
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"Cache hits: {proxy.hits}, misses: {proxy.misses}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+import json
+import os
+from collections import namedtuple
+from pathlib import Path
+
+from eth_utils import keccak, to_bytes, to_checksum_address
+
+PROJECT_PATH = Path(__file__).resolve().parents[2]
+BALANCE_SLOTS_PATH = PROJECT_PATH / "build" / "balance_slots"
+
+# methods to write storage of an account: ganache >= 7, hardhat and anvil
+SET_STORAGE_METHODS = (
+    "evm_setAccountStorageAt",
+    "hardhat_setStorageAt",
+    "anvil_setStorageAt",
+)
+# balanceOf mapping is searched in the first slots of token storage
+MAX_BALANCE_SLOT = 32
+# holder and value written while searching, they can't collide with a real balance
+PROBE_HOLDER = "0x00000000000000000000000000000000000b0b0b"
+PROBE_BALANCE = 0xB0B0B0B0B0B0
+
+# `vyper` mappings hash the slot before the key
+BalanceSlot = namedtuple("BalanceSlot", ["slot", "vyper"])
+
+
+class StorageWriteUnsupported(Exception):
+    pass
+
+
+def mapping_slot(key, slot, vyper=False):
+    """Storage slot of `key` in an `address` keyed mapping declared at `slot`."""
+    key = to_bytes(hexstr=str(key)).rjust(32, b"\0")
+    slot = slot.to_bytes(32, "big")
+    return "0x" + keccak(slot + key if vyper else key + slot).hex()
+
+
+class StorageWriter:
+    """
+    Writes storage of forked accounts with the first method in `SET_STORAGE_METHODS` the node supports.
+    Raises StorageWriteUnsupported when the node supports none of them.
+    """
+
+    def __init__(self, web3):
+        self.web3 = web3
+        self.method = None
+        self.supported = True
+
+    def read(self, address, slot):
+        return int.from_bytes(
+            self.web3.eth.get_storage_at(address, int(slot, 16)), "big"
+        )
+
+    def write(self, address, slot, value):
+        if not self.supported:
+            raise StorageWriteUnsupported("node doesn't support storage writes")
+        value = "0x" + value.to_bytes(32, "big").hex()
+        methods = [self.method] if self.method else SET_STORAGE_METHODS
+        for method in methods:
+            # hardhat expects the slot as a quantity without leading zeros
+            position = hex(int(slot, 16)) if method == "hardhat_setStorageAt" else slot
+            response = self.web3.provider.make_request(
+                method, [address, position, value]
+            )
+            if "error" not in response:
+                self.method = method
+                return
+        self.supported = False
+        raise StorageWriteUnsupported(response["error"].get("message"))
+
+
+class BalanceSlotCache:
+    """Balance slots of tokens stored as `<path>/<token address>.json`, seeded with `known` slots."""
+
+    def __init__(self, path=BALANCE_SLOTS_PATH, known=None):
+        self.path = Path(path)
+        self.known = {address.lower(): slot for address, slot in (known or {}).items()}
+
+    def _file(self, address):
+        return self.path / f"{str(address).lower()}.json"
+
+    def get(self, address):
+        address = str(address).lower()
+        if address in self.known:
+            return self.known[address]
+        path = self._file(address)
+        if not path.is_file():
+            return None
+        data = json.loads(path.read_text())
+        return BalanceSlot(data["slot"], data["vyper"])
+
+    def set(self, address, balance_slot):
+        path = self._file(address)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + ".tmp")
+        tmp_path.write_text(json.dumps(balance_slot._asdict()) + "\n")
+        os.replace(tmp_path, path)
+
+
+def find_balance_slot(writer, token, max_slot=MAX_BALANCE_SLOT):
+    """
+    Finds storage slot of `balanceOf` mapping of `token`. Each candidate slot is set to
+    `PROBE_BALANCE` for `PROBE_HOLDER` and restored after checking `balanceOf`.
+    """
+    address = str(token)
+    for slot in range(max_slot):
+        for vyper in (False, True):
+            storage_slot = mapping_slot(PROBE_HOLDER, slot, vyper)
+            previous = writer.read(address, storage_slot)
+            writer.write(address, storage_slot, PROBE_BALANCE)
+            found = token.balanceOf(PROBE_HOLDER) == PROBE_BALANCE
+            writer.write(address, storage_slot, previous)
+            if found:
+                return BalanceSlot(slot, vyper)
+    raise ValueError(f"balanceOf slot of {address} not found in first {max_slot} slots")
+
+
+class TokenFunder:
+    """
+    Sets token balances by writing `balanceOf` storage. Balance slot of each token is found once
+    and stored in `cache`, so later sessions fund accounts with a single storage write.
+    """
+
+    def __init__(self, web3, cache=None):
+        self.writer = StorageWriter(web3)
+        self.cache = cache or BalanceSlotCache()
+
+    @property
+    def supported(self):
+        return self.writer.supported
+
+    def balance_slot(self, token):
+        balance_slot = self.cache.get(token)
+        if balance_slot is None:
+            balance_slot = find_balance_slot(self.writer, token)
+            self.cache.set(token, balance_slot)
+        return balance_slot
+
+    def set_balance(self, token, holder, balance):
+        holder = to_checksum_address(str(holder))
+        slot, vyper = self.balance_slot(token)
+        self.writer.write(str(token), mapping_slot(holder, slot, vyper), balance)
+        if token.balanceOf(holder) != balance:
+            raise ValueError(f"balance slot {slot} of {token} doesn't store balanceOf")
+
+    def add_balance(self, token, holder, amount):
+        self.set_balance(token, holder, token.balanceOf(holder) + amount)
+        return amount
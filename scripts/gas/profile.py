@@ -0,0 +1,130 @@
+import json
+import os
+from pathlib import Path
+
+PROJECT_PATH = Path(__file__).resolve().parents[2]
+REPORTS_PATH = PROJECT_PATH / "reports"
+BASELINES_PATH = PROJECT_PATH / "tests" / "gas_baseline"
+
+# allowed gas increase over baseline, 0.05 = 5%
+DEFAULT_TOLERANCE = 0.05
+
+
+class GasRegression(AssertionError):
+    pass
+
+
+class MissingBaseline(AssertionError):
+    pass
+
+
+class GasProfile:
+    """
+    Gas used by benchmark scenarios, keyed by `protocol/token/scenario`.
+    Every recorded value is compared with `baseline` and `record` fails when gas is above
+    baseline by more than `tolerance`. Values without baseline are only recorded, in `strict` mode
+    they fail with `MissingBaseline`.
+    In `update` mode nothing is compared and recorded values become the new baseline.
+    """
+
+    def __init__(
+        self, baseline=None, tolerance=DEFAULT_TOLERANCE, update=False, strict=False
+    ):
+        self.baseline = baseline or {}
+        self.tolerance = tolerance
+        self.update = update
+        self.strict = strict
+        self.results = {}
+
+    @staticmethod
+    def key(protocol, token, scenario):
+        return f"{protocol}/{token}/{scenario}"
+
+    def record(self, protocol, token, scenario, gas_used):
+        key = self.key(protocol, token, scenario)
+        self.results[key] = gas_used
+        baseline = self.baseline.get(key)
+        if self.update:
+            return
+        if baseline is None:
+            if self.strict:
+                raise MissingBaseline(
+                    f"{key} used {gas_used} gas and has no baseline, "
+                    "record it with GAS_UPDATE_BASELINE=true"
+                )
+            return
+        limit = baseline * (1 + self.tolerance)
+        if gas_used > limit:
+            raise GasRegression(
+                f"{key} used {gas_used} gas, baseline is {baseline}, "
+                f"limit with {self.tolerance:.0%} tolerance is {int(limit)}"
+            )
+
+    def report(self):
+        report = {}
+        for key, gas_used in sorted(self.results.items()):
+            baseline = self.baseline.get(key)
+            report[key] = {
+                "gas": gas_used,
+                "baseline": baseline,
+                "change": (gas_used - baseline) / baseline if baseline else None,
+            }
+        return {"tolerance": self.tolerance, "results": report}
+
+    def save_report(self, path):
+        _write_json(path, self.report())
+
+    def save_baseline(self, path):
+        # scenarios that didn't run keep their previous baseline
+        _write_json(path, dict(sorted({**self.baseline, **self.results}.items())))
+
+    @classmethod
+    def merge(
+        cls,
+        report_paths,
+        baseline=None,
+        tolerance=DEFAULT_TOLERANCE,
+        update=False,
+        strict=False,
+    ):
+        # each xdist worker saves a report for its own tests, the profile combines their results
+        profile = cls(baseline, tolerance, update, strict)
+        for path in report_paths:
+            report = json.loads(Path(path).read_text())
+            for key, result in report["results"].items():
+                profile.results[key] = result["gas"]
+        return profile
+
+    @staticmethod
+    def load_baseline(path):
+        path = Path(path)
+        if not path.is_file():
+            return None
+        return json.loads(path.read_text())
+
+
+def report_path(network):
+    # gas differs between mainnet fork and local mocks, every network has its own report and baseline
+    return REPORTS_PATH / f"gas_profile-{network}.json"
+
+
+def baseline_path(network):
+    return BASELINES_PATH / f"{network}.json"
+
+
+def worker_report_path(worker_id, path):
+    path = Path(path)
+    return path.with_name(f"{path.stem}-{worker_id}{path.suffix}")
+
+
+def worker_report_paths(path):
+    path = Path(path)
+    return sorted(path.parent.glob(worker_report_path("gw*", path).name))
+
+
+def _write_json(path, data):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_text(json.dumps(data, indent=2) + "\n")
+    os.replace(tmp_path, path)
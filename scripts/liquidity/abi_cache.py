@@ -0,0 +1,81 @@
+import json
+import os
+from functools import lru_cache
+from pathlib import Path
+
+from brownie import Contract
+
+PROJECT_PATH = Path(__file__).resolve().parents[2]
+BUILD_PATH = PROJECT_PATH / "build" / "contracts"
+ABI_CACHE_PATH = PROJECT_PATH / "build" / "abi_cache.json"
+
+# all strategies share view functions of MorphoStrategy, protocol strategies are cached for their extra functions
+CACHED_CONTRACTS = ("MorphoStrategy", "MorphoCompoundStrategy", "MorphoAaveStrategy")
+
+
+def build_abi_cache(build_path=BUILD_PATH, cache_path=ABI_CACHE_PATH):
+    """
+    Builds the ABI cache from compiled artifacts, run `brownie compile` first.
+    Each entry stores the contract ABI and `bytecodeSha1` of the artifact it was built from.
+    The cache file is written only if some bytecode hash changed.
+    """
+    cache = {}
+    for name in CACHED_CONTRACTS:
+        with open(Path(build_path) / f"{name}.json") as artifact_file:
+            artifact = json.load(artifact_file)
+        cache[name] = {"abi": artifact["abi"], "bytecodeSha1": artifact["bytecodeSha1"]}
+
+    cache_path = Path(cache_path)
+    if cache_path.is_file():
+        if _bytecode_hashes(_read(cache_path)) == _bytecode_hashes(cache):
+            # artifacts were recompiled without changes, mark the cache as fresh
+            os.utime(cache_path)
+            return cache
+
+    # write to temporary file and rename so readers never see a partial cache
+    tmp_path = cache_path.with_suffix(".tmp")
+    with open(tmp_path, "w") as cache_file:
+        json.dump(cache, cache_file)
+    os.replace(tmp_path, cache_path)
+    load_abi_cache.cache_clear()
+    return cache
+
+
+@lru_cache(maxsize=None)
+def load_abi_cache(cache_path=ABI_CACHE_PATH, build_path=BUILD_PATH):
+    """
+    Loads the ABI cache, parsed once per process.
+    The cache is rebuilt when missing or older than any of the compiled artifacts.
+    """
+    cache_path = Path(cache_path)
+    if _is_stale(cache_path, Path(build_path)):
+        return build_abi_cache(build_path, cache_path)
+    return _read(cache_path)
+
+
+def strategy_contract(address, name="MorphoStrategy"):
+    """
+    Creates strategy `Contract` object from the cached ABI, without a block explorer lookup.
+    """
+    abi = load_abi_cache()[name]["abi"]
+    return Contract.from_abi(name, address, abi, persist=False)
+
+
+def _is_stale(cache_path, build_path):
+    if not cache_path.is_file():
+        return True
+    cache_mtime = cache_path.stat().st_mtime
+    for name in CACHED_CONTRACTS:
+        artifact_path = build_path / f"{name}.json"
+        if artifact_path.is_file() and artifact_path.stat().st_mtime > cache_mtime:
+            return True
+    return False
+
+
+def _bytecode_hashes(cache):
+    return {name: entry["bytecodeSha1"] for name, entry in cache.items()}
+
+
+def _read(cache_path):
+    with open(cache_path) as cache_file:
+        return json.load(cache_file)
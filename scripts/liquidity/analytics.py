@@ -0,0 +1,145 @@
+import os
+from pathlib import Path
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from scripts.liquidity.rows import COLUMNS
+from scripts.liquidity.storage import u256_to_float
+
+PROJECT_PATH = Path(__file__).resolve().parents[2]
+CACHE_PATH = PROJECT_PATH / "build" / "liquidity_cache"
+
+_loaded = {}
+
+
+class LiquidityData:
+    """
+    Liquidity history of one strategy as a read-only `(rows, columns)` float64 array.
+    Columns are in the order of `COLUMNS` and can be selected by name: `data["Max P2P Supply"]`.
+    Balances are converted to float64 so values above 2**53 lose precision, which doesn't
+    matter for ratios and statistics.
+    """
+
+    def __init__(self, values):
+        self.values = values
+
+    def __len__(self):
+        return len(self.values)
+
+    def __getitem__(self, column):
+        return self.values[:, COLUMNS.index(column)]
+
+    @property
+    def timestamps(self):
+        return self["Timestamp"].astype(np.int64)
+
+    def between(self, start=None, end=None):
+        # rows are sorted by timestamp, both ends are included
+        timestamps = self["Timestamp"]
+        first = 0 if start is None else np.searchsorted(timestamps, start, "left")
+        last = len(self) if end is None else np.searchsorted(timestamps, end, "right")
+        return LiquidityData(self.values[first:last])
+
+
+def load_csv(path, cache_path=CACHE_PATH):
+    """
+    Loads a `strategy_<address>.csv` file. The file is parsed once and stored as `.npy` in `cache_path`,
+    later loads memory-map the cached array. Cache is invalidated when the CSV file changes.
+    """
+    path = Path(path)
+    stat = path.stat()
+    key = (str(path.resolve()), stat.st_size, stat.st_mtime_ns)
+    if key in _loaded:
+        return _loaded[key]
+
+    cache_file = Path(cache_path) / f"{path.stem}-{stat.st_size}-{stat.st_mtime_ns}.npy"
+    if not cache_file.is_file():
+        values = np.loadtxt(path, delimiter=",", skiprows=1, dtype=np.float64, ndmin=2)
+        values = values.reshape(-1, len(COLUMNS))
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        _remove_stale(cache_file)
+        tmp_file = cache_file.with_name(cache_file.stem + ".tmp.npy")
+        np.save(tmp_file, values)
+        os.replace(tmp_file, cache_file)
+
+    data = LiquidityData(np.load(cache_file, mmap_mode="r"))
+    _loaded[key] = data
+    return data
+
+
+def load_storage(storage, address, start=None, end=None):
+    """
+    Loads liquidity history from any storage in `scripts/liquidity/storage.py`.
+    """
+    columns = storage.read(address, COLUMNS, start, end)
+    return LiquidityData(
+        np.column_stack([u256_to_float(columns[column]) for column in COLUMNS])
+    )
+
+
+def load_all(data_path, cache_path=CACHE_PATH):
+    """
+    Loads all `strategy_<address>.csv` files in `data_path`, returns a dict of address to data.
+    """
+    return {
+        path.stem[len("strategy_") :]: load_csv(path, cache_path)
+        for path in sorted(Path(data_path).glob("strategy_*.csv"))
+    }
+
+
+def p2p_match_ratio(data):
+    """
+    Share of strategy balance matched peer-to-peer, NaN when the strategy has no balance.
+    """
+    return _ratio(data["Strategy Balance in P2P"], data["Strategy Total Balance"])
+
+
+def market_p2p_utilisation(data):
+    """
+    Share of market supply matched peer-to-peer.
+    """
+    p2p_supply = data["Market P2P Supply"]
+    return _ratio(p2p_supply, p2p_supply + data["Market Pool Supply"])
+
+
+def p2p_headroom(data):
+    """
+    Additional strategy balance that could be matched peer-to-peer. `Max P2P Supply` is the P2P balance
+    the strategy would have after supplying an unlimited amount.
+    """
+    return np.maximum(data["Max P2P Supply"] - data["Strategy Balance in P2P"], 0.0)
+
+
+def rolling(values, window):
+    """
+    Rolling mean, standard deviation, minimum and maximum over the last `window` rows.
+    The first `window - 1` rows don't have a full window and are NaN.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    stats = {
+        name: np.full(len(values), np.nan) for name in ("mean", "std", "min", "max")
+    }
+    if len(values) < window:
+        return stats
+    windows = sliding_window_view(values, window)
+    stats["mean"][window - 1 :] = windows.mean(axis=1)
+    stats["std"][window - 1 :] = windows.std(axis=1)
+    stats["min"][window - 1 :] = windows.min(axis=1)
+    stats["max"][window - 1 :] = windows.max(axis=1)
+    return stats
+
+
+def _ratio(numerator, denominator):
+    return np.divide(
+        numerator,
+        denominator,
+        out=np.full(len(numerator), np.nan),
+        where=denominator > 0,
+    )
+
+
+def _remove_stale(cache_file):
+    # cached arrays of older versions of the same CSV file
+    for stale in cache_file.parent.glob(cache_file.name.rsplit("-", 2)[0] + "-*.npy"):
+        stale.unlink()
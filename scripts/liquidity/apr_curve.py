@@ -0,0 +1,137 @@
+import os
+from pathlib import Path
+
+import numpy as np
+
+from scripts.liquidity.multicall import aggregate
+
+PROJECT_PATH = Path(__file__).resolve().parents[2]
+CACHE_PATH = PROJECT_PATH / "build" / "apr_curves"
+
+# calls per Multicall2 request, keeps one eth_call below node gas limits
+DEFAULT_BATCH_SIZE = 50
+
+
+def amount_grid(min_amount, max_amount, points=64):
+    """
+    Log-spaced grid of supply amounts in want decimals, starting with zero amount for the current APR.
+    """
+    amounts = np.geomspace(min_amount, max_amount, points)
+    return [0] + sorted(set(int(round(amount)) for amount in amounts))
+
+
+class AprCurve:
+    """
+    `getSupplyBalancesForAmount` sampled over `amounts` at one block.
+    Balances are strategy balances after supplying the amount, APR is in 1e18 precision for both protocols.
+    Lookups interpolate linearly between sampled amounts and clamp outside of the grid.
+    """
+
+    def __init__(self, address, block, amounts, balance_in_p2p, balance_on_pool, apr):
+        self.address = address
+        self.block = block
+        self.amounts = np.asarray(amounts, dtype=np.float64)
+        self.balance_in_p2p = np.asarray(balance_in_p2p, dtype=np.float64)
+        self.balance_on_pool = np.asarray(balance_on_pool, dtype=np.float64)
+        self.apr = np.asarray(apr, dtype=np.float64)
+
+    def __call__(self, amount):
+        """
+        Returns `(balance_in_p2p, balance_on_pool, apr)` for `amount`, scalar or array.
+        """
+        return (
+            np.interp(amount, self.amounts, self.balance_in_p2p),
+            np.interp(amount, self.amounts, self.balance_on_pool),
+            np.interp(amount, self.amounts, self.apr),
+        )
+
+    def p2p_share(self, amount):
+        balance_in_p2p, balance_on_pool, _ = self(amount)
+        total = balance_in_p2p + balance_on_pool
+        return np.divide(
+            balance_in_p2p,
+            total,
+            out=np.full(np.shape(total), np.nan),
+            where=total > 0,
+        )
+
+    def save(self, path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.stem + ".tmp.npz")
+        np.savez(
+            tmp_path,
+            block=self.block,
+            amounts=self.amounts,
+            balance_in_p2p=self.balance_in_p2p,
+            balance_on_pool=self.balance_on_pool,
+            apr=self.apr,
+        )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, address, path):
+        with np.load(path) as data:
+            return cls(
+                address,
+                int(data["block"]),
+                data["amounts"],
+                data["balance_in_p2p"],
+                data["balance_on_pool"],
+                data["apr"],
+            )
+
+
+def sample_apr_curve(
+    multicall, strategy, amounts, block_identifier=None, batch_size=DEFAULT_BATCH_SIZE
+):
+    """
+    Calls `getSupplyBalancesForAmount` for all `amounts` with Multicall2.
+    Calls are split into batches of `batch_size`, all batches are pinned to the block of the first one.
+    """
+    view = strategy.getSupplyBalancesForAmount
+    outputs = []
+    block = block_identifier
+    for start in range(0, len(amounts), batch_size):
+        calls = [
+            (strategy.address, view.encode_input(amount))
+            for amount in amounts[start : start + batch_size]
+        ]
+        block, return_data = aggregate(multicall, calls, block)
+        outputs += [view.decode_output(data) for data in return_data]
+    balance_in_p2p, balance_on_pool, apr = zip(*outputs)
+    return AprCurve(
+        strategy.address, block, amounts, balance_in_p2p, balance_on_pool, apr
+    )
+
+
+class AprCurveCache:
+    """
+    APR curves per `(strategy, block)`, kept in memory and as `.npz` files in `cache_path`.
+    State at a mined block doesn't change, so cached curves never expire.
+    A curve requested without a block number is sampled at the latest block and cached under that block.
+    """
+
+    def __init__(self, cache_path=CACHE_PATH):
+        self.cache_path = Path(cache_path)
+        self._curves = {}
+
+    def path(self, address, block):
+        return self.cache_path / f"{address}-{block}.npz"
+
+    def get(self, multicall, strategy, block, amounts, **sample_kwargs):
+        key = (strategy.address, block)
+        if key in self._curves:
+            return self._curves[key]
+        path = self.path(*key)
+        if isinstance(block, int) and path.is_file():
+            curve = AprCurve.load(strategy.address, path)
+        else:
+            curve = sample_apr_curve(
+                multicall, strategy, amounts, block, **sample_kwargs
+            )
+            # `None` or "latest" resolve to the block the curve was sampled at
+            key = (strategy.address, curve.block)
+            curve.save(self.path(*key))
+        self._curves[key] = curve
+        return curve
@@ -0,0 +1,49 @@
+import asyncio
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+# `row` is None and `error` holds the last exception if all attempts failed
+CollectionResult = namedtuple("CollectionResult", ["key", "row", "error", "attempts"])
+
+
+async def collect_rows_async(
+    keys, fetch_row, concurrency=8, timeout=30, retries=3, backoff=0.5
+):
+    """
+    Runs blocking `fetch_row(key)` for all `keys`, strategy addresses or block numbers,
+    with at most `concurrency` calls in flight.
+    Each attempt is limited to `timeout` seconds and failed attempts are retried `retries` times,
+    waiting `backoff * 2 ** (attempt - 1)` seconds between attempts.
+    Results are returned in the order of `keys`, a failing key doesn't stop the others.
+    """
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(concurrency)
+    # timed out calls can't be cancelled and keep their thread, extra workers keep the pool from starving
+    executor = ThreadPoolExecutor(max_workers=2 * concurrency)
+
+    async def collect(key):
+        error = None
+        for attempt in range(1, retries + 2):
+            async with semaphore:
+                try:
+                    row = await asyncio.wait_for(
+                        loop.run_in_executor(executor, fetch_row, key), timeout
+                    )
+                    return CollectionResult(key, row, None, attempt)
+                except Exception as e:
+                    error = e
+            if attempt <= retries:
+                await asyncio.sleep(backoff * 2 ** (attempt - 1))
+        return CollectionResult(key, None, error, retries + 1)
+
+    try:
+        return await asyncio.gather(*[collect(key) for key in keys])
+    finally:
+        executor.shutdown(wait=False)
+
+
+def collect_rows(keys, fetch_row, **kwargs):
+    """
+    Synchronous entry point for `collect_rows_async`.
+    """
+    return asyncio.run(collect_rows_async(keys, fetch_row, **kwargs))
@@ -0,0 +1,136 @@
+import json
+import os
+from pathlib import Path
+
+from scripts.liquidity.async_collector import collect_rows
+from scripts.liquidity.multicall import fetch_liquidity_rows
+from scripts.liquidity.rows import COLUMNS, format_row
+
+# backfilled rows are keyed by block number, other columns are the same as in daily snapshots
+BACKFILL_COLUMNS = ("Block",) + COLUMNS
+BACKFILL_CSV_HEADER = ",".join(BACKFILL_COLUMNS) + "\n"
+
+
+def backfill_blocks(from_block, to_block, stride):
+    """
+    Returns blocks from `from_block` to `to_block`, both included, sampled every `stride` blocks.
+    """
+    return list(range(from_block, to_block + 1, stride))
+
+
+def backfill(
+    multicall,
+    strategies,
+    blocks,
+    data_path,
+    chunk_size=50,
+    checkpoint_path=None,
+    **collect_kwargs,
+):
+    """
+    Fetches liquidity rows of `strategies` at each of `blocks` and appends them to
+    `<data_path>/strategy_<address>.csv` files.
+
+    Blocks are processed in chunks of `chunk_size`, blocks inside a chunk are fetched in parallel
+    with `collect_rows` configured by `collect_kwargs`. After each chunk the last stored block
+    is written to `checkpoint_path` so an interrupted backfill resumes from there.
+    Stops at the first block that can't be fetched, returns the last stored block or None.
+    """
+    data_path = Path(data_path)
+    data_path.mkdir(parents=True, exist_ok=True)
+    addresses = [strategy.address for strategy in strategies]
+    checkpoint_path = Path(checkpoint_path or data_path / "checkpoint.json")
+    last_block = _load_checkpoint(checkpoint_path, addresses, blocks)
+    blocks = [block for block in blocks if last_block is None or block > last_block]
+
+    files = {address: _BackfillFile(data_path, address) for address in addresses}
+    # files are append only, blocks up to the last stored block can't be written to them
+    stored_block = min(
+        (-1 if file.last_block is None else file.last_block for file in files.values()),
+        default=-1,
+    )
+    skipped = [block for block in blocks if block <= stored_block]
+    if skipped:
+        print(
+            f"WARNING: Skipping {len(skipped)} blocks from {skipped[0]} to {skipped[-1]},",
+            f"liquidity data in {data_path} is already stored up to block {stored_block}.",
+            "Backfill earlier blocks to another data path.",
+        )
+        blocks = blocks[len(skipped) :]
+
+    def fetch_block(block):
+        return fetch_liquidity_rows(multicall, strategies, block_identifier=block)[1]
+
+    for start in range(0, len(blocks), chunk_size):
+        chunk = blocks[start : start + chunk_size]
+        results = collect_rows(chunk, fetch_block, **collect_kwargs)
+        for result in results:
+            if result.error is not None:
+                print(
+                    "ERROR: Failed to fetch liquidity data at block:",
+                    result.key,
+                    repr(result.error),
+                )
+                if last_block is not None:
+                    _save_checkpoint(checkpoint_path, addresses, last_block)
+                return last_block
+            for address, row in zip(addresses, result.row):
+                files[address].append(result.key, row)
+            last_block = result.key
+        _save_checkpoint(checkpoint_path, addresses, last_block)
+        print("Backfilled liquidity data up to block:", last_block)
+    return last_block
+
+
+class _BackfillFile:
+    """
+    Appends backfilled rows to one strategy file.
+    Rows for blocks already in the file are skipped, `backfill` warns about blocks it skips before fetching.
+    """
+
+    def __init__(self, data_path, address):
+        self.path = data_path / f"strategy_{address}.csv"
+        self.last_block = _last_stored_block(self.path)
+        if self.last_block is None:
+            with open(self.path, "w") as data_file:
+                data_file.write(BACKFILL_CSV_HEADER)
+
+    def append(self, block, row):
+        if self.last_block is not None and block <= self.last_block:
+            return
+        with open(self.path, "a") as data_file:
+            data_file.write(format_row((block,) + tuple(row)))
+        self.last_block = block
+
+
+def _last_stored_block(path):
+    if not path.is_file():
+        return None
+    with open(path, "rb") as data_file:
+        # the last row is short, reading the tail of the file is enough
+        data_file.seek(max(0, path.stat().st_size - 4096))
+        lines = data_file.read().splitlines()
+    # empty file is left by an interrupted run before the header was written
+    if not lines:
+        return None
+    if lines[-1] == BACKFILL_CSV_HEADER.strip().encode():
+        return -1
+    return int(lines[-1].split(b",")[0])
+
+
+def _load_checkpoint(checkpoint_path, addresses, blocks):
+    if not checkpoint_path.is_file():
+        return None
+    with open(checkpoint_path) as checkpoint_file:
+        checkpoint = json.load(checkpoint_file)
+    # resume only the same backfill, otherwise start from the first block
+    if checkpoint["strategies"] != addresses or checkpoint["lastBlock"] not in blocks:
+        return None
+    return checkpoint["lastBlock"]
+
+
+def _save_checkpoint(checkpoint_path, addresses, last_block):
+    tmp_path = checkpoint_path.with_suffix(".tmp")
+    with open(tmp_path, "w") as checkpoint_file:
+        json.dump({"strategies": addresses, "lastBlock": last_block}, checkpoint_file)
+    os.replace(tmp_path, checkpoint_path)
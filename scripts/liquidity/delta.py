@@ -0,0 +1,58 @@
+from bisect import bisect_right
+
+
+def has_changed(previous, row, threshold=0.0):
+    """
+    Returns True if any value column of `row` differs from `previous` by more than
+    `threshold` relative to the previous value. Timestamp, the first column, is ignored.
+    """
+    for old, new in zip(previous[1:], row[1:]):
+        if abs(new - old) > threshold * abs(old):
+            return True
+    return False
+
+
+def encode_delta(previous, row):
+    """
+    Encodes `row` as differences to `previous` row, unchanged columns are empty.
+    Timestamp is always stored as absolute value. The first row of a file has no `previous`
+    and is stored with absolute values.
+    """
+    if previous is None:
+        return [str(value) for value in row]
+    deltas = [str(row[0])]
+    for old, new in zip(previous[1:], row[1:]):
+        deltas.append(str(new - old) if new != old else "")
+    return deltas
+
+
+def decode_delta(lines):
+    """
+    Rebuilds full rows from encoded rows, each line is a list of strings.
+    """
+    rows = []
+    previous = None
+    for line in lines:
+        if previous is None:
+            row = tuple(int(value) for value in line)
+        else:
+            row = (int(line[0]),) + tuple(
+                old + int(delta) if delta else old
+                for old, delta in zip(previous[1:], line[1:])
+            )
+        rows.append(row)
+        previous = row
+    return rows
+
+
+def resample(rows, timestamps):
+    """
+    Rebuilds the time series at `timestamps` from stored rows, each value is the last stored row
+    at or before that timestamp. Timestamps before the first row get None.
+    """
+    stored = [row[0] for row in rows]
+    series = []
+    for timestamp in timestamps:
+        i = bisect_right(stored, timestamp)
+        series.append((timestamp,) + tuple(rows[i - 1][1:]) if i > 0 else None)
+    return series
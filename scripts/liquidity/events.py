@@ -0,0 +1,114 @@
+import time
+
+from eth_utils import encode_hex, keccak, to_checksum_address
+
+# Morpho events that change supply or P2P state of a market, pool token is one of the indexed arguments
+MORPHO_EVENTS = (
+    "Supplied(address,address,address,uint256,uint256,uint256)",
+    "Withdrawn(address,address,address,uint256,uint256,uint256)",
+    "Borrowed(address,address,uint256,uint256,uint256)",
+    "Repaid(address,address,address,uint256,uint256,uint256)",
+    "P2PAmountsUpdated(address,uint256,uint256)",
+    "P2PSupplyDeltaUpdated(address,uint256)",
+    "P2PBorrowDeltaUpdated(address,uint256)",
+)
+MORPHO_TOPICS = [encode_hex(keccak(text=event)) for event in MORPHO_EVENTS]
+
+
+def _topic_address(address):
+    return "0x" + address.lower()[2:].rjust(64, "0")
+
+
+def _hex(value):
+    # web3 returns topics as bytes, tests and some providers as hex strings
+    if isinstance(value, (bytes, bytearray)):
+        return encode_hex(value).lower()
+    return value.lower()
+
+
+class MorphoEventWatcher:
+    """
+    Finds strategies whose Morpho market changed in a block range.
+    `strategies` maps strategy address to `(morpho, poolToken)`.
+    """
+
+    def __init__(self, web3, strategies, topics=MORPHO_TOPICS):
+        self.web3 = web3
+        self.strategies = strategies
+        self.topics = topics
+        self._by_market = {}
+        for address, (morpho, pool_token) in strategies.items():
+            key = (morpho.lower(), _topic_address(pool_token))
+            self._by_market.setdefault(key, []).append(address)
+
+    def changed(self, from_block, to_block):
+        """
+        Returns strategies with a Morpho event for their pool token between `from_block` and `to_block`,
+        in the order of `strategies`.
+        """
+        morphos = sorted({morpho for morpho, _ in self._by_market})
+        logs = self.web3.eth.get_logs(
+            {
+                "address": [to_checksum_address(morpho) for morpho in morphos],
+                "topics": [self.topics],
+                "fromBlock": from_block,
+                "toBlock": to_block,
+            }
+        )
+        changed = set()
+        for log in logs:
+            morpho = _hex(log["address"])
+            for topic in log["topics"][1:]:
+                changed.update(self._by_market.get((morpho, _hex(topic)), []))
+        return [address for address in self.strategies if address in changed]
+
+
+class BlockFollower:
+    """
+    Yields ranges `(from_block, to_block)` of new blocks, starting after `start_block`.
+    Mode `poll` checks the latest block number every `poll_interval` seconds,
+    mode `filter` uses a node block filter. A range is at most `max_range` blocks long.
+    """
+
+    def __init__(
+        self, web3, start_block, mode="poll", poll_interval=12, max_range=2000
+    ):
+        if mode not in ("poll", "filter"):
+            raise ValueError(
+                f"Unknown block follower mode '{mode}', use poll or filter"
+            )
+        self.web3 = web3
+        self.last_block = start_block
+        self.mode = mode
+        self.poll_interval = poll_interval
+        self.max_range = max_range
+        self._sleep = time.sleep
+
+    def __iter__(self):
+        block_filter = self.web3.eth.filter("latest") if self.mode == "filter" else None
+        while True:
+            if block_filter is None or block_filter.get_new_entries():
+                yield from self.ranges(self.web3.eth.block_number)
+            self._sleep(self.poll_interval)
+
+    def ranges(self, latest_block):
+        while self.last_block < latest_block:
+            to_block = min(latest_block, self.last_block + self.max_range)
+            yield self.last_block + 1, to_block
+            self.last_block = to_block
+
+
+class RowDeduplicator:
+    """
+    Drops rows equal to the previous row of the same strategy, ignoring the timestamp.
+    """
+
+    def __init__(self):
+        self._last = {}
+
+    def is_new(self, address, row):
+        values = tuple(row[1:])
+        if self._last.get(address) == values:
+            return False
+        self._last[address] = values
+        return True
@@ -0,0 +1,59 @@
+from scripts.liquidity.rows import build_row
+
+# MakerDAO Multicall2 on Ethereum mainnet, see contracts/mocks/Multicall2.sol for the local stand-in
+MULTICALL2_ADDRESS = "0x5BA1e12693Dc8F9c48aAD8770482f4739bEeD696"
+
+# strategy view functions needed for one row, in the order they are encoded
+STRATEGY_VIEWS = (
+    "getStrategySupplyBalance",
+    "getCurrentMarketLiquidity",
+    "getMaxP2PSupply",
+)
+
+
+def encode_strategy_calls(strategies):
+    """
+    Encodes every view call needed for the liquidity rows of `strategies` into
+    Multicall2 `Call` structs: `(target, callData)`.
+    """
+    calls = []
+    for strategy in strategies:
+        for view in STRATEGY_VIEWS:
+            calls.append((strategy.address, getattr(strategy, view).encode_input()))
+    return calls
+
+
+def aggregate(multicall, calls, block_identifier=None):
+    """
+    Executes all `calls` in one `eth_call` to `multicall`.
+    Every call is evaluated against the same block, returns the block number and raw return data.
+    Reverts if any of the calls fails, so a row is never built from partial data.
+    """
+    block_number, _, results = multicall.tryBlockAndAggregate.call(
+        True, calls, block_identifier=block_identifier
+    )
+    return block_number, [return_data for _, return_data in results]
+
+
+def fetch_liquidity_rows(multicall, strategies, block_identifier=None):
+    """
+    Fetches liquidity rows for all `strategies` in one round-trip pinned to one block.
+    Returns the block number and rows in the same order as `strategies`.
+    """
+    calls = [(multicall.address, multicall.getCurrentBlockTimestamp.encode_input())]
+    calls += encode_strategy_calls(strategies)
+    block_number, return_data = aggregate(multicall, calls, block_identifier)
+
+    timestamp = multicall.getCurrentBlockTimestamp.decode_output(return_data[0])
+    rows = []
+    views_count = len(STRATEGY_VIEWS)
+    for i, strategy in enumerate(strategies):
+        offset = 1 + i * views_count
+        outputs = [
+            getattr(strategy, view).decode_output(data)
+            for view, data in zip(
+                STRATEGY_VIEWS, return_data[offset : offset + views_count]
+            )
+        ]
+        rows.append(build_row(timestamp, *outputs))
+    return block_number, rows
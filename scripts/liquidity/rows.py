@@ -0,0 +1,70 @@
+# Column layout of the liquidity data files, see data/example_file.csv
+COLUMNS = (
+    "Timestamp",
+    "Strategy Total Balance",
+    "Strategy Balance in P2P",
+    "Strategy Balance On Pool",
+    "Market P2P Supply",
+    "Market P2P Borrow",
+    "Market Pool Supply",
+    "Market Pool Borrow",
+    "Max P2P Supply",
+)
+
+CSV_HEADER = ",".join(COLUMNS) + "\n"
+
+
+def build_row(timestamp, strategy_supply_balance, market_liquidity, max_p2p_supply):
+    """
+    Orders the outputs of the strategy view functions into a row of the data file.
+
+    `strategy_supply_balance` is the output of `getStrategySupplyBalance` and
+    `market_liquidity` is the output of `getCurrentMarketLiquidity`.
+    """
+    (
+        balance_on_pool,
+        balance_in_p2p,
+        total_balance,
+    ) = strategy_supply_balance
+    (
+        p2p_supply,
+        p2p_borrow,
+        pool_supply,
+        pool_borrow,
+    ) = market_liquidity
+    return (
+        int(timestamp),
+        int(total_balance),
+        int(balance_in_p2p),
+        int(balance_on_pool),
+        int(p2p_supply),
+        int(p2p_borrow),
+        int(pool_supply),
+        int(pool_borrow),
+        int(max_p2p_supply),
+    )
+
+
+def build_row_from_metrics(timestamp, metrics):
+    """
+    Builds a row from the output of `getStrategyMetrics`, a mapping of `StrategyMetrics` field names.
+    """
+    return build_row(
+        timestamp,
+        (
+            metrics["balanceOnPool"],
+            metrics["balanceInP2P"],
+            metrics["totalSupplyBalance"],
+        ),
+        (
+            metrics["p2pSupplyAmount"],
+            metrics["p2pBorrowAmount"],
+            metrics["poolSupplyAmount"],
+            metrics["poolBorrowAmount"],
+        ),
+        metrics["maxP2PSupply"],
+    )
+
+
+def format_row(row):
+    return ",".join(str(value) for value in row) + "\n"
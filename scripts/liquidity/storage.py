@@ -0,0 +1,274 @@
+import csv
+import os
+from pathlib import Path
+
+import numpy as np
+
+from scripts.liquidity.delta import decode_delta, encode_delta, has_changed
+from scripts.liquidity.rows import COLUMNS, CSV_HEADER, format_row
+
+# uint256 value stored as 4 big-endian uint64 limbs, most significant first, 32 bytes per value
+U256_DTYPE = np.dtype(">u8")
+U256_LIMBS = 4
+U256_SIZE = U256_DTYPE.itemsize * U256_LIMBS
+_LIMB_WEIGHTS = np.array([2.0**192, 2.0**128, 2.0**64, 1.0])
+
+
+def u256_from_ints(values):
+    """
+    Converts python integers to an array of shape `(n, 4)` of uint64 limbs, lossless.
+    """
+    data = b"".join(int(value).to_bytes(U256_SIZE, "big") for value in values)
+    return np.frombuffer(data, dtype=U256_DTYPE).reshape(-1, U256_LIMBS)
+
+
+def u256_to_ints(limbs):
+    """
+    Converts uint64 limbs back to python integers, lossless.
+    """
+    data = np.ascontiguousarray(limbs, dtype=U256_DTYPE).tobytes()
+    return [
+        int.from_bytes(data[i : i + U256_SIZE], "big")
+        for i in range(0, len(data), U256_SIZE)
+    ]
+
+
+def u256_to_float(limbs):
+    """
+    Converts uint64 limbs to float64, vectorized but loses precision above 2**53.
+    """
+    return np.asarray(limbs, dtype=np.float64) @ _LIMB_WEIGHTS
+
+
+class _FileStorage:
+    """
+    Keeps append handles open between appends when `keep_open` is set, used by long-running collectors.
+    """
+
+    def __init__(self, data_path, keep_open=False):
+        self.data_path = Path(data_path)
+        self.keep_open = keep_open
+        self._files = {}
+
+    def flush(self):
+        for data_file in self._files.values():
+            data_file.flush()
+
+    def sync(self):
+        # flush python buffers and force the OS to write them to disk
+        for data_file in self._files.values():
+            data_file.flush()
+            os.fsync(data_file.fileno())
+
+    def close(self):
+        for data_file in self._files.values():
+            data_file.close()
+        self._files = {}
+
+    def _write(self, path, data, create=None):
+        data_file = self._files.get(path)
+        if data_file is None:
+            if create is not None and not path.is_file():
+                create(path)
+            data_file = open(path, "ab")
+            if self.keep_open:
+                self._files[path] = data_file
+        data_file.write(data)
+        if not self.keep_open:
+            data_file.close()
+
+
+class CsvStorage(_FileStorage):
+    """
+    Stores rows of each strategy in text file `strategy_<address>.csv`.
+    """
+
+    def path(self, address):
+        return self.data_path / f"strategy_{address}.csv"
+
+    def append(self, address, rows):
+        data = "".join(format_row(row) for row in rows).encode()
+        self._write(self.path(address), data, create=_create_csv)
+
+    def read(self, address, columns=COLUMNS, start=None, end=None):
+        """
+        Parses the whole file, returns requested `columns` as uint64 limbs for rows with
+        timestamp between `start` and `end`, both included.
+        """
+        with open(self.path(address)) as data_file:
+            reader = csv.reader(data_file)
+            header = next(reader)
+            rows = [
+                row
+                for row in ([int(value) for value in line] for line in reader)
+                if (start is None or row[0] >= start) and (end is None or row[0] <= end)
+            ]
+        return {
+            column: u256_from_ints([row[header.index(column)] for row in rows])
+            for column in columns
+        }
+
+
+class DeltaCsvStorage(_FileStorage):
+    """
+    Stores rows of each strategy in text file `strategy_<address>.csv` with per-column deltas.
+    A row is stored only if some value changed by more than `threshold` relative to the last stored row,
+    the default `0` skips only identical rows. Values are stored as differences to the last stored row
+    and unchanged values are left empty, see `scripts/liquidity/delta.py`.
+    """
+
+    def __init__(self, data_path, keep_open=False, threshold=0.0):
+        super().__init__(data_path, keep_open)
+        self.threshold = threshold
+        self._last = {}
+
+    def path(self, address):
+        return self.data_path / f"strategy_{address}.csv"
+
+    def append(self, address, rows):
+        previous = self._last_row(address)
+        lines = []
+        for row in rows:
+            if previous is None or has_changed(previous, row, self.threshold):
+                lines.append(",".join(encode_delta(previous, row)) + "\n")
+                previous = tuple(row)
+        self._last[address] = previous
+        self._write(self.path(address), "".join(lines).encode(), create=_create_csv)
+
+    def read(self, address, columns=COLUMNS, start=None, end=None):
+        """
+        Decodes the whole file, returns requested `columns` of stored rows as uint64 limbs for rows
+        with timestamp between `start` and `end`, both included.
+        """
+        rows = [
+            row
+            for row in self.decode(address)
+            if (start is None or row[0] >= start) and (end is None or row[0] <= end)
+        ]
+        return {
+            column: u256_from_ints([row[COLUMNS.index(column)] for row in rows])
+            for column in columns
+        }
+
+    def decode(self, address):
+        path = self.path(address)
+        if not path.is_file():
+            return []
+        self.flush()
+        with open(path) as data_file:
+            reader = csv.reader(data_file)
+            next(reader)
+            return decode_delta(reader)
+
+    def _last_row(self, address):
+        if address not in self._last:
+            rows = self.decode(address)
+            self._last[address] = rows[-1] if rows else None
+        return self._last[address]
+
+
+class ColumnarStorage(_FileStorage):
+    """
+    Stores rows of each strategy in directory `strategy_<address>/` with one binary file per column.
+    Every value is a fixed width 32 bytes big-endian uint256 so appending is a write to the end of
+    each file and reading a column or a time range memory-maps only that part of the data.
+    Rows must be appended in timestamp order.
+    """
+
+    EXTENSION = ".u256"
+
+    def path(self, address):
+        return self.data_path / f"strategy_{address}"
+
+    def column_path(self, address, column):
+        name = column.lower().replace(" ", "_")
+        return self.path(address) / (name + self.EXTENSION)
+
+    def append(self, address, rows):
+        if not rows:
+            return
+        self.path(address).mkdir(parents=True, exist_ok=True)
+        for i, column in enumerate(COLUMNS):
+            values = u256_from_ints(row[i] for row in rows)
+            self._write(self.column_path(address, column), values.tobytes())
+
+    def count(self, address):
+        # an interrupted append can leave columns with different length, only complete rows are counted
+        paths = [self.column_path(address, column) for column in COLUMNS]
+        if not all(path.is_file() for path in paths):
+            return 0
+        self.flush()
+        return min(os.path.getsize(path) // U256_SIZE for path in paths)
+
+    def read(self, address, columns=COLUMNS, start=None, end=None):
+        """
+        Returns requested `columns` as memory-mapped uint64 limbs for rows with timestamp
+        between `start` and `end`, both included. Only the selected rows of requested columns are read.
+        """
+        count = self.count(address)
+        first, last = 0, count
+        if start is not None or end is not None:
+            # timestamps fit in the least significant limb
+            timestamps = self._column(address, COLUMNS[0], count)[:, -1]
+            if start is not None:
+                first = int(np.searchsorted(timestamps, start, side="left"))
+            if end is not None:
+                last = int(np.searchsorted(timestamps, end, side="right"))
+        return {
+            column: self._column(address, column, count)[first:last]
+            for column in columns
+        }
+
+    def _column(self, address, column, count):
+        if count == 0:
+            return np.empty((0, U256_LIMBS), dtype=U256_DTYPE)
+        return np.memmap(
+            self.column_path(address, column),
+            dtype=U256_DTYPE,
+            mode="r",
+            shape=(count, U256_LIMBS),
+        )
+
+
+def _create_csv(path):
+    # header is written to a temporary file and renamed, so the file never exists without the header
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "w") as data_file:
+        data_file.write(CSV_HEADER)
+    os.replace(tmp_path, path)
+
+
+STORAGE_BACKENDS = {
+    "csv": CsvStorage,
+    "columnar": ColumnarStorage,
+    "delta": DeltaCsvStorage,
+}
+
+
+def get_storage(name, data_path, keep_open=False, **options):
+    try:
+        backend = STORAGE_BACKENDS[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown storage '{name}', use one of: {', '.join(STORAGE_BACKENDS)}"
+        ) from None
+    return backend(data_path, keep_open, **options)
+
+
+def convert_csv(csv_storage, target_storage, address, chunk_size=10_000):
+    """
+    Copies all rows of a strategy from `csv_storage` to `target_storage`, returns number of rows.
+    """
+    with open(csv_storage.path(address)) as data_file:
+        reader = csv.reader(data_file)
+        next(reader)
+        count = 0
+        chunk = []
+        for line in reader:
+            chunk.append([int(value) for value in line])
+            if len(chunk) == chunk_size:
+                target_storage.append(address, chunk)
+                count += len(chunk)
+                chunk = []
+        target_storage.append(address, chunk)
+    return count + len(chunk)
@@ -0,0 +1,81 @@
+import time
+
+
+class BufferedWriter:
+    """
+    Buffers rows per strategy for a long-running collector and writes them to `storage`.
+
+    Rows of a strategy are written when its buffer reaches `flush_rows` rows or when `flush_interval`
+    seconds passed since its last flush. Written data is synced to disk every `fsync_interval` seconds,
+    `0` syncs after every flush. Use `storage` created with `keep_open=True` to reuse file handles.
+    """
+
+    def __init__(
+        self,
+        storage,
+        flush_rows=100,
+        flush_interval=60.0,
+        fsync_interval=300.0,
+        clock=time.monotonic,
+    ):
+        self.storage = storage
+        self.flush_rows = flush_rows
+        self.flush_interval = flush_interval
+        self.fsync_interval = fsync_interval
+        self._clock = clock
+        self._buffers = {}
+        # last flush time of each strategy, strategies without a flush count from the start
+        self._last_flush = {}
+        self._started = self._last_sync = clock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def write(self, address, row):
+        buffer = self._buffers.setdefault(address, [])
+        buffer.append(row)
+        if len(buffer) >= self.flush_rows:
+            self._write_buffer(address)
+            self._flushed()
+
+    def tick(self):
+        """
+        Flushes and syncs buffers of strategies whose time threshold passed, call it periodically.
+        """
+        now = self._clock()
+        expired = [
+            address
+            for address in self._buffers
+            if now - self._last_flush.get(address, self._started) >= self.flush_interval
+        ]
+        for address in expired:
+            self._write_buffer(address)
+        if expired:
+            self._flushed()
+
+    def flush(self):
+        for address in list(self._buffers):
+            self._write_buffer(address)
+        self._flushed()
+
+    def close(self):
+        self.flush()
+        self.storage.sync()
+        self.storage.close()
+
+    def _write_buffer(self, address):
+        rows = self._buffers.pop(address, None)
+        if rows:
+            self.storage.append(address, rows)
+        self._last_flush[address] = self._clock()
+
+    def _flushed(self):
+        now = self._clock()
+        if now - self._last_sync >= self.fsync_interval:
+            self.storage.sync()
+            self._last_sync = now
+        else:
+            self.storage.flush()
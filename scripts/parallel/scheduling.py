@@ -0,0 +1,23 @@
+from xdist.scheduler import LoadScopeScheduling
+
+
+def split_group(nodeid):
+    """
+    Group of a test for xdist workers: `tests/aave/test_setup_aave.py::test_deposit[USDT]`
+    belongs to `tests/aave[USDT]`. Tests of one protocol and token share session scoped
+    vault and strategy, so they run on the same worker and the setup is done once per worker.
+    Tests without parameters are grouped by module.
+    """
+    path, _, name = nodeid.partition("::")
+    if not name.endswith("]") or "[" not in name:
+        return path
+    # token is the first parameter, it's the only session scoped parametrized fixture
+    token = name[name.index("[") + 1 : -1].split("-")[0]
+    return f"{path.rsplit('/', 1)[0]}[{token}]"
+
+
+class TokenScheduling(LoadScopeScheduling):
+    """Distributes groups from `split_group` across xdist workers."""
+
+    def _split_scope(self, nodeid):
+        return split_group(nodeid)
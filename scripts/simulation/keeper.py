@@ -0,0 +1,97 @@
+from collections import namedtuple
+
+import numpy as np
+
+SECONDS_PER_YEAR = 365 * 24 * 3600
+# APR of getSupplyBalancesForAmount is in 1e18 precision for both protocols
+APR_PRECISION = 10**18
+
+KeeperResult = namedtuple(
+    "KeeperResult",
+    ["interest", "rewards", "gas_cost", "net_yield", "net_apr", "harvests"],
+)
+
+
+def apr_from_curves(curves, curve_timestamps, timestamps):
+    """
+    Current APR of each `AprCurve`, its value for zero amount, interpolated to `timestamps`.
+    """
+    aprs = [curve(0)[2] for curve in curves]
+    return np.interp(timestamps, curve_timestamps, aprs)
+
+
+def gas_cost_in_want(gas_used, gas_price, want_per_eth):
+    """
+    Cost of a transaction in want decimals. `gas_price` is in wei, scalar or per row,
+    `want_per_eth` is the amount of want in its decimals for 1 ETH.
+    """
+    return gas_used * np.asarray(gas_price, dtype=np.float64) * want_per_eth / 1e18
+
+
+def simulate_keeper(
+    data,
+    apr,
+    intervals,
+    thresholds,
+    harvest_cost,
+    reward_apr=0.0,
+    reward_price=1.0,
+):
+    """
+    Replays harvests of one strategy over liquidity history `data` for every combination of
+    harvest `intervals` (seconds) and reward `thresholds` (reward token amount, like `minCompToClaimOrSell`).
+
+    Strategy balance earns `apr` (1e18 precision, scalar or per row) regardless of harvests. Rewards accrue
+    with `reward_apr` (fraction per year, in want value) and are claimed and sold at `reward_price`
+    (want per reward token) by a harvest only above the threshold. Sold rewards are supplied and earn `apr`.
+    Every harvest costs `harvest_cost` in want, scalar or per row, see `gas_cost_in_want`.
+
+    Time is looped once and all combinations are evaluated as arrays, so thousands of them run in seconds.
+    Returns `KeeperResult` of arrays with shape `(len(intervals), len(thresholds))`,
+    `net_apr` is net yield per year over the average strategy balance.
+    """
+    timestamps = data["Timestamp"]
+    balance = np.asarray(data["Strategy Total Balance"], dtype=np.float64)
+    rows = len(timestamps)
+    apr = np.broadcast_to(np.asarray(apr, dtype=np.float64), (rows,)) / APR_PRECISION
+    harvest_cost = np.broadcast_to(np.asarray(harvest_cost, dtype=np.float64), (rows,))
+    intervals = np.asarray(intervals, dtype=np.float64)[:, None]
+    thresholds = np.asarray(thresholds, dtype=np.float64)[None, :]
+    shape = (intervals.shape[0], thresholds.shape[1])
+
+    # interest of the strategy balance doesn't depend on harvests
+    years = np.diff(timestamps) / SECONDS_PER_YEAR
+    interest = np.full(shape, np.sum(balance[:-1] * apr[:-1] * years))
+
+    pending = np.zeros(shape)  # unclaimed reward tokens
+    reinvested = np.zeros(shape)  # want from sold rewards with its interest
+    gas_cost = np.zeros(shape)
+    harvests = np.zeros(shape, dtype=np.int64)
+    last_harvest = np.full(shape, timestamps[0] if rows else 0.0)
+    for row in range(1, rows):
+        period = years[row - 1]
+        reinvested += reinvested * apr[row - 1] * period
+        pending += (balance[row - 1] + reinvested) * reward_apr * period / reward_price
+        due = timestamps[row] - last_harvest >= intervals
+        gas_cost += np.where(due, harvest_cost[row], 0.0)
+        harvests += due
+        claimed = due & (pending > thresholds)
+        reinvested += np.where(claimed, pending * reward_price, 0.0)
+        pending = np.where(claimed, 0.0, pending)
+        last_harvest = np.where(due, timestamps[row], last_harvest)
+
+    rewards = reinvested
+    net_yield = interest + rewards - gas_cost
+    duration = timestamps[-1] - timestamps[0] if rows else 0.0
+    average_balance = balance.mean() if rows else 0.0
+    if duration > 0 and average_balance > 0:
+        net_apr = net_yield / average_balance * SECONDS_PER_YEAR / duration
+    else:
+        net_apr = np.full(shape, np.nan)
+    return KeeperResult(interest, rewards, gas_cost, net_yield, net_apr, harvests)
+
+
+def best_schedule(result, intervals, thresholds):
+    """Returns `(interval, threshold, net_yield)` of the combination with the highest net yield."""
+    row, column = np.unravel_index(np.argmax(result.net_yield), result.net_yield.shape)
+    return intervals[row], thresholds[column], result.net_yield[row, column]
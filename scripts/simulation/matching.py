@@ -0,0 +1,87 @@
+import heapq
+from collections import namedtuple
+
+import numpy as np
+
+# Rough gas cost of matching one borrower, calibrate it with traces of `morpho.supply` on a fork
+DEFAULT_GAS_PER_MATCH = 25_000
+# Gas used by supply before the matching loop starts
+DEFAULT_BASE_GAS = 0
+
+SupplyResult = namedtuple(
+    "SupplyResult", ["balance_in_p2p", "balance_on_pool", "matches", "gas_used"]
+)
+
+
+def max_matches(
+    max_gas, gas_per_match=DEFAULT_GAS_PER_MATCH, base_gas=DEFAULT_BASE_GAS
+):
+    """
+    Number of borrowers Morpho can match with `max_gas`, vectorized over `max_gas`.
+    Morpho checks used gas before each iteration and breaks once it reaches `maxGasForMatching`,
+    so the last iteration may go over the limit.
+    """
+    available = np.asarray(max_gas, dtype=np.float64) - base_gas
+    return np.where(available > 0, np.ceil(available / gas_per_match), 0).astype(
+        np.int64
+    )
+
+
+class OrderBook:
+    """
+    Borrowers on pool of one Morpho market, matched largest first like Morpho's sorted borrowers list.
+    `p2p_borrow_delta` is P2P borrow amount that sits on pool, supply takes it first without a matching loop.
+    """
+
+    def __init__(
+        self,
+        borrowers_on_pool,
+        p2p_borrow_delta=0,
+        gas_per_match=DEFAULT_GAS_PER_MATCH,
+        base_gas=DEFAULT_BASE_GAS,
+    ):
+        # heapq is a min heap, amounts are negated to pop the largest borrower first
+        self._heap = [-amount for amount in borrowers_on_pool if amount > 0]
+        heapq.heapify(self._heap)
+        self.p2p_borrow_delta = p2p_borrow_delta
+        self.gas_per_match = gas_per_match
+        self.base_gas = base_gas
+
+    def __len__(self):
+        return len(self._heap)
+
+    def supply(self, amount, max_gas):
+        """
+        Supplies `amount` with `max_gas` for matching and updates the order book,
+        matched borrowers leave the pool and a partially matched borrower stays with the rest.
+        """
+        from_delta = min(amount, self.p2p_borrow_delta)
+        self.p2p_borrow_delta -= from_delta
+        remaining = amount - from_delta
+
+        matches = 0
+        limit = int(max_matches(max_gas, self.gas_per_match, self.base_gas))
+        while remaining > 0 and self._heap and matches < limit:
+            borrower = -heapq.heappop(self._heap)
+            matched = min(borrower, remaining)
+            remaining -= matched
+            if borrower > matched:
+                heapq.heappush(self._heap, -(borrower - matched))
+            matches += 1
+
+        gas_used = self.base_gas + matches * self.gas_per_match if matches else 0
+        return SupplyResult(amount - remaining, remaining, matches, gas_used)
+
+    def sweep(self, amounts, max_gas):
+        """
+        P2P balance for every combination of supply `amounts` and `max_gas` budgets without changing
+        the order book. Returns an array of shape `(len(amounts), len(max_gas))`.
+        Vectorized with prefix sums of sorted borrowers, fast enough for thousands of combinations.
+        """
+        amounts = np.asarray(amounts, dtype=np.float64)[:, None]
+        borrowers = np.sort(-np.asarray(self._heap, dtype=np.float64))[::-1]
+        matchable = np.concatenate([[0.0], np.cumsum(borrowers)])
+        matches = np.minimum(
+            max_matches(max_gas, self.gas_per_match, self.base_gas), len(borrowers)
+        )
+        return np.minimum(amounts, self.p2p_borrow_delta + matchable[matches][None, :])
@@ -1,13 +1,87 @@
 import os
-from brownie import Contract
-from brownie import chain
+import time
+from pathlib import Path
+from brownie import Contract, Multicall2
+from brownie import chain, web3
+from scripts.liquidity.abi_cache import strategy_contract
+from scripts.liquidity.async_collector import collect_rows
+from scripts.liquidity.events import BlockFollower, MorphoEventWatcher, RowDeduplicator
+from scripts.liquidity.multicall import MULTICALL2_ADDRESS, fetch_liquidity_rows
+from scripts.liquidity.rows import build_row, build_row_from_metrics
+from scripts.liquidity.storage import get_storage
+from scripts.liquidity.writer import BufferedWriter
+
+DATA_PATH = Path(__file__).resolve().parents[1] / "data"
 
 
 def main():
-    os.chdir("data/")
-    addresses = getEnvVariable("STRATEGY_ADDRESSES")
-    for address in addresses.split(","):
-        fetchAndStoreLiquidityForStrategy(address.strip())
+    storage = getStorage()
+    for address, row in fetchLiquidity(getStrategyAddresses()):
+        print("Writing liquidity data to:", storage.path(address))
+        storage.append(address, [row])
+
+
+def daemon():
+    # long-running collector: brownie run scripts/write_liquidity.py daemon
+    addresses = getStrategyAddresses()
+    writer = BufferedWriter(
+        getStorage(keepOpen=True),
+        flush_rows=int(os.environ.get("LIQUIDITY_FLUSH_ROWS", "100")),
+        flush_interval=float(os.environ.get("LIQUIDITY_FLUSH_INTERVAL", "300")),
+        fsync_interval=float(os.environ.get("LIQUIDITY_FSYNC_INTERVAL", "900")),
+    )
+    with writer:
+        if os.environ.get("LIQUIDITY_TRIGGER", "events") == "events":
+            followMorphoEvents(addresses, writer)
+        else:
+            followInterval(addresses, writer)
+
+
+def followInterval(addresses, writer):
+    # sample all strategies every LIQUIDITY_INTERVAL seconds
+    interval = float(os.environ.get("LIQUIDITY_INTERVAL", "60"))
+    while True:
+        for address, row in fetchLiquidity(addresses):
+            writer.write(address, row)
+        writer.tick()
+        time.sleep(interval)
+
+
+def followMorphoEvents(addresses, writer):
+    # sample a strategy only in blocks where Morpho emitted an event for its pool token
+    multicall = getMulticall()
+    strategies = {address: strategy_contract(address) for address in addresses}
+    watcher = MorphoEventWatcher(
+        web3,
+        {
+            address: (strategy.morpho(), strategy.poolToken())
+            for address, strategy in strategies.items()
+        },
+    )
+    follower = BlockFollower(
+        web3,
+        chain.height,
+        mode=os.environ.get("LIQUIDITY_FOLLOW_MODE", "poll"),
+        poll_interval=float(os.environ.get("LIQUIDITY_POLL_INTERVAL", "12")),
+    )
+    deduplicator = RowDeduplicator()
+
+    def sample(sampledAddresses, block):
+        _, rows = fetch_liquidity_rows(
+            multicall,
+            [strategies[address] for address in sampledAddresses],
+            block_identifier=block,
+        )
+        for address, row in zip(sampledAddresses, rows):
+            if deduplicator.is_new(address, row):
+                writer.write(address, row)
+
+    sample(addresses, follower.last_block)
+    for fromBlock, toBlock in follower:
+        changed = watcher.changed(fromBlock, toBlock)
+        if changed:
+            sample(changed, toBlock)
+        writer.tick()
 
 
 def getEnvVariable(key):
@@ -18,51 +92,88 @@ def getEnvVariable(key):
         exit(1)
 
 
-def fetchAndStoreLiquidityForStrategy(strategyAddress):
-    # it would be nice to remove Contract.from_explorer and import MorphoStrategy class but brownie cannot import abstract class
-    strategy = Contract.from_explorer(strategyAddress)
+def getStrategyAddresses():
+    return [
+        address.strip() for address in getEnvVariable("STRATEGY_ADDRESSES").split(",")
+    ]
+
+
+def getStorage(keepOpen=False, name=None):
+    # CSV files are stored in data folder and other storages in data/<storage name>
+    name = name or os.environ.get("LIQUIDITY_STORAGE", "csv")
+    options = {}
+    if name == "delta":
+        options["threshold"] = float(os.environ.get("LIQUIDITY_DELTA_THRESHOLD", "0"))
+    return get_storage(
+        name,
+        DATA_PATH if name == "csv" else DATA_PATH / name,
+        keep_open=keepOpen,
+        **options,
+    )
+
+
+def fetchLiquidity(strategyAddresses):
+    # returns (address, row) for each strategy that was fetched successfully
+    if os.environ.get("LIQUIDITY_BATCH", "").lower() in ("1", "true"):
+        return fetchLiquidityBatch(strategyAddresses)
+    if int(os.environ.get("LIQUIDITY_CONCURRENCY", "1")) > 1:
+        return fetchLiquidityConcurrently(strategyAddresses)
+    return [
+        (address, fetchLiquidityForStrategy(address)) for address in strategyAddresses
+    ]
+
+
+def fetchLiquidityForStrategy(strategyAddress):
+    # brownie cannot import abstract MorphoStrategy class, ABI is loaded from the local cache of compiled artifacts
+    strategy = strategy_contract(strategyAddress)
     timestamp = chain.time()  # or use chain.height for block number
-    (
-        strategyBalanceOnPool,
-        strategyBalanceInP2P,
-        strategyTotalBalance,
-    ) = strategy.getStrategySupplyBalance()
-    (
-        p2pSupplyAmount,
-        p2pBorrowAmount,
-        poolSupplyAmount,
-        poolBorrowAmount,
-    ) = strategy.getCurrentMarketLiquidity()
-    maxP2PSupply = strategy.getMaxP2PSupply()
-
-    # create row in CSV table
-    row = "{},{},{},{},{},{},{},{},{}\n".format(
+    if os.environ.get("LIQUIDITY_METRICS_VIEW", "").lower() in ("1", "true"):
+        # one call for strategies deployed with getStrategyMetrics view
+        return build_row_from_metrics(timestamp, strategy.getStrategyMetrics())
+    return build_row(
         timestamp,
-        strategyTotalBalance,
-        strategyBalanceInP2P,
-        strategyBalanceOnPool,
-        p2pSupplyAmount,
-        p2pBorrowAmount,
-        poolSupplyAmount,
-        poolBorrowAmount,
-        maxP2PSupply,
+        strategy.getStrategySupplyBalance(),
+        strategy.getCurrentMarketLiquidity(),
+        strategy.getMaxP2PSupply(),
     )
 
-    fileName = "strategy_" + strategyAddress + ".csv"
-    print("Writing liquidity data to file:", fileName)
-    if os.path.isfile(fileName):
-        # append existing file
-        dataFile = open(fileName, "a")
-        dataFile.write(row)
-        dataFile.close()
-    else:
-        # create file
-        dataFile = open(fileName, "w+")
-        # add table header
-        dataFile.write(
-            "Timestamp,Strategy Total Balance,Strategy Balance in P2P,Strategy Balance"
-            " On Pool,Market P2P Supply,Market P2P Borrow,Market Pool Supply,Market"
-            " Pool Borrow,Max P2P Supply\n"
-        )
-        dataFile.write(row)
-        dataFile.close()
+
+def fetchLiquidityConcurrently(strategyAddresses):
+    # strategies are fetched in parallel, rows are returned in the order of STRATEGY_ADDRESSES
+    results = collect_rows(
+        strategyAddresses,
+        fetchLiquidityForStrategy,
+        concurrency=int(os.environ["LIQUIDITY_CONCURRENCY"]),
+        timeout=float(os.environ.get("LIQUIDITY_TIMEOUT", "30")),
+        retries=int(os.environ.get("LIQUIDITY_RETRIES", "3")),
+    )
+    rows = []
+    for result in results:
+        if result.error is not None:
+            print(
+                "ERROR: Failed to fetch liquidity data for strategy:",
+                result.key,
+                repr(result.error),
+            )
+        else:
+            rows.append((result.key, result.row))
+    return rows
+
+
+def fetchLiquidityBatch(strategyAddresses):
+    # all view calls for all strategies are sent in one Multicall2 request pinned to the latest block
+    multicall = getMulticall()
+    strategies = [strategy_contract(address) for address in strategyAddresses]
+    blockNumber, rows = fetch_liquidity_rows(
+        multicall, strategies, block_identifier=chain.height
+    )
+    print("Fetched liquidity data at block:", blockNumber)
+    return list(zip(strategyAddresses, rows))
+
+
+def getMulticall():
+    return Contract.from_abi(
+        "Multicall2",
+        os.environ.get("MULTICALL_ADDRESS", MULTICALL2_ADDRESS),
+        Multicall2.abi,
+    )
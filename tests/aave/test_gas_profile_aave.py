@@ -0,0 +1,43 @@
+import pytest
+
+PROTOCOL = "aave"
+
+# gas is compared with tests/gas_baseline/<network>.json and written to reports/gas_profile-<network>.json
+pytestmark = pytest.mark.all_tokens
+
+
+def test_deposit_and_harvest(token, gas_profile, deposit_and_harvest):
+    deposit_tx, harvest_tx = deposit_and_harvest()
+    gas_profile.record(PROTOCOL, token.symbol(), "deposit", deposit_tx.gas_used)
+    gas_profile.record(PROTOCOL, token.symbol(), "first harvest", harvest_tx.gas_used)
+
+
+def test_profitable_harvest(chain, token, strategy, gas_profile, deposit_and_harvest):
+    deposit_and_harvest()
+    chain.sleep(3600 * 24)
+    chain.mine(1)
+    tx = strategy.harvest()
+    gas_profile.record(PROTOCOL, token.symbol(), "profitable harvest", tx.gas_used)
+
+
+def test_partial_withdraw(token, vault, user, amount, gas_profile, deposit_and_harvest):
+    deposit_and_harvest()
+    tx = vault.withdraw(amount // 2, {"from": user})
+    gas_profile.record(PROTOCOL, token.symbol(), "partial withdraw", tx.gas_used)
+
+
+def test_emergency_exit(chain, token, strategy, gas_profile, deposit_and_harvest):
+    deposit_and_harvest()
+    strategy.setEmergencyExit()
+    chain.sleep(1)
+    tx = strategy.harvest()
+    gas_profile.record(PROTOCOL, token.symbol(), "emergency exit", tx.gas_used)
+
+
+def test_migrate(
+    token, vault, strategy, deploy_strategy, gov, gas_profile, deposit_and_harvest
+):
+    deposit_and_harvest()
+    new_strategy = deploy_strategy(vault, "StrategyMorphoAave2" + token.symbol())
+    tx = vault.migrateStrategy(strategy, new_strategy, {"from": gov})
+    gas_profile.record(PROTOCOL, token.symbol(), "migrate", tx.gas_used)
@@ -25,3 +25,15 @@ def test_set_rewards_distributor(strategy, rando):
 
     strategy.setRewardsDistributor(ZERO_ADDRESS)
     assert strategy.rewardsDistributor() == ZERO_ADDRESS
+
+
+def test_claim_morpho_rewards(request, strategy, gov, morpho_token, mock_mode):
+    if not mock_mode:
+        pytest.skip("claiming MORPHO needs a merkle proof from Morpho API")
+    distributor = request.getfixturevalue("mock_rewards_distributor")
+    strategy.setRewardsDistributor(distributor, {"from": gov})
+
+    strategy.claimMorphoRewards(strategy, 100, [], {"from": gov})
+    assert morpho_token.balanceOf(strategy) == 100
+    with reverts():
+        strategy.claimMorphoRewards(strategy, 100, [], {"from": gov})
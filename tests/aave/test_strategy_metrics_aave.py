@@ -0,0 +1,10 @@
+# getStrategyMetrics is tested in tests/compound, only APR of the Aave lens differs
+def test_strategy_metrics_apr(chain, strategy, deposit_and_harvest):
+    deposit_and_harvest()
+    block = chain.height
+
+    metrics = strategy.getStrategyMetrics(block_identifier=block)
+    assert (
+        metrics["apr"]
+        == strategy.getSupplyBalancesForAmount(0, block_identifier=block)[2]
+    )
@@ -0,0 +1,141 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def max_report_delay(strategy, gov):
+    # harvest should be triggered by profit, not by time
+    strategy.setMaxReportDelay(365 * 24 * 3600, {"from": gov})
+
+
+def test_eth_to_want(strategy, token, interface):
+    oracle = interface.IPriceOracleGetter(strategy.priceOracle())
+    price = oracle.getAssetPrice(token)
+    assert price > 0
+    assert strategy.ethToWant(0) == 0
+    assert strategy.ethToWant(10**18) == 10**18 * 10 ** token.decimals() // price
+
+
+def test_no_rewards_in_want(strategy):
+    assert strategy.rewardsToWant(10**18) == 0
+
+
+def test_harvest_trigger_covers_call_cost(chain, vault, strategy, deposit_and_harvest):
+    deposit_and_harvest()
+    chain.sleep(24 * 3600)
+    chain.mine(1)
+    profit = strategy.estimatedTotalAssets() - vault.strategies(strategy)["totalDebt"]
+    assert profit > 0
+    assert strategy.harvestTrigger(0)
+    # 1M ETH call cost is never paid by the profit
+    assert not strategy.harvestTrigger(10**24)
+
+
+def test_harvest_trigger_on_debt_outstanding(vault, strategy, gov, deposit_and_harvest):
+    deposit_and_harvest()
+    vault.updateStrategyDebtRatio(strategy.address, 5_000, {"from": gov})
+    assert strategy.harvestTrigger(10**24)
+
+
+def test_tend_trigger_rematches_pool_supply(
+    request, chain, strategy, amount, gov, pool_token, mock_mode, deposit_and_harvest
+):
+    if not mock_mode:
+        pytest.skip("borrowers on pool are set only in MockMorpho")
+    mock_morpho = request.getfixturevalue("mock_morpho")
+    # no borrowers on pool, all supply goes to pool
+    mock_morpho.setPoolBorrow(pool_token, 0, {"from": gov})
+    deposit_and_harvest()
+    balance_on_pool, balance_in_p2p, _ = strategy.getStrategySupplyBalance()
+    assert balance_in_p2p == 0
+    assert strategy.getRematchAmount() == 0
+    assert not strategy.tendTrigger(0)
+
+    mock_morpho.setPoolBorrow(pool_token, balance_on_pool // 2, {"from": gov})
+    assert strategy.getRematchAmount() == balance_on_pool // 2
+    p2p_apr, pool_apr = strategy.getSupplyRates()
+    assert p2p_apr > pool_apr
+    assert strategy.tendTrigger(0)
+    # rate gain on half of the supply during rematchPeriod is below the min gain
+    strategy.setMinRematchGain(amount, {"from": gov})
+    assert not strategy.tendTrigger(0)
+    strategy.setMinRematchGain(0, {"from": gov})
+    strategy.setRematchPeriod(0, {"from": gov})
+    assert not strategy.tendTrigger(0)
+    strategy.setRematchPeriod(7 * 24 * 3600, {"from": gov})
+
+    # harvest doesn't rematch
+    chain.sleep(1)
+    strategy.harvest()
+    assert strategy.lastRematch() == 0
+    assert strategy.getRematchAmount() > 0
+
+    total_assets = strategy.estimatedTotalAssets()
+    rematch_amount = strategy.getRematchAmount()
+    tx = strategy.tend()
+    assert strategy.lastRematch() == tx.timestamp
+    balance_on_pool, balance_in_p2p, _ = strategy.getStrategySupplyBalance()
+    assert balance_in_p2p >= rematch_amount
+    assert strategy.getRematchAmount() == 0
+    assert not strategy.tendTrigger(0)
+    assert strategy.estimatedTotalAssets() >= total_assets
+
+    # supply left on pool is rematched again only after rematchPeriod
+    mock_morpho.setPoolBorrow(pool_token, balance_on_pool, {"from": gov})
+    assert strategy.getRematchAmount() > 0
+    assert not strategy.tendTrigger(0)
+    chain.sleep(7 * 24 * 3600)
+    chain.mine(1)
+    assert strategy.tendTrigger(0)
+
+
+def test_tend_supplies_in_chunks(
+    request,
+    token,
+    strategy,
+    amount,
+    gov,
+    pool_token,
+    mock_mode,
+    RELATIVE_APPROX,
+    deposit_and_harvest,
+):
+    chunk_size = amount // 4
+    strategy.setSupplyChunkSize(chunk_size, {"from": gov})
+    strategy.setRematchPeriod(0, {"from": gov})
+    if mock_mode:
+        # half of the second chunk and the rest are supplied to pool
+        request.getfixturevalue("mock_morpho").setPoolBorrow(
+            pool_token, chunk_size * 3 // 2, {"from": gov}
+        )
+    deposit_and_harvest()
+    assert token.balanceOf(strategy) == amount - chunk_size
+    assert strategy.tendTrigger(10**24)
+
+    amounts, p2p_ratios = strategy.getSupplyChunks()
+    assert list(amounts) == [chunk_size] * 3
+    assert all(ratio <= 10**18 for ratio in p2p_ratios)
+    if mock_mode:
+        assert list(p2p_ratios) == [10**18 // 2, 0, 0]
+
+    for supplied in range(2, 5):
+        strategy.tend()
+        assert token.balanceOf(strategy) == amount - supplied * chunk_size
+    assert not strategy.tendTrigger(0)
+    assert len(strategy.getSupplyChunks()[0]) == 0
+    assert pytest.approx(strategy.estimatedTotalAssets(), rel=RELATIVE_APPROX) == amount
+
+
+def test_tend_trigger_ignores_dust_and_chunks_are_bounded(
+    token, strategy, amount, gov, deposit_and_harvest
+):
+    strategy.setRematchPeriod(0, {"from": gov})
+    strategy.setSupplyChunkSize(amount // 1000, {"from": gov})
+    deposit_and_harvest()
+    assert strategy.tendTrigger(0)
+    # getSupplyChunks doesn't loop over all chunks of a tiny chunk size
+    assert len(strategy.getSupplyChunks()[0]) == 20
+
+    # idle want below one chunk is supplied by next harvest, not by a tend
+    strategy.setSupplyChunkSize(token.balanceOf(strategy) + 1, {"from": gov})
+    assert not strategy.tendTrigger(0)
+    assert list(strategy.getSupplyChunks()[0]) == [token.balanceOf(strategy)]
@@ -3,42 +3,45 @@ from brownie import config
 from brownie import Contract
 
 
-@pytest.fixture
-def gov(accounts):
-    yield accounts.at("0xFEB4acf3df3cDEA7399794D0869ef76A6EfAff52", force=True)
+@pytest.fixture(scope="session")
+def gov(accounts, mock_mode):
+    if mock_mode:
+        yield accounts[6]
+    else:
+        yield accounts.at("0xFEB4acf3df3cDEA7399794D0869ef76A6EfAff52", force=True)
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def user(accounts):
     yield accounts[0]
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def rewards(accounts):
     yield accounts[1]
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def guardian(accounts):
     yield accounts[2]
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def management(accounts):
     yield accounts[3]
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def strategist(accounts):
     yield accounts[4]
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def keeper(accounts):
     yield accounts[5]
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def rando(accounts):
     yield accounts[9]
 
@@ -64,8 +67,20 @@ token_addresses = {
     scope="session",
     autouse=True,
 )
-def token(request):
-    yield Contract(token_addresses[request.param])
+def token(request, mock_mode):
+    if mock_mode:
+        yield request.getfixturevalue("mock_tokens")[request.param]
+    else:
+        yield Contract(token_addresses[request.param])
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_generate_tests(metafunc):
+    # tests marked with all_tokens run for every token, not only the ones in token params
+    if metafunc.definition.get_closest_marker("all_tokens"):
+        metafunc.definition.add_marker(
+            pytest.mark.parametrize("token", list(token_addresses), indirect=True)
+        )
 
 
 whale_addresses = {
@@ -78,8 +93,13 @@ whale_addresses = {
 
 
 @pytest.fixture(scope="session", autouse=True)
-def token_whale(accounts, token):
-    yield accounts.at(whale_addresses[token.symbol()], force=True)
+def token_whale(request, accounts, token, mock_mode):
+    if mock_mode:
+        whale = request.getfixturevalue("mock_whale")
+        token.mint(whale, 10**9 * 10 ** token.decimals(), {"from": whale})
+        yield whale
+    else:
+        yield accounts.at(whale_addresses[token.symbol()], force=True)
 
 
 token_prices = {
@@ -91,17 +111,11 @@ token_prices = {
 }
 
 
-@pytest.fixture(autouse=True)
-def amount(token, token_whale, user):
+@pytest.fixture(scope="session", autouse=True)
+def amount(token, token_whale, user, fund):
     # this will get the number of tokens (around $1m worth of token)
     amillion = round(1_000_000 / token_prices[token.symbol()])
-    amount = amillion * 10 ** token.decimals()
-    # # In order to get some funds for the token you are about to use,
-    # # it impersonate a whale address
-    if amount > token.balanceOf(token_whale):
-        amount = token.balanceOf(token_whale)
-    token.transfer(user, amount, {"from": token_whale})
-    yield amount
+    yield fund(token, user, amillion * 10 ** token.decimals(), token_whale)
 
 
 compound_pool_token_addresses = {
@@ -114,42 +128,65 @@ compound_pool_token_addresses = {
 
 
 @pytest.fixture(scope="session", autouse=True)
-def pool_token(token):
-    yield compound_pool_token_addresses[token.symbol()]
+def pool_token(request, token, mock_mode):
+    if mock_mode:
+        yield request.getfixturevalue("mock_market")(token, "c")
+    else:
+        yield compound_pool_token_addresses[token.symbol()]
 
 
-@pytest.fixture
-def trade_factory():
-    yield Contract("0x7BAF843e06095f68F4990Ca50161C2C4E4e01ec6")
+@pytest.fixture(scope="session")
+def trade_factory(request, mock_mode):
+    if mock_mode:
+        yield request.getfixturevalue("mock_trade_factory")
+    else:
+        yield Contract("0x7BAF843e06095f68F4990Ca50161C2C4E4e01ec6")
 
 
-@pytest.fixture
-def ymechs_safe():
-    yield Contract("0x2C01B4AD51a67E2d8F02208F54dF9aC4c0B778B6")
+@pytest.fixture(scope="session")
+def ymechs_safe(mock_mode, gov):
+    if mock_mode:
+        yield gov
+    else:
+        yield Contract("0x2C01B4AD51a67E2d8F02208F54dF9aC4c0B778B6")
 
 
-@pytest.fixture
-def comp_token():
-    token_address = "0xc00e94Cb662C3520282E6f5717214004A7f26888"
-    yield Contract(token_address)
+@pytest.fixture(scope="session")
+def comp_token(request, mock_mode):
+    if mock_mode:
+        yield request.getfixturevalue("mock_tokens")["COMP"]
+    else:
+        token_address = "0xc00e94Cb662C3520282E6f5717214004A7f26888"
+        yield Contract(token_address)
 
 
 @pytest.fixture
-def comp_whale(accounts):
-    yield accounts.at(
-        "0x5608169973d639649196a84ee4085a708bcbf397", force=True
-    )  # Compound: Team 3
+def comp_whale(request, accounts, comp_token, mock_mode):
+    if mock_mode:
+        whale = request.getfixturevalue("mock_whale")
+        comp_token.mint(whale, 10**6 * 10**18, {"from": whale})
+        yield whale
+    else:
+        yield accounts.at(
+            "0x5608169973d639649196a84ee4085a708bcbf397", force=True
+        )  # Compound: Team 3
 
 
-@pytest.fixture
-def morpho_token(interface):
-    token_address = "0x9994E35Db50125E0DF82e4c2dde62496CE330999"
-    yield interface.IERC20(token_address)
+@pytest.fixture(scope="session")
+def morpho_token(request, interface, mock_mode):
+    if mock_mode:
+        yield request.getfixturevalue("mock_tokens")["MORPHO"]
+    else:
+        token_address = "0x9994E35Db50125E0DF82e4c2dde62496CE330999"
+        yield interface.IERC20(token_address)
 
 
-@pytest.fixture
-def weth():
-    yield Contract(token_addresses["WETH"])
+@pytest.fixture(scope="session")
+def weth(request, mock_mode):
+    if mock_mode:
+        yield request.getfixturevalue("mock_tokens")["WETH"]
+    else:
+        yield Contract(token_addresses["WETH"])
 
 
 @pytest.fixture
@@ -159,22 +196,27 @@ def weth_amount(user, weth):
     yield weth_amount
 
 
-@pytest.fixture
-def usdt():
-    yield Contract(token_addresses["USDT"])
+@pytest.fixture(scope="session")
+def usdt(request, mock_mode):
+    if mock_mode:
+        yield request.getfixturevalue("mock_tokens")["USDT"]
+    else:
+        yield Contract(token_addresses["USDT"])
 
 
 @pytest.fixture
-def usdt_amount(accounts, usdt, user):
+def usdt_amount(accounts, usdt, user, mock_mode, fund):
     amount = 10_000 * 10 ** usdt.decimals()
-    # In order to get some funds for the token you are about to use,
-    # it impersonate an exchange address to use it's funds.
-    reserve = accounts.at(whale_addresses["USDT"], force=True)
-    usdt.transfer(user, amount, {"from": reserve})
+    if mock_mode:
+        usdt.mint(user, amount, {"from": user})
+    else:
+        # reserve of an exchange is used when balance can't be written to storage
+        reserve = accounts.at(whale_addresses["USDT"], force=True)
+        amount = fund(usdt, user, amount, reserve)
     yield amount
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def vault(pm, gov, rewards, guardian, management, token):
     Vault = pm(config["dependencies"][0]).Vault
     vault = guardian.deploy(Vault)
@@ -185,24 +227,53 @@ def vault(pm, gov, rewards, guardian, management, token):
     yield vault
 
 
-@pytest.fixture
-def strategy(
+@pytest.fixture(scope="session")
+def deploy_strategy(
+    request,
     strategist,
-    keeper,
-    vault,
     pool_token,
+    morpho_token,
+    comp_token,
+    weth,
+    uni_address,
+    sushi_address,
+    mock_mode,
     MorphoCompoundStrategy,
+    MorphoCompoundStrategyConfigurable,
+):
+    def deploy(vault, name):
+        if mock_mode:
+            return strategist.deploy(
+                MorphoCompoundStrategyConfigurable,
+                vault,
+                pool_token,
+                name,
+                (
+                    request.getfixturevalue("mock_morpho"),
+                    request.getfixturevalue("mock_lens_compound"),
+                    morpho_token,
+                    comp_token,
+                    weth,
+                    uni_address,
+                    sushi_address,
+                ),
+            )
+        return strategist.deploy(MorphoCompoundStrategy, vault, pool_token, name)
+
+    yield deploy
+
+
+@pytest.fixture(scope="session")
+def strategy(
+    keeper,
+    vault,
+    deploy_strategy,
     gov,
     trade_factory,
     ymechs_safe,
     token,
 ):
-    strategy = strategist.deploy(
-        MorphoCompoundStrategy,
-        vault,
-        pool_token,
-        "StrategyMorphoCompound" + token.symbol(),
-    )
+    strategy = deploy_strategy(vault, "StrategyMorphoCompound" + token.symbol())
     strategy.setKeeper(keeper)
     vault.addStrategy(strategy, 10_000, 0, 2**256 - 1, 1_000, {"from": gov})
     trade_factory.grantRole(
@@ -214,14 +285,20 @@ def strategy(
     yield strategy
 
 
-@pytest.fixture
-def uni_address():
-    yield "0x7a250d5630B4cF539739dF2C5dAcb4c659F2488D"
+@pytest.fixture(scope="session")
+def uni_address(request, mock_mode):
+    if mock_mode:
+        yield request.getfixturevalue("mock_routers")["uni"].address
+    else:
+        yield "0x7a250d5630B4cF539739dF2C5dAcb4c659F2488D"
 
 
-@pytest.fixture
-def sushi_address():
-    yield "0xd9e1cE17f2641f24aE83637ab66a2cca9C378B9F"
+@pytest.fixture(scope="session")
+def sushi_address(request, mock_mode):
+    if mock_mode:
+        yield request.getfixturevalue("mock_routers")["sushi"].address
+    else:
+        yield "0xd9e1cE17f2641f24aE83637ab66a2cca9C378B9F"
 
 
 @pytest.fixture(scope="session")
@@ -229,8 +306,11 @@ def RELATIVE_APPROX():
     yield 1e-5
 
 
-# Function scoped isolation fixture to enable xdist.
-# Snapshots the chain before each test and reverts after test completion.
+# Vault and strategy are deployed and funded once per token in session scoped fixtures.
+# Snapshots the chain after the shared setup and reverts to it after each test,
+# unlike fn_isolation which also resets the chain for every test module.
 @pytest.fixture(scope="function", autouse=True)
-def shared_setup(fn_isolation):
-    pass
+def shared_setup(chain, vault, strategy, amount):
+    chain.snapshot()
+    yield
+    chain.revert()
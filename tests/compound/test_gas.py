@@ -0,0 +1,80 @@
+import pytest
+
+
+@pytest.fixture(scope="module")
+def gas_used():
+    # gas of strategy actions per token, printed after all tests in the module
+    gas_used = {}
+    yield gas_used
+    for (symbol, action), gas in sorted(gas_used.items()):
+        print(f"{symbol} {action}: {gas}")
+
+
+def lens_supply_balance_calls(tx, strategy, interface):
+    # calls from the strategy to lens.getCurrentSupplyBalanceInOf during the transaction
+    lens = interface.ILens(strategy.lens())
+    signature = lens.getCurrentSupplyBalanceInOf.signature
+    return [
+        subcall
+        for subcall in tx.subcalls
+        if subcall["from"] == strategy.address
+        and subcall["to"] == lens.address
+        and (
+            subcall.get("function", "").startswith("getCurrentSupplyBalanceInOf")
+            or subcall.get("calldata", "").startswith(signature)
+        )
+    ]
+
+
+def test_harvest_gas(chain, token, strategy, interface, gas_used, deposit_and_harvest):
+    _, tx = deposit_and_harvest()
+    gas_used[(token.symbol(), "first harvest")] = tx.gas_used
+    assert len(lens_supply_balance_calls(tx, strategy, interface)) == 1
+
+    # profit is withdrawn from Morpho with supply balance fetched in prepareReturn
+    chain.sleep(3600 * 24)
+    chain.mine(1)
+    tx = strategy.harvest()
+    gas_used[(token.symbol(), "harvest")] = tx.gas_used
+    assert tx.events["Harvested"]["profit"] > 0
+    assert len(lens_supply_balance_calls(tx, strategy, interface)) == 1
+
+
+def test_tend_gas(token, strategy, gov, interface, gas_used, deposit_and_harvest):
+    deposit_and_harvest()
+    tx = strategy.tend()
+    gas_used[(token.symbol(), "tend")] = tx.gas_used
+    # supply balance is fetched once to check if supply on pool can be rematched
+    assert len(lens_supply_balance_calls(tx, strategy, interface)) == 1
+
+    # no lens calls without rematching
+    strategy.setRematchPeriod(0, {"from": gov})
+    tx = strategy.tend()
+    gas_used[(token.symbol(), "tend without rematch")] = tx.gas_used
+    assert len(lens_supply_balance_calls(tx, strategy, interface)) == 0
+
+
+def test_withdraw_gas(
+    token, vault, strategy, user, amount, interface, gas_used, deposit_and_harvest
+):
+    deposit_and_harvest()
+    tx = vault.withdraw(amount // 2, {"from": user})
+    gas_used[(token.symbol(), "withdraw")] = tx.gas_used
+    assert len(lens_supply_balance_calls(tx, strategy, interface)) == 1
+
+
+def test_migration_gas(
+    token,
+    vault,
+    strategy,
+    deploy_strategy,
+    gov,
+    interface,
+    gas_used,
+    deposit_and_harvest,
+):
+    deposit_and_harvest()
+    new_strategy = deploy_strategy(vault, "StrategyMorphoCompound2" + token.symbol())
+    tx = vault.migrateStrategy(strategy, new_strategy, {"from": gov})
+    gas_used[(token.symbol(), "migration")] = tx.gas_used
+    assert len(lens_supply_balance_calls(tx, strategy, interface)) == 1
@@ -0,0 +1,101 @@
+from scripts.liquidity.abi_cache import strategy_contract
+from scripts.liquidity.apr_curve import AprCurveCache, amount_grid
+from scripts.liquidity.async_collector import collect_rows
+from scripts.liquidity.backfill import backfill, backfill_blocks
+from scripts.liquidity.multicall import fetch_liquidity_rows
+from scripts.liquidity.rows import build_row
+from scripts.write_liquidity import fetchLiquidityForStrategy
+
+
+def test_batched_rows_match_view_calls(
+    chain, accounts, token, vault, strategy, user, amount, Multicall2
+):
+    # Deposit to the vault and harvest so the strategy has balance in Morpho
+    token.approve(vault.address, amount, {"from": user})
+    vault.deposit(amount, {"from": user})
+    chain.sleep(1)
+    strategy.harvest()
+
+    multicall = accounts[0].deploy(Multicall2)
+    block = chain.height
+
+    block_number, rows = fetch_liquidity_rows(
+        multicall, [strategy, strategy], block_identifier=block
+    )
+    assert block_number == block
+
+    expected = build_row(
+        chain[block].timestamp,
+        strategy.getStrategySupplyBalance(block_identifier=block),
+        strategy.getCurrentMarketLiquidity(block_identifier=block),
+        strategy.getMaxP2PSupply(block_identifier=block),
+    )
+    assert rows == [expected, expected]
+    assert expected[1] > 0
+
+
+def test_strategy_contract_from_abi_cache(strategy):
+    cached = strategy_contract(strategy.address)
+    assert cached.address == strategy.address
+    assert cached.getMaxP2PSupply() == strategy.getMaxP2PSupply()
+    assert cached.getStrategySupplyBalance() == strategy.getStrategySupplyBalance()
+
+
+def test_concurrent_collection(chain, strategy, rando):
+    # rando is not a strategy, its calls fail without blocking the strategy
+    results = collect_rows(
+        [rando.address, strategy.address],
+        fetchLiquidityForStrategy,
+        concurrency=2,
+        retries=1,
+        backoff=0,
+    )
+    assert [result.key for result in results] == [rando.address, strategy.address]
+    assert results[0].row is None and results[0].error is not None
+    assert results[1].error is None
+    assert results[1].row[8] == strategy.getMaxP2PSupply()
+
+
+def test_backfill_historical_blocks(
+    chain, accounts, token, vault, strategy, user, amount, Multicall2, tmp_path
+):
+    multicall = accounts[0].deploy(Multicall2)
+    from_block = chain.height
+    token.approve(vault.address, amount, {"from": user})
+    vault.deposit(amount, {"from": user})
+    chain.sleep(1)
+    strategy.harvest()
+    chain.mine(5)
+    to_block = chain.height
+
+    blocks = backfill_blocks(from_block, to_block, 2)
+    assert backfill(multicall, [strategy], blocks, tmp_path, chunk_size=2) == blocks[-1]
+
+    lines = (tmp_path / f"strategy_{strategy.address}.csv").read_text().splitlines()
+    assert len(lines) == len(blocks) + 1
+    for block, line in zip(blocks, lines[1:]):
+        values = [int(value) for value in line.split(",")]
+        assert values[0] == block
+        assert values[1] == chain[block].timestamp
+        assert values[2] == strategy.getStrategySupplyBalance(block_identifier=block)[2]
+    # strategy had no funds before the harvest
+    assert int(lines[1].split(",")[2]) == 0
+
+
+def test_apr_curve_matches_view_calls(
+    chain, accounts, token, strategy, Multicall2, tmp_path
+):
+    multicall = accounts[0].deploy(Multicall2)
+    block = chain.height
+    amounts = amount_grid(10 ** token.decimals(), 10 ** (token.decimals() + 9), 20)
+
+    curve = AprCurveCache(tmp_path).get(
+        multicall, strategy, block, amounts, batch_size=8
+    )
+    assert curve.block == block
+    for i in (0, 10, len(amounts) - 1):
+        expected = strategy.getSupplyBalancesForAmount(
+            amounts[i], block_identifier=block
+        )
+        assert curve(amounts[i]) == tuple(float(value) for value in expected)
+    assert (tmp_path / f"{strategy.address}-{block}.npz").is_file()
@@ -11,12 +11,10 @@ def test_migration(
     vault,
     strategy,
     amount,
-    MorphoCompoundStrategy,
-    strategist,
+    deploy_strategy,
     gov,
     user,
     RELATIVE_APPROX,
-    pool_token,
 ):
     # Deposit to the vault and harvest
     token.approve(vault.address, amount, {"from": user})
@@ -26,12 +24,7 @@ def test_migration(
     assert pytest.approx(strategy.estimatedTotalAssets(), rel=RELATIVE_APPROX) == amount
 
     # migrate to a new strategy
-    new_strategy = strategist.deploy(
-        MorphoCompoundStrategy,
-        vault,
-        pool_token,
-        "StrategyMorphoCompound2" + token.symbol(),
-    )
+    new_strategy = deploy_strategy(vault, "StrategyMorphoCompound2" + token.symbol())
     vault.migrateStrategy(strategy, new_strategy, {"from": gov})
     assert (
         pytest.approx(new_strategy.estimatedTotalAssets(), rel=RELATIVE_APPROX)
@@ -0,0 +1,68 @@
+import time
+
+from scripts.liquidity.rows import build_row, build_row_from_metrics
+
+# base cost of a transaction, removed from estimates to compare only execution gas
+TX_BASE_GAS = 21000
+
+
+# getStrategyMetrics is implemented in MorphoStrategy, only APR differs per protocol
+def test_strategy_metrics(chain, token, strategy, deposit_and_harvest):
+    deposit_and_harvest()
+    block = chain.height
+
+    metrics = strategy.getStrategyMetrics(block_identifier=block)
+    assert metrics["wantBalance"] == token.balanceOf(strategy, block_identifier=block)
+    assert (
+        metrics["balanceOnPool"],
+        metrics["balanceInP2P"],
+        metrics["totalSupplyBalance"],
+    ) == strategy.getStrategySupplyBalance(block_identifier=block)
+    assert metrics["estimatedTotalAssets"] == strategy.estimatedTotalAssets(
+        block_identifier=block
+    )
+    assert metrics["maxP2PSupply"] == strategy.getMaxP2PSupply(block_identifier=block)
+    assert metrics["unclaimedRewards"] == strategy.getUnclaimedRewards(
+        block_identifier=block
+    )
+    assert (
+        metrics["apr"]
+        == strategy.getSupplyBalancesForAmount(0, block_identifier=block)[2]
+    )
+    assert build_row_from_metrics(0, metrics) == build_row(
+        0,
+        strategy.getStrategySupplyBalance(block_identifier=block),
+        strategy.getCurrentMarketLiquidity(block_identifier=block),
+        metrics["maxP2PSupply"],
+    )
+    assert metrics["estimatedTotalAssets"] > 0
+
+
+def test_strategy_metrics_gas(strategy, deposit_and_harvest):
+    deposit_and_harvest()
+    views = [
+        (strategy.getStrategySupplyBalance, ()),
+        (strategy.getCurrentMarketLiquidity, ()),
+        (strategy.getMaxP2PSupply, ()),
+        (strategy.estimatedTotalAssets, ()),
+        (strategy.getUnclaimedRewards, ()),
+        (strategy.getSupplyBalancesForAmount, (0,)),
+    ]
+
+    separate_gas = sum(view.estimate_gas(*args) - TX_BASE_GAS for view, args in views)
+    metrics_gas = strategy.getStrategyMetrics.estimate_gas() - TX_BASE_GAS
+
+    start = time.perf_counter()
+    for view, args in views:
+        view(*args)
+    separate_latency = time.perf_counter() - start
+    start = time.perf_counter()
+    strategy.getStrategyMetrics()
+    metrics_latency = time.perf_counter() - start
+
+    print(
+        f"separate views: {separate_gas} gas {separate_latency * 1000:.1f} ms, "
+        f"getStrategyMetrics: {metrics_gas} gas {metrics_latency * 1000:.1f} ms"
+    )
+    # one lens call for supply balance instead of two
+    assert metrics_gas < separate_gas
@@ -0,0 +1,180 @@
+import pytest
+from brownie import ZERO_ADDRESS
+
+
+@pytest.fixture(autouse=True)
+def max_report_delay(strategy, gov):
+    # harvest should be triggered by profit, not by time
+    strategy.setMaxReportDelay(365 * 24 * 3600, {"from": gov})
+
+
+def test_eth_to_want(strategy, token, weth, interface):
+    assert strategy.ethToWant(0) == 0
+    if token.address == weth.address:
+        assert strategy.ethToWant(10**18) == 10**18
+    else:
+        router = interface.IUniswapV2Router01(strategy.currentV2Router())
+        assert (
+            strategy.ethToWant(10**18)
+            == router.getAmountsOut(10**18, [weth, token])[-1]
+        )
+        assert strategy.ethToWant(10**18) > 0
+
+
+def test_rewards_to_want(strategy, token, weth, comp_token, interface):
+    amount = 10 * 10**18
+    assert strategy.rewardsToWant(0) == 0
+    path = [comp_token, weth, token]
+    if token.address == weth.address:
+        path = [comp_token, token]
+    router = interface.IUniswapV2Router01(strategy.currentV2Router())
+    # COMP is valued the same when it's sold by ySwap
+    assert strategy.rewardsToWant(amount) == router.getAmountsOut(amount, path)[-1]
+
+
+def test_rewards_to_sell(strategy, comp_token, comp_whale, gov):
+    # COMP held by the strategy is sold by ySwap regardless of minCompToClaimOrSell
+    min_comp = strategy.minCompToClaimOrSell()
+    comp_token.transfer(strategy, min_comp // 2, {"from": comp_whale})
+    assert strategy.getRewardsToSell() >= min_comp // 2
+    strategy.removeTradeFactoryPermissions({"from": gov})
+    assert strategy.getRewardsToSell() == 0
+    comp_token.transfer(strategy, min_comp, {"from": comp_whale})
+    assert strategy.getRewardsToSell() >= min_comp * 3 // 2
+
+
+def test_harvest_trigger_covers_call_cost(chain, vault, strategy, deposit_and_harvest):
+    deposit_and_harvest()
+    chain.sleep(24 * 3600)
+    chain.mine(1)
+    profit = strategy.estimatedTotalAssets() - vault.strategies(strategy)["totalDebt"]
+    assert profit > 0
+    assert strategy.harvestTrigger(0)
+    # 1M ETH call cost is never paid by the profit
+    assert not strategy.harvestTrigger(10**24)
+
+
+def test_harvest_trigger_counts_comp_sold_by_yswap(
+    strategy, comp_token, comp_whale, deposit_and_harvest
+):
+    deposit_and_harvest()
+    assert strategy.tradeFactory() != ZERO_ADDRESS
+    # 0.1 ETH call cost with profit factor 100 is not paid by interest of one block
+    call_cost = 10**17
+    assert not strategy.harvestTrigger(call_cost)
+
+    comp_token.transfer(strategy, 1_000 * 10**18, {"from": comp_whale})
+    rewards = strategy.rewardsToWant(strategy.getRewardsToSell())
+    assert rewards > strategy.profitFactor() * strategy.ethToWant(call_cost)
+    assert strategy.harvestTrigger(call_cost)
+
+
+def test_harvest_trigger_on_debt_outstanding(vault, strategy, gov, deposit_and_harvest):
+    deposit_and_harvest()
+    vault.updateStrategyDebtRatio(strategy.address, 5_000, {"from": gov})
+    assert strategy.harvestTrigger(10**24)
+
+
+def test_tend_trigger_rematches_pool_supply(
+    request, chain, strategy, amount, gov, pool_token, mock_mode, deposit_and_harvest
+):
+    if not mock_mode:
+        pytest.skip("borrowers on pool are set only in MockMorpho")
+    mock_morpho = request.getfixturevalue("mock_morpho")
+    # no borrowers on pool, all supply goes to pool
+    mock_morpho.setPoolBorrow(pool_token, 0, {"from": gov})
+    deposit_and_harvest()
+    balance_on_pool, balance_in_p2p, _ = strategy.getStrategySupplyBalance()
+    assert balance_in_p2p == 0
+    assert strategy.getRematchAmount() == 0
+    assert not strategy.tendTrigger(0)
+
+    mock_morpho.setPoolBorrow(pool_token, balance_on_pool // 2, {"from": gov})
+    assert strategy.getRematchAmount() == balance_on_pool // 2
+    p2p_apr, pool_apr = strategy.getSupplyRates()
+    assert p2p_apr > pool_apr
+    assert strategy.tendTrigger(0)
+    # rate gain on half of the supply during rematchPeriod is below the min gain
+    strategy.setMinRematchGain(amount, {"from": gov})
+    assert not strategy.tendTrigger(0)
+    strategy.setMinRematchGain(0, {"from": gov})
+    strategy.setRematchPeriod(0, {"from": gov})
+    assert not strategy.tendTrigger(0)
+    strategy.setRematchPeriod(7 * 24 * 3600, {"from": gov})
+
+    # harvest doesn't rematch
+    chain.sleep(1)
+    strategy.harvest()
+    assert strategy.lastRematch() == 0
+    assert strategy.getRematchAmount() > 0
+
+    total_assets = strategy.estimatedTotalAssets()
+    rematch_amount = strategy.getRematchAmount()
+    tx = strategy.tend()
+    assert strategy.lastRematch() == tx.timestamp
+    balance_on_pool, balance_in_p2p, _ = strategy.getStrategySupplyBalance()
+    assert balance_in_p2p >= rematch_amount
+    assert strategy.getRematchAmount() == 0
+    assert not strategy.tendTrigger(0)
+    assert strategy.estimatedTotalAssets() >= total_assets
+
+    # supply left on pool is rematched again only after rematchPeriod
+    mock_morpho.setPoolBorrow(pool_token, balance_on_pool, {"from": gov})
+    assert strategy.getRematchAmount() > 0
+    assert not strategy.tendTrigger(0)
+    chain.sleep(7 * 24 * 3600)
+    chain.mine(1)
+    assert strategy.tendTrigger(0)
+
+
+def test_tend_supplies_in_chunks(
+    request,
+    token,
+    strategy,
+    amount,
+    gov,
+    pool_token,
+    mock_mode,
+    RELATIVE_APPROX,
+    deposit_and_harvest,
+):
+    chunk_size = amount // 4
+    strategy.setSupplyChunkSize(chunk_size, {"from": gov})
+    strategy.setRematchPeriod(0, {"from": gov})
+    if mock_mode:
+        # half of the second chunk and the rest are supplied to pool
+        request.getfixturevalue("mock_morpho").setPoolBorrow(
+            pool_token, chunk_size * 3 // 2, {"from": gov}
+        )
+    deposit_and_harvest()
+    assert token.balanceOf(strategy) == amount - chunk_size
+    assert strategy.tendTrigger(10**24)
+
+    amounts, p2p_ratios = strategy.getSupplyChunks()
+    assert list(amounts) == [chunk_size] * 3
+    assert all(ratio <= 10**18 for ratio in p2p_ratios)
+    if mock_mode:
+        assert list(p2p_ratios) == [10**18 // 2, 0, 0]
+
+    for supplied in range(2, 5):
+        strategy.tend()
+        assert token.balanceOf(strategy) == amount - supplied * chunk_size
+    assert not strategy.tendTrigger(0)
+    assert len(strategy.getSupplyChunks()[0]) == 0
+    assert pytest.approx(strategy.estimatedTotalAssets(), rel=RELATIVE_APPROX) == amount
+
+
+def test_tend_trigger_ignores_dust_and_chunks_are_bounded(
+    token, strategy, amount, gov, deposit_and_harvest
+):
+    strategy.setRematchPeriod(0, {"from": gov})
+    strategy.setSupplyChunkSize(amount // 1000, {"from": gov})
+    deposit_and_harvest()
+    assert strategy.tendTrigger(0)
+    # getSupplyChunks doesn't loop over all chunks of a tiny chunk size
+    assert len(strategy.getSupplyChunks()[0]) == 20
+
+    # idle want below one chunk is supplied by next harvest, not by a tend
+    strategy.setSupplyChunkSize(token.balanceOf(strategy) + 1, {"from": gov})
+    assert not strategy.tendTrigger(0)
+    assert list(strategy.getSupplyChunks()[0]) == [token.balanceOf(strategy)]
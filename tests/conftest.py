@@ -0,0 +1,291 @@
+import os
+
+import pytest
+from brownie import network
+from brownie._config import CONFIG
+
+from scripts.gas.profile import (
+    DEFAULT_TOLERANCE,
+    GasProfile,
+    baseline_path,
+    report_path,
+    worker_report_path,
+    worker_report_paths,
+)
+from scripts.fork.manifest import MANIFEST_PATH, load_manifest, pin_fork_url
+from scripts.fork.storage import (
+    BALANCE_SLOTS_PATH,
+    BalanceSlot,
+    BalanceSlotCache,
+    StorageWriteUnsupported,
+    TokenFunder,
+)
+from scripts.parallel.scheduling import TokenScheduling
+
+
+# tokens deployed on a blank development chain, symbol to decimals
+MOCK_TOKENS = {
+    "WBTC": 8,
+    "WETH": 18,
+    "USDT": 6,
+    "DAI": 18,
+    "USDC": 6,
+    "COMP": 18,
+    "MORPHO": 18,
+}
+# USD prices used by mock swap routers
+MOCK_TOKEN_PRICES = {
+    "WBTC": 35_000,
+    "WETH": 2_000,
+    "USDT": 1,
+    "DAI": 1,
+    "USDC": 1,
+    "COMP": 50,
+    "MORPHO": 1,
+}
+# yearly rates of mock markets, 1e18 = 100%
+MOCK_P2P_SUPPLY_RATE = 3 * 10**16
+MOCK_POOL_SUPPLY_RATE = 2 * 10**16
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers", "all_tokens: run test for every token in token_addresses"
+    )
+    _pin_fork(load_manifest(MANIFEST_PATH)["block"])
+
+
+def _pin_fork(block):
+    # mainnet fork starts at the block of fork manifest, balance slots and gas baseline are recorded there
+    network_config = CONFIG.networks.get("mainnet-fork")
+    if not network_config or "fork" not in network_config.get("cmd_settings", {}):
+        return
+    cmd_settings = network_config["cmd_settings"]
+    fork = cmd_settings["fork"]
+    if fork in CONFIG.networks:
+        # network id is replaced with its host like brownie does, which skips urls
+        fork_network = CONFIG.networks[fork]
+        fork = fork_network["host"]
+        network_config.setdefault("chainid", fork_network["chainid"])
+        cmd_settings.setdefault("chain_id", int(fork_network["chainid"]))
+        if "explorer" in fork_network:
+            network_config.setdefault("explorer", fork_network["explorer"])
+    try:
+        cmd_settings["fork"] = pin_fork_url(fork, block)
+    except ValueError as exc:
+        raise pytest.UsageError(f"FORK_URL: {exc}")
+
+
+@pytest.hookimpl(tryfirst=True, optionalhook=True)
+def pytest_xdist_make_scheduler(config, log):
+    # brownie -n runs every test module on one worker, tests are grouped by protocol and token instead
+    return TokenScheduling(config, log)
+
+
+def pytest_sessionstart(session):
+    if _is_xdist_master(session.config):
+        for path in worker_report_paths(report_path(_network_name())):
+            path.unlink()
+
+
+def pytest_sessionfinish(session):
+    # xdist workers save gas reports of their own tests, master merges them into one report
+    network_name = _network_name()
+    paths = worker_report_paths(report_path(network_name))
+    if not _is_xdist_master(session.config) or not paths:
+        return
+    baseline = GasProfile.load_baseline(baseline_path(network_name))
+    profile = GasProfile.merge(paths, baseline, **_gas_profile_options())
+    _save_gas_profile(profile, network_name)
+    for path in paths:
+        path.unlink()
+
+
+def _network_name():
+    # active network is not connected on xdist master, it is read from --network or the default network
+    return CONFIG.argv["network"] or CONFIG.settings["networks"]["default"]
+
+
+def _is_xdist_master(config):
+    return bool(getattr(config.option, "numprocesses", None)) and not hasattr(
+        config, "workerinput"
+    )
+
+
+def _gas_profile_options():
+    # baseline is recorded only with GAS_UPDATE_BASELINE, with GAS_STRICT scenarios without baseline fail
+    return {
+        "tolerance": float(os.environ.get("GAS_TOLERANCE", DEFAULT_TOLERANCE)),
+        "update": os.environ.get("GAS_UPDATE_BASELINE", "").lower() in ("1", "true"),
+        "strict": os.environ.get("GAS_STRICT", "").lower() in ("1", "true"),
+    }
+
+
+def _save_gas_profile(profile, network_name):
+    profile.save_report(report_path(network_name))
+    if profile.update:
+        profile.save_baseline(baseline_path(network_name))
+
+
+@pytest.fixture(scope="session")
+def gas_profile(request):
+    network_name = _network_name()
+    baseline = GasProfile.load_baseline(baseline_path(network_name))
+    profile = GasProfile(baseline, **_gas_profile_options())
+    yield profile
+    if not profile.results:
+        return
+    workerinput = getattr(request.config, "workerinput", None)
+    if workerinput:
+        profile.save_report(
+            worker_report_path(workerinput["workerid"], report_path(network_name))
+        )
+    else:
+        _save_gas_profile(profile, network_name)
+
+
+@pytest.fixture
+def deposit_and_harvest(chain, token, vault, strategy, user, amount):
+    # deposits amount of user to the vault and invests it with the first harvest
+    def deposit_and_harvest():
+        token.approve(vault.address, amount, {"from": user})
+        deposit_tx = vault.deposit(amount, {"from": user})
+        chain.sleep(1)
+        return deposit_tx, strategy.harvest()
+
+    return deposit_and_harvest
+
+
+@pytest.fixture(scope="session")
+def fork_block(chain, mock_mode):
+    # fails fast when the fork doesn't start at the block of fork manifest
+    if mock_mode:
+        yield None
+        return
+    block = load_manifest(MANIFEST_PATH)["block"]
+    if chain.height != block:
+        pytest.exit(f"fork height is {chain.height}, fork manifest block is {block}", 1)
+    yield block
+
+
+@pytest.fixture(scope="session")
+def fund(web3, mock_mode, fork_block):
+    # balances are written to token storage, slots of manifest tokens are known and others are found once
+    known = {
+        config["address"]: BalanceSlot(config["balance_slot"], False)
+        for config in load_manifest(MANIFEST_PATH)["tokens"].values()
+    }
+    funder = TokenFunder(web3, BalanceSlotCache(BALANCE_SLOTS_PATH, known))
+
+    def fund(token, account, amount, whale):
+        if not mock_mode and funder.supported:
+            try:
+                return funder.add_balance(token, account, amount)
+            except StorageWriteUnsupported:
+                pass
+        # In order to get some funds for the token you are about to use,
+        # it impersonate a whale address
+        amount = min(amount, token.balanceOf(whale))
+        token.transfer(account, amount, {"from": whale})
+        return amount
+
+    yield fund
+
+
+@pytest.fixture(scope="session")
+def mock_mode():
+    # tests on a blank development chain use contracts/mocks instead of mainnet fork:
+    # brownie test --network development
+    return network.show_active() == "development"
+
+
+@pytest.fixture(scope="session")
+def mock_deployer(accounts):
+    yield accounts[8]
+
+
+@pytest.fixture(scope="session")
+def mock_whale(accounts):
+    yield accounts[7]
+
+
+@pytest.fixture(scope="session")
+def mock_tokens(mock_deployer, MockERC20):
+    yield {
+        symbol: mock_deployer.deploy(MockERC20, f"Mock {symbol}", symbol, decimals)
+        for symbol, decimals in MOCK_TOKENS.items()
+    }
+
+
+@pytest.fixture(scope="session")
+def mock_morpho(mock_deployer, mock_tokens, MockMorpho):
+    yield mock_deployer.deploy(MockMorpho, mock_tokens["COMP"])
+
+
+@pytest.fixture(scope="session")
+def mock_lens_aave(mock_deployer, mock_morpho, MockLensAave):
+    yield mock_deployer.deploy(MockLensAave, mock_morpho)
+
+
+@pytest.fixture(scope="session")
+def mock_lens_compound(mock_deployer, mock_morpho, MockLensCompound):
+    yield mock_deployer.deploy(MockLensCompound, mock_morpho)
+
+
+@pytest.fixture(scope="session")
+def mock_routers(mock_deployer, mock_tokens, MockUniswapV2Router):
+    # uniswap and sushiswap routers swapping all mock tokens at MOCK_TOKEN_PRICES
+    routers = {}
+    for name in ("uni", "sushi"):
+        router = mock_deployer.deploy(MockUniswapV2Router)
+        for symbol_in, token_in in mock_tokens.items():
+            for symbol_out, token_out in mock_tokens.items():
+                price = (
+                    10**18
+                    * MOCK_TOKEN_PRICES[symbol_in]
+                    * 10 ** MOCK_TOKENS[symbol_out]
+                    // (MOCK_TOKEN_PRICES[symbol_out] * 10 ** MOCK_TOKENS[symbol_in])
+                )
+                router.setPrice(token_in, token_out, price, {"from": mock_deployer})
+        routers[name] = router
+    yield routers
+
+
+@pytest.fixture(scope="session")
+def mock_trade_factory(mock_deployer, mock_routers, MockTradeFactory):
+    yield mock_deployer.deploy(MockTradeFactory, mock_routers["sushi"])
+
+
+@pytest.fixture(scope="session")
+def mock_price_oracle(mock_deployer, mock_tokens, MockPriceOracle):
+    # Aave price oracle with MOCK_TOKEN_PRICES in ETH
+    oracle = mock_deployer.deploy(MockPriceOracle)
+    for symbol, token in mock_tokens.items():
+        price = 10**18 * MOCK_TOKEN_PRICES[symbol] // MOCK_TOKEN_PRICES["WETH"]
+        oracle.setAssetPrice(token, price, {"from": mock_deployer})
+    yield oracle
+
+
+@pytest.fixture(scope="session")
+def mock_rewards_distributor(mock_deployer, mock_tokens, MockRewardsDistributor):
+    yield mock_deployer.deploy(MockRewardsDistributor, mock_tokens["MORPHO"])
+
+
+@pytest.fixture(scope="session")
+def mock_market(mock_deployer, mock_morpho, MockERC20):
+    # creates Morpho market for want token and returns its pool token address
+    def create_market(token, prefix):
+        symbol = prefix + token.symbol()
+        decimals = token.decimals()
+        pool_token = mock_deployer.deploy(MockERC20, symbol, symbol, decimals)
+        mock_morpho.createMarket(
+            pool_token,
+            token,
+            100_000 * 10**decimals,
+            MOCK_P2P_SUPPLY_RATE,
+            MOCK_POOL_SUPPLY_RATE,
+            {"from": mock_deployer},
+        )
+        return pool_token.address
+
+    yield create_market
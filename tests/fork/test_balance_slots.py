@@ -0,0 +1,112 @@
+import pytest
+
+from scripts.fork.storage import (
+    BalanceSlot,
+    BalanceSlotCache,
+    StorageWriteUnsupported,
+    TokenFunder,
+    find_balance_slot,
+    mapping_slot,
+)
+
+HOLDER = "0x0000000000000000000000000000000000000001"
+DAI = "0x6B175474E89094C44Da98b954EedeAC495271d0F"
+
+
+class FakeEth:
+    def __init__(self, storage):
+        self.storage = storage
+
+    def get_storage_at(self, address, slot):
+        return self.storage.get("0x%064x" % slot, 0).to_bytes(32, "big")
+
+
+class FakeWeb3:
+    """Node with one token, storage writes are supported only with `method`."""
+
+    def __init__(self, method="evm_setAccountStorageAt"):
+        self.storage = {}
+        self.method = method
+        self.requests = []
+        self.eth = FakeEth(self.storage)
+        self.provider = self
+
+    def make_request(self, method, params):
+        self.requests.append((method, params))
+        if method != self.method:
+            return {"error": {"code": -32601, "message": f"Method {method} not found"}}
+        address, slot, value = params
+        assert address == DAI
+        self.storage["0x%064x" % int(slot, 16)] = int(value, 16)
+        return {"result": True}
+
+
+class FakeToken:
+    address = DAI
+
+    def __init__(self, web3, balance_slot, vyper=False):
+        self.storage = web3.storage
+        self.balance_slot = balance_slot
+        self.vyper = vyper
+
+    def __str__(self):
+        return self.address
+
+    def balanceOf(self, holder):
+        return self.storage.get(mapping_slot(holder, self.balance_slot, self.vyper), 0)
+
+
+def test_mapping_slot():
+    # keccak256(abi.encode(holder, 0))
+    assert mapping_slot(HOLDER, 0) == (
+        "0xada5013122d395ba3c54772283fb069b10426056ef8ca54750cb9bb552a59e7d"
+    )
+    assert mapping_slot(HOLDER, 0, vyper=True) != mapping_slot(HOLDER, 0)
+
+
+@pytest.mark.parametrize(
+    "method", ["evm_setAccountStorageAt", "hardhat_setStorageAt", "anvil_setStorageAt"]
+)
+def test_find_and_cache_balance_slot(tmp_path, method):
+    web3 = FakeWeb3(method)
+    token = FakeToken(web3, 9)
+    funder = TokenFunder(web3, BalanceSlotCache(tmp_path))
+    assert funder.add_balance(token, HOLDER, 10**24) == 10**24
+    assert funder.add_balance(token, HOLDER, 1) == 1
+    assert token.balanceOf(HOLDER) == 10**24 + 1
+    assert funder.writer.method == method
+    # probed slots are restored
+    assert set(web3.storage.values()) == {0, 10**24 + 1}
+
+    # next session reads the slot from disk and writes storage once
+    web3.requests.clear()
+    funder = TokenFunder(web3, BalanceSlotCache(tmp_path))
+    funder.add_balance(token, HOLDER, 1)
+    assert len([request for request in web3.requests if request[0] == method]) == 1
+    assert BalanceSlotCache(tmp_path).get(DAI.lower()) == BalanceSlot(9, False)
+
+
+def test_vyper_and_known_slots(tmp_path):
+    web3 = FakeWeb3()
+    token = FakeToken(web3, 3, vyper=True)
+    assert find_balance_slot(TokenFunder(web3).writer, token) == BalanceSlot(3, True)
+
+    web3.requests.clear()
+    cache = BalanceSlotCache(tmp_path, {DAI: BalanceSlot(3, True)})
+    TokenFunder(web3, cache).set_balance(token, HOLDER, 5)
+    assert token.balanceOf(HOLDER) == 5
+    assert len(web3.requests) == 1
+    assert not any(tmp_path.iterdir())
+
+
+def test_wrong_slot_and_unsupported_node(tmp_path):
+    web3 = FakeWeb3()
+    token = FakeToken(web3, 2)
+    cache = BalanceSlotCache(tmp_path, {DAI: BalanceSlot(1, False)})
+    with pytest.raises(ValueError, match="balance slot 1"):
+        TokenFunder(web3, cache).set_balance(token, HOLDER, 5)
+
+    funder = TokenFunder(FakeWeb3(method=None), BalanceSlotCache(tmp_path))
+    with pytest.raises(StorageWriteUnsupported):
+        funder.add_balance(token, HOLDER, 5)
+    assert not funder.supported
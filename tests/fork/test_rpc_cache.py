@@ -0,0 +1,137 @@
+import json
+import threading
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from scripts.fork.rpc_cache import (
+    CachingRpcProxy,
+    RpcCache,
+    cache_key,
+    make_server,
+    pin_block,
+)
+
+BLOCK = 15_000_000
+MORPHO = "0x8888882f8f843896699869179fB6E4f7e3B58888"
+
+
+class FakeNode:
+    """Upstream node answering every request with its method and params."""
+
+    def __init__(self):
+        self.requests = []
+        node = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                request = json.loads(
+                    self.rfile.read(int(self.headers["Content-Length"]))
+                )
+                node.requests.append(request)
+                if request["method"] == "eth_getTransactionReceipt":
+                    response = {"id": request["id"], "result": None}
+                elif request["method"] == "eth_sendRawTransaction":
+                    response = {
+                        "id": request["id"],
+                        "error": {"code": 3, "message": "no"},
+                    }
+                else:
+                    response = {
+                        "id": request["id"],
+                        "result": [request["method"]] + request["params"],
+                    }
+                body = json.dumps(response).encode()
+                self.send_response(200)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+
+@pytest.fixture
+def node():
+    node = FakeNode()
+    thread = threading.Thread(target=node.server.serve_forever, daemon=True)
+    thread.start()
+    yield node
+    node.server.shutdown()
+    node.server.server_close()
+
+
+def request(method, *params, id=1):
+    return {"jsonrpc": "2.0", "id": id, "method": method, "params": list(params)}
+
+
+def test_pin_block():
+    assert pin_block("eth_getStorageAt", [MORPHO, "0x0", "latest"], BLOCK) == [
+        MORPHO,
+        "0x0",
+        hex(BLOCK),
+    ]
+    assert pin_block("eth_getCode", [MORPHO], BLOCK) == [MORPHO, hex(BLOCK)]
+    assert pin_block("eth_getBalance", [MORPHO, "0x10"], BLOCK) == [MORPHO, "0x10"]
+    assert pin_block("eth_chainId", [], BLOCK) == []
+    assert cache_key("eth_getCode", [MORPHO, "0x1"]) == cache_key(
+        "eth_getCode", [MORPHO.lower(), "0x1"]
+    )
+
+
+def test_record_and_replay_offline(tmp_path, node):
+    proxy = CachingRpcProxy(RpcCache(BLOCK, tmp_path), node.url)
+    responses = proxy.handle(
+        [
+            request("eth_getStorageAt", MORPHO, "0x0", "latest", id=1),
+            request("eth_getCode", MORPHO, "latest", id=2),
+            request("eth_blockNumber", id=3),
+        ]
+    )
+    assert [response["id"] for response in responses] == [1, 2, 3]
+    assert responses[0]["result"] == ["eth_getStorageAt", MORPHO, "0x0", hex(BLOCK)]
+    assert responses[2]["result"] == hex(BLOCK)
+    # block number is answered by the proxy, storage and code are fetched once
+    proxy.handle(request("eth_getStorageAt", MORPHO, "0x0", hex(BLOCK)))
+    assert len(node.requests) == 2
+    assert (proxy.hits, proxy.misses) == (1, 2)
+
+    offline = CachingRpcProxy(RpcCache(BLOCK, tmp_path), offline=True)
+    assert len(offline.cache) == 2
+    assert offline.handle(request("eth_getCode", MORPHO, "latest"))["result"] == [
+        "eth_getCode",
+        MORPHO,
+        hex(BLOCK),
+    ]
+    missing = offline.handle(request("eth_getCode", MORPHO, "0x1", id=7))
+    assert missing["id"] == 7
+    assert "not in fork cache" in missing["error"]["message"]
+    # other blocks have their own cache
+    assert len(RpcCache(BLOCK + 1, tmp_path)) == 0
+
+
+def test_errors_and_empty_results_are_not_cached(tmp_path, node):
+    proxy = CachingRpcProxy(RpcCache(BLOCK, tmp_path), node.url)
+    assert proxy.handle(request("eth_getTransactionReceipt", "0x01"))["result"] is None
+    error = proxy.handle(request("eth_sendRawTransaction", "0x02"))["error"]
+    assert error == {"code": 3, "message": "no"}
+    assert len(proxy.cache) == 0
+
+
+def test_server(tmp_path, node):
+    proxy = CachingRpcProxy(RpcCache(BLOCK, tmp_path), node.url)
+    server = make_server(proxy, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        data = json.dumps(request("eth_chainId")).encode()
+        url = f"http://127.0.0.1:{server.server_address[1]}"
+        with urllib.request.urlopen(urllib.request.Request(url, data=data)) as response:
+            assert json.loads(response.read())["result"] == ["eth_chainId"]
+    finally:
+        server.shutdown()
+        server.server_close()
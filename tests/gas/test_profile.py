@@ -0,0 +1,85 @@
+import json
+
+import pytest
+
+from scripts.gas.profile import (
+    GasProfile,
+    GasRegression,
+    MissingBaseline,
+    baseline_path,
+    report_path,
+    worker_report_path,
+    worker_report_paths,
+)
+
+
+def test_record_within_tolerance():
+    profile = GasProfile({"compound/USDT/harvest": 100_000}, tolerance=0.05)
+    profile.record("compound", "USDT", "harvest", 105_000)
+    profile.record("compound", "DAI", "harvest", 500_000)
+    assert profile.results == {
+        "compound/USDT/harvest": 105_000,
+        "compound/DAI/harvest": 500_000,
+    }
+
+
+def test_regression_fails():
+    profile = GasProfile({"aave/DAI/withdraw": 100_000}, tolerance=0.05)
+    with pytest.raises(GasRegression, match="aave/DAI/withdraw used 105001 gas"):
+        profile.record("aave", "DAI", "withdraw", 105_001)
+    # update mode accepts any value
+    GasProfile({"aave/DAI/withdraw": 100_000}, update=True).record(
+        "aave", "DAI", "withdraw", 200_000
+    )
+
+
+def test_missing_baseline_fails_in_strict_mode():
+    profile = GasProfile({"aave/DAI/withdraw": 100_000}, strict=True)
+    profile.record("aave", "DAI", "withdraw", 100_000)
+    with pytest.raises(MissingBaseline, match="aave/USDC/withdraw used 90000 gas"):
+        profile.record("aave", "USDC", "withdraw", 90_000)
+    with pytest.raises(MissingBaseline):
+        GasProfile(None, strict=True).record("aave", "DAI", "withdraw", 1)
+    # new baseline is recorded in update mode
+    GasProfile(None, update=True, strict=True).record("aave", "USDC", "withdraw", 1)
+
+
+def test_paths_per_network():
+    assert report_path("development") != report_path("mainnet-fork")
+    assert baseline_path("development").name == "development.json"
+    assert baseline_path("mainnet-fork").parent == baseline_path("development").parent
+    # worker reports of one network are not merged into the other
+    assert not worker_report_path("gw0", report_path("mainnet-fork")).match(
+        worker_report_path("gw*", report_path("development")).name
+    )
+
+
+def test_report_and_baseline(tmp_path):
+    profile = GasProfile({"a/X/s": 100, "a/Y/s": 50}, update=True)
+    profile.record("a", "X", "s", 110)
+    profile.save_report(tmp_path / "reports" / "gas.json")
+    profile.save_baseline(tmp_path / "baseline.json")
+
+    report = json.loads((tmp_path / "reports" / "gas.json").read_text())
+    assert report["results"] == {"a/X/s": {"gas": 110, "baseline": 100, "change": 0.1}}
+    assert GasProfile.load_baseline(tmp_path / "baseline.json") == {
+        "a/X/s": 110,
+        "a/Y/s": 50,
+    }
+    assert GasProfile.load_baseline(tmp_path / "missing.json") is None
+
+
+def test_merge_worker_reports(tmp_path):
+    path = tmp_path / "gas.json"
+    first = GasProfile({"a/X/s": 100})
+    first.record("a", "X", "s", 101)
+    first.save_report(worker_report_path("gw0", path))
+    second = GasProfile({"a/X/s": 100})
+    second.record("c", "Y", "s", 200)
+    second.save_report(worker_report_path("gw1", path))
+
+    paths = worker_report_paths(path)
+    assert [p.name for p in paths] == ["gas-gw0.json", "gas-gw1.json"]
+    profile = GasProfile.merge(paths, {"a/X/s": 100}, update=True)
+    assert profile.results == {"a/X/s": 101, "c/Y/s": 200}
+    assert profile.update
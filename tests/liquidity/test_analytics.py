@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+
+from scripts.liquidity import analytics
+from scripts.liquidity.analytics import (
+    load_all,
+    load_csv,
+    load_storage,
+    market_p2p_utilisation,
+    p2p_headroom,
+    p2p_match_ratio,
+    rolling,
+)
+from scripts.liquidity.storage import ColumnarStorage, CsvStorage
+
+ROWS = [
+    (1664458071, 0, 0, 0, 100, 90, 300, 200, 80),
+    (1664461671, 10**24, 25 * 10**22, 75 * 10**22, 200, 190, 200, 150, 10**24),
+    (1664465271, 10**24, 10**24, 0, 300, 290, 100, 100, 10**24),
+]
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    storage = CsvStorage(tmp_path / "data")
+    (tmp_path / "data").mkdir()
+    storage.append("0x01", ROWS)
+    return storage.path("0x01")
+
+
+def test_load_csv_is_cached_and_memory_mapped(tmp_path, csv_path):
+    analytics._loaded.clear()
+    data = load_csv(csv_path, tmp_path / "cache")
+    assert isinstance(data.values, np.memmap)
+    assert data.timestamps.tolist() == [row[0] for row in ROWS]
+    assert load_csv(csv_path, tmp_path / "cache") is data
+
+    # changed file is parsed again and the old cache is removed
+    CsvStorage(csv_path.parent).append("0x01", [ROWS[-1]])
+    assert len(load_csv(csv_path, tmp_path / "cache")) == 4
+    assert len(list((tmp_path / "cache").glob("*.npy"))) == 1
+
+
+def test_load_all_and_storage(tmp_path, csv_path):
+    data = load_all(csv_path.parent, tmp_path / "cache")
+    assert list(data) == ["0x01"]
+
+    columnar = ColumnarStorage(tmp_path / "columnar")
+    columnar.append("0x01", ROWS)
+    from_storage = load_storage(columnar, "0x01", start=ROWS[1][0])
+    assert np.array_equal(from_storage.values, data["0x01"].values[1:])
+
+
+def test_metrics(tmp_path, csv_path):
+    data = load_csv(csv_path, tmp_path / "cache")
+    ratio = p2p_match_ratio(data)
+    assert np.isnan(ratio[0])
+    assert ratio[1:].tolist() == [0.25, 1.0]
+    assert market_p2p_utilisation(data).tolist() == [0.25, 0.5, 0.75]
+    assert np.allclose(p2p_headroom(data), [80, 7.5e23, 0])
+    assert len(data.between(ROWS[1][0], ROWS[2][0])) == 2
+
+
+def test_rolling():
+    stats = rolling([1, 2, 3, 4, 5], 3)
+    assert np.isnan(stats["mean"][:2]).all()
+    assert stats["mean"][2:].tolist() == [2, 3, 4]
+    assert stats["min"][2:].tolist() == [1, 2, 3]
+    assert stats["max"][2:].tolist() == [3, 4, 5]
+    assert np.allclose(stats["std"][2:], np.std([1, 2, 3]))
+    assert np.isnan(rolling([1], 3)["mean"]).all()
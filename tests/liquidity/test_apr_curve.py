@@ -0,0 +1,81 @@
+import numpy as np
+
+import scripts.liquidity.apr_curve as apr_curve_module
+from scripts.liquidity.apr_curve import AprCurve, AprCurveCache, amount_grid
+
+
+def make_curve(block=100):
+    # 1000 can be matched P2P, the rest goes to pool
+    amounts = [0, 10, 100, 1000, 10000]
+    return AprCurve(
+        "0x01",
+        block,
+        amounts,
+        [0, 10, 100, 1000, 1000],
+        [0, 0, 0, 0, 9000],
+        [5 * 10**16, 5 * 10**16, 4 * 10**16, 3 * 10**16, 2 * 10**16],
+    )
+
+
+def test_amount_grid():
+    grid = amount_grid(10**6, 10**15, 10)
+    assert grid[0] == 0
+    assert grid[1] == 10**6
+    assert grid[-1] == 10**15
+    assert grid == sorted(grid)
+    assert len(grid) == 11
+
+
+def test_interpolation():
+    curve = make_curve()
+    balance_in_p2p, balance_on_pool, apr = curve(550)
+    assert balance_in_p2p == 550
+    assert balance_on_pool == 0
+    assert np.isclose(apr, 3.5 * 10**16)
+
+    balance_in_p2p, balance_on_pool, _ = curve(np.array([5500, 10**6]))
+    assert balance_in_p2p.tolist() == [1000, 1000]
+    assert balance_on_pool.tolist() == [4500, 9000]
+    assert np.allclose(
+        curve.p2p_share([0, 10, 5500]), [np.nan, 1, 1000 / 5500], equal_nan=True
+    )
+
+
+def test_cache(tmp_path):
+    class Strategy:
+        address = "0x01"
+
+    curve = make_curve()
+    cache = AprCurveCache(tmp_path)
+    curve.save(cache.path("0x01", 100))
+
+    # cached on disk, no calls are made
+    loaded = cache.get(None, Strategy, 100, [])
+    assert loaded.block == 100
+    assert loaded.apr.tolist() == curve.apr.tolist()
+    assert cache.get(None, Strategy, 100, []) is loaded
+
+
+def test_cache_resolves_latest_block(tmp_path, monkeypatch):
+    class Strategy:
+        address = "0x01"
+
+    sampled = []
+
+    def sample_apr_curve(multicall, strategy, amounts, block_identifier=None):
+        sampled.append(block_identifier)
+        return make_curve(block=120 + len(sampled))
+
+    monkeypatch.setattr(apr_curve_module, "sample_apr_curve", sample_apr_curve)
+    cache = AprCurveCache(tmp_path)
+
+    # latest block is sampled on every call and cached under the mined block
+    assert cache.get(None, Strategy, None, []).block == 121
+    assert cache.get(None, Strategy, None, []).block == 122
+    assert sampled == [None, None]
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        "0x01-121.npz",
+        "0x01-122.npz",
+    ]
+    assert cache.get(None, Strategy, 121, []).block == 121
+    assert len(sampled) == 2
@@ -0,0 +1,67 @@
+import time
+
+from scripts.liquidity.async_collector import collect_rows
+
+
+def test_rows_keep_order_of_addresses():
+    delays = {"a": 0.05, "b": 0.01, "c": 0.03}
+
+    def fetch_row(address):
+        time.sleep(delays[address])
+        return (address,)
+
+    results = collect_rows(["a", "b", "c"], fetch_row, concurrency=3)
+    assert [result.key for result in results] == ["a", "b", "c"]
+    assert [result.row for result in results] == [("a",), ("b",), ("c",)]
+
+
+def test_failing_strategy_does_not_block_others():
+    def fetch_row(address):
+        if address == "bad":
+            raise ValueError("rpc error")
+        if address == "slow":
+            time.sleep(1)
+        return (address,)
+
+    start = time.perf_counter()
+    results = collect_rows(
+        ["bad", "slow", "ok"], fetch_row, timeout=0.1, retries=1, backoff=0.01
+    )
+    assert time.perf_counter() - start < 1
+
+    bad, slow, ok = results
+    assert isinstance(bad.error, ValueError) and bad.attempts == 2
+    assert slow.row is None and slow.attempts == 2
+    assert ok.row == ("ok",) and ok.attempts == 1
+
+
+def test_retry_with_backoff():
+    calls = []
+
+    def fetch_row(address):
+        calls.append(time.perf_counter())
+        if len(calls) < 3:
+            raise ConnectionError()
+        return (address,)
+
+    (result,) = collect_rows(["a"], fetch_row, retries=3, backoff=0.05)
+    assert result.row == ("a",)
+    assert result.attempts == 3
+    # backoff doubles after each failed attempt
+    assert calls[2] - calls[1] > calls[1] - calls[0] >= 0.05
+
+
+def test_concurrency_limit():
+    running = []
+    peak = []
+
+    def fetch_row(address):
+        running.append(address)
+        peak.append(len(running))
+        time.sleep(0.02)
+        running.remove(address)
+        return (address,)
+
+    results = collect_rows(list(range(10)), fetch_row, concurrency=2)
+    assert all(result.error is None for result in results)
+    assert max(peak) <= 2
@@ -0,0 +1,99 @@
+from collections import namedtuple
+
+import scripts.liquidity.backfill as backfill_module
+from scripts.liquidity.backfill import BACKFILL_CSV_HEADER, backfill, backfill_blocks
+
+Strategy = namedtuple("Strategy", ["address"])
+STRATEGIES = [Strategy("0x01"), Strategy("0x02")]
+
+
+def fake_rows(failing_blocks=()):
+    fetched = []
+
+    def fetch_liquidity_rows(multicall, strategies, block_identifier=None):
+        fetched.append(block_identifier)
+        if block_identifier in failing_blocks:
+            raise ConnectionError("missing trie node")
+        rows = [
+            (block_identifier * 12, i, 0, 0, 0, 0, 0, 0, 0)
+            for i, _ in enumerate(strategies)
+        ]
+        return block_identifier, rows
+
+    return fetch_liquidity_rows, fetched
+
+
+def read_blocks(path):
+    lines = path.read_text().splitlines()
+    assert lines[0] + "\n" == BACKFILL_CSV_HEADER
+    return [int(line.split(",")[0]) for line in lines[1:]]
+
+
+def test_backfill_blocks():
+    assert backfill_blocks(100, 120, 10) == [100, 110, 120]
+    assert backfill_blocks(100, 125, 10) == [100, 110, 120]
+
+
+def test_backfill_writes_rows_keyed_by_block(tmp_path, monkeypatch):
+    fetch, _ = fake_rows()
+    monkeypatch.setattr(backfill_module, "fetch_liquidity_rows", fetch)
+
+    last_block = backfill(
+        None, STRATEGIES, backfill_blocks(10, 100, 10), tmp_path, chunk_size=3
+    )
+    assert last_block == 100
+
+    first = (tmp_path / "strategy_0x01.csv").read_text().splitlines()
+    assert first[1] == "10,120,0,0,0,0,0,0,0,0"
+    for strategy in STRATEGIES:
+        blocks = read_blocks(tmp_path / f"strategy_{strategy.address}.csv")
+        assert blocks == list(range(10, 101, 10))
+
+
+def test_backfill_resumes_from_checkpoint(tmp_path, monkeypatch):
+    blocks = backfill_blocks(10, 100, 10)
+    fetch, _ = fake_rows(failing_blocks=(70,))
+    monkeypatch.setattr(backfill_module, "fetch_liquidity_rows", fetch)
+    # chunk with the failing block is not stored
+    assert backfill(None, STRATEGIES, blocks, tmp_path, chunk_size=3, retries=0) == 60
+
+    fetch, fetched = fake_rows()
+    monkeypatch.setattr(backfill_module, "fetch_liquidity_rows", fetch)
+    assert backfill(None, STRATEGIES, blocks, tmp_path, chunk_size=3) == 100
+    assert sorted(fetched) == [70, 80, 90, 100]
+    assert read_blocks(tmp_path / "strategy_0x02.csv") == blocks
+
+
+def test_backfill_skips_rows_written_after_checkpoint(tmp_path, monkeypatch):
+    fetch, _ = fake_rows()
+    monkeypatch.setattr(backfill_module, "fetch_liquidity_rows", fetch)
+    blocks = backfill_blocks(10, 50, 10)
+    backfill(None, STRATEGIES, blocks, tmp_path, chunk_size=2)
+
+    # lost checkpoint, stored blocks are neither fetched again nor duplicated
+    (tmp_path / "checkpoint.json").unlink()
+    backfill(None, STRATEGIES, blocks, tmp_path, chunk_size=2)
+    assert read_blocks(tmp_path / "strategy_0x01.csv") == blocks
+
+
+def test_backfill_warns_about_blocks_already_stored(tmp_path, monkeypatch, capsys):
+    fetch, _ = fake_rows()
+    monkeypatch.setattr(backfill_module, "fetch_liquidity_rows", fetch)
+    backfill(None, STRATEGIES, backfill_blocks(50, 100, 10), tmp_path)
+
+    # earlier range can't be appended to the same files
+    fetch, fetched = fake_rows()
+    monkeypatch.setattr(backfill_module, "fetch_liquidity_rows", fetch)
+    assert backfill(None, STRATEGIES, backfill_blocks(10, 40, 10), tmp_path) is None
+    assert fetched == []
+    assert "WARNING: Skipping 4 blocks from 10 to 40" in capsys.readouterr().out
+    assert read_blocks(tmp_path / "strategy_0x01.csv") == list(range(50, 101, 10))
+
+
+def test_backfill_rewrites_empty_file(tmp_path, monkeypatch):
+    fetch, _ = fake_rows()
+    monkeypatch.setattr(backfill_module, "fetch_liquidity_rows", fetch)
+    (tmp_path / "strategy_0x01.csv").touch()
+
+    assert backfill(None, STRATEGIES, backfill_blocks(10, 30, 10), tmp_path) == 30
+    assert read_blocks(tmp_path / "strategy_0x01.csv") == [10, 20, 30]
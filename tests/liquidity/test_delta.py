@@ -0,0 +1,82 @@
+from scripts.liquidity.delta import decode_delta, encode_delta, has_changed, resample
+from scripts.liquidity.storage import CsvStorage, DeltaCsvStorage
+
+ADDRESS = "0x01"
+
+
+def make_rows():
+    # only strategy balance and max P2P supply move
+    rows = []
+    for i in range(100):
+        balance = 10**24 + (i // 10) * 10**18
+        rows.append(
+            (
+                1664458071 + i * 60,
+                balance,
+                balance,
+                0,
+                5,
+                5,
+                7,
+                9,
+                10**21 + i * 10**18,
+            )
+        )
+    return rows
+
+
+def test_encode_and_decode():
+    rows = make_rows()[:3]
+    lines = []
+    previous = None
+    for row in rows:
+        lines.append(encode_delta(previous, row))
+        previous = row
+    assert lines[1] == [str(rows[1][0]), "", "", "", "", "", "", "", str(10**18)]
+    assert decode_delta(lines) == rows
+
+
+def test_has_changed_threshold():
+    previous = (1, 1000, 0)
+    assert not has_changed(previous, (2, 1000, 0))
+    assert has_changed(previous, (2, 1001, 0))
+    assert not has_changed(previous, (2, 1001, 0), threshold=0.01)
+    assert has_changed(previous, (2, 1011, 0), threshold=0.01)
+    assert has_changed(previous, (2, 1000, 1), threshold=0.01)
+
+
+def test_storage_skips_rows_below_threshold(tmp_path):
+    (tmp_path / "csv").mkdir()
+    rows = make_rows()
+    storage = DeltaCsvStorage(tmp_path, threshold=0.01)
+    storage.append(ADDRESS, rows[:50])
+    # new instance continues from the last stored row
+    DeltaCsvStorage(tmp_path, threshold=0.01).append(ADDRESS, rows[50:])
+
+    stored = storage.decode(ADDRESS)
+    # max P2P supply moves by 0.1% per row and balance by 0.0001% per 10 rows
+    assert [row[0] for row in stored] == [row[0] for row in rows[::11]]
+    CsvStorage(tmp_path / "csv").append(ADDRESS, rows)
+    csv_size = CsvStorage(tmp_path / "csv").path(ADDRESS).stat().st_size
+    assert storage.path(ADDRESS).stat().st_size * 10 < csv_size
+
+
+def test_storage_without_threshold_is_lossless(tmp_path):
+    rows = make_rows()
+    storage = DeltaCsvStorage(tmp_path)
+    storage.append(ADDRESS, rows + [rows[-1]])
+    assert storage.decode(ADDRESS) == rows
+
+
+def test_resample_rebuilds_time_series(tmp_path):
+    rows = make_rows()
+    storage = DeltaCsvStorage(tmp_path, threshold=0.01)
+    storage.append(ADDRESS, rows)
+
+    timestamps = [rows[0][0] - 1] + [row[0] for row in rows]
+    series = resample(storage.decode(ADDRESS), timestamps)
+    assert series[0] is None
+    for row, sample in zip(rows, series[1:]):
+        assert sample[0] == row[0]
+        for old, new in zip(sample[1:], row[1:]):
+            assert abs(new - old) <= 0.01 * old
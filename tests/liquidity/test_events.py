@@ -0,0 +1,100 @@
+import pytest
+
+from scripts.liquidity.events import (
+    MORPHO_TOPICS,
+    BlockFollower,
+    MorphoEventWatcher,
+    RowDeduplicator,
+)
+
+MORPHO = "0x8888882f8f843896699869179fB6E4f7e3B58888"
+OTHER_MORPHO = "0x777777c9898D384F785Ee44Acfe945efDFf5f3E0"
+CUSDC = "0x39AA39c021dfbaE8faC545936693aC917d5E7563"
+CDAI = "0x5d3a536E4D6DbD6114cc1Ead35777bAB948E3643"
+
+
+def topic(address):
+    return "0x" + "0" * 24 + address.lower()[2:]
+
+
+class FakeEth:
+    def __init__(self, logs=(), block_numbers=()):
+        self.logs = list(logs)
+        self.block_numbers = list(block_numbers)
+        self.filters = []
+
+    def get_logs(self, params):
+        self.filters.append(params)
+        return [
+            log
+            for log in self.logs
+            if params["fromBlock"] <= log["blockNumber"] <= params["toBlock"]
+        ]
+
+    @property
+    def block_number(self):
+        return self.block_numbers.pop(0)
+
+
+class FakeWeb3:
+    def __init__(self, eth):
+        self.eth = eth
+
+
+def log(block, morpho, event_topic, *indexed):
+    return {
+        "blockNumber": block,
+        "address": morpho,
+        "topics": [event_topic] + [topic(address) for address in indexed],
+    }
+
+
+def test_watcher_triggers_only_tracked_markets():
+    strategies = {
+        "usdc_strategy": (MORPHO, CUSDC),
+        "dai_strategy": (MORPHO, CDAI),
+        "aave_strategy": (OTHER_MORPHO, CUSDC),
+    }
+    supplied, p2p_updated = MORPHO_TOPICS[0], MORPHO_TOPICS[4]
+    eth = FakeEth(
+        [
+            log(10, MORPHO, supplied, "0x01", "0x01", CDAI),
+            log(11, MORPHO, p2p_updated, CUSDC),
+            log(12, OTHER_MORPHO, supplied, "0x01", "0x01", CDAI),
+        ]
+    )
+    watcher = MorphoEventWatcher(FakeWeb3(eth), strategies)
+
+    assert watcher.changed(10, 12) == ["usdc_strategy", "dai_strategy"]
+    assert watcher.changed(12, 12) == []
+    assert eth.filters[0]["topics"] == [MORPHO_TOPICS]
+    assert eth.filters[0]["address"] == [OTHER_MORPHO, MORPHO]
+
+
+def test_follower_ranges():
+    follower = BlockFollower(FakeWeb3(FakeEth()), 100, max_range=10)
+    assert list(follower.ranges(100)) == []
+    assert list(follower.ranges(125)) == [(101, 110), (111, 120), (121, 125)]
+    assert list(follower.ranges(126)) == [(126, 126)]
+
+
+def test_follower_polls_new_blocks():
+    eth = FakeEth(block_numbers=[100, 102, 102, 103])
+    follower = BlockFollower(FakeWeb3(eth), 100, poll_interval=0)
+    ranges = iter(follower)
+    assert next(ranges) == (101, 102)
+    assert next(ranges) == (103, 103)
+
+
+def test_follower_unknown_mode():
+    with pytest.raises(ValueError):
+        BlockFollower(FakeWeb3(FakeEth()), 0, mode="websocket")
+
+
+def test_deduplicator_ignores_timestamp():
+    dedup = RowDeduplicator()
+    assert dedup.is_new("a", (1, 10, 20))
+    assert not dedup.is_new("a", (2, 10, 20))
+    assert dedup.is_new("b", (2, 10, 20))
+    assert dedup.is_new("a", (3, 11, 20))
+    assert dedup.is_new("a", (4, 10, 20))
@@ -0,0 +1,116 @@
+import numpy as np
+import pytest
+
+from scripts.liquidity.rows import COLUMNS
+from scripts.liquidity.storage import (
+    ColumnarStorage,
+    CsvStorage,
+    convert_csv,
+    get_storage,
+    u256_from_ints,
+    u256_to_float,
+    u256_to_ints,
+)
+
+ADDRESS = "0x01"
+MAX_UINT256 = 2**256 - 1
+
+
+def make_rows(count):
+    return [
+        (
+            1664458071 + i * 3600,
+            i,
+            2**128 + i,
+            MAX_UINT256 - i,
+            0,
+            1,
+            2,
+            3,
+            10**30 + i,
+        )
+        for i in range(count)
+    ]
+
+
+def test_u256_conversion_is_lossless():
+    values = [0, 1, 2**64, 2**128 - 1, 2**200 + 7, MAX_UINT256]
+    limbs = u256_from_ints(values)
+    assert limbs.shape == (len(values), 4)
+    assert u256_to_ints(limbs) == values
+    assert u256_to_float(limbs)[3] == float(2**128 - 1)
+
+
+@pytest.mark.parametrize("name", ["csv", "columnar", "delta"])
+def test_append_and_read(tmp_path, name):
+    storage = get_storage(name, tmp_path)
+    rows = make_rows(10)
+    storage.append(ADDRESS, rows[:4])
+    storage.append(ADDRESS, rows[4:])
+
+    data = storage.read(ADDRESS)
+    assert list(data) == list(COLUMNS)
+    for i, column in enumerate(COLUMNS):
+        assert u256_to_ints(data[column]) == [row[i] for row in rows]
+
+
+@pytest.mark.parametrize("name", ["csv", "columnar", "delta"])
+def test_read_columns_and_time_range(tmp_path, name):
+    storage = get_storage(name, tmp_path)
+    rows = make_rows(10)
+    storage.append(ADDRESS, rows)
+
+    columns = ("Timestamp", "Strategy Balance On Pool")
+    data = storage.read(ADDRESS, columns, start=rows[2][0], end=rows[5][0] + 1)
+    assert list(data) == list(columns)
+    assert u256_to_ints(data["Timestamp"]) == [row[0] for row in rows[2:6]]
+    assert u256_to_ints(data["Strategy Balance On Pool"]) == [
+        row[3] for row in rows[2:6]
+    ]
+
+
+def test_columnar_read_is_memory_mapped(tmp_path):
+    storage = ColumnarStorage(tmp_path)
+    storage.append(ADDRESS, make_rows(3))
+    column = storage.read(ADDRESS, ["Max P2P Supply"])["Max P2P Supply"]
+    assert isinstance(column, np.memmap)
+
+
+def test_columnar_ignores_incomplete_rows(tmp_path):
+    storage = ColumnarStorage(tmp_path)
+    storage.append(ADDRESS, make_rows(3))
+    # simulate interrupted append of the next row
+    with open(storage.column_path(ADDRESS, COLUMNS[0]), "ab") as column_file:
+        column_file.write(u256_from_ints([1]).tobytes())
+    assert storage.count(ADDRESS) == 3
+    assert len(storage.read(ADDRESS)["Timestamp"]) == 3
+
+
+def test_columnar_count_without_columns(tmp_path):
+    storage = ColumnarStorage(tmp_path)
+    assert storage.count(ADDRESS) == 0
+    assert len(storage.read(ADDRESS)["Timestamp"]) == 0
+
+
+def test_columnar_count_includes_buffered_rows(tmp_path):
+    storage = ColumnarStorage(tmp_path, keep_open=True)
+    storage.append(ADDRESS, make_rows(3))
+    assert storage.count(ADDRESS) == 3
+    storage.close()
+
+
+def test_convert_csv(tmp_path):
+    csv_storage = CsvStorage(tmp_path)
+    rows = make_rows(25)
+    csv_storage.append(ADDRESS, rows)
+
+    columnar = ColumnarStorage(tmp_path / "columnar")
+    assert convert_csv(csv_storage, columnar, ADDRESS, chunk_size=10) == 25
+    data = columnar.read(ADDRESS)
+    for i, column in enumerate(COLUMNS):
+        assert u256_to_ints(data[column]) == [row[i] for row in rows]
+
+
+def test_unknown_storage(tmp_path):
+    with pytest.raises(ValueError):
+        get_storage("parquet", tmp_path)
@@ -0,0 +1,119 @@
+from scripts.liquidity.rows import CSV_HEADER
+from scripts.liquidity.storage import CsvStorage, get_storage, u256_to_ints
+from scripts.liquidity.writer import BufferedWriter
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class SyncCounter(CsvStorage):
+    syncs = 0
+
+    def sync(self):
+        self.syncs += 1
+        super().sync()
+
+
+def make_row(i):
+    return (1664458071 + i, i, 0, i, 0, 0, 0, 0, 0)
+
+
+def read_lines(storage, address):
+    return storage.path(address).read_text().splitlines()
+
+
+def test_flush_on_size_threshold(tmp_path):
+    storage = CsvStorage(tmp_path, keep_open=True)
+    writer = BufferedWriter(storage, flush_rows=3, flush_interval=60, clock=Clock())
+    for i in range(2):
+        writer.write("0x01", make_row(i))
+    assert not storage.path("0x01").exists()
+
+    writer.write("0x01", make_row(2))
+    assert len(read_lines(storage, "0x01")) == 4
+    writer.close()
+
+
+def test_flush_on_time_threshold(tmp_path):
+    clock = Clock()
+    storage = CsvStorage(tmp_path, keep_open=True)
+    writer = BufferedWriter(storage, flush_rows=100, flush_interval=60, clock=clock)
+    writer.write("0x01", make_row(0))
+    writer.write("0x02", make_row(1))
+    clock.now = 59
+    writer.tick()
+    assert not storage.path("0x01").exists()
+
+    clock.now = 60
+    writer.tick()
+    assert read_lines(storage, "0x01")[0] + "\n" == CSV_HEADER
+    assert read_lines(storage, "0x02")[1] == ",".join(map(str, make_row(1)))
+    writer.close()
+
+
+def test_time_threshold_is_kept_per_strategy(tmp_path):
+    clock = Clock()
+    storage = CsvStorage(tmp_path, keep_open=True)
+    writer = BufferedWriter(storage, flush_rows=2, flush_interval=60, clock=clock)
+    writer.write("0x01", make_row(0))
+    clock.now = 50
+    # size threshold of another strategy doesn't delay the time threshold of 0x01
+    writer.write("0x02", make_row(1))
+    writer.write("0x02", make_row(2))
+    assert len(read_lines(storage, "0x02")) == 3
+
+    clock.now = 60
+    writer.write("0x02", make_row(3))
+    writer.tick()
+    assert len(read_lines(storage, "0x01")) == 2
+    assert len(read_lines(storage, "0x02")) == 3
+
+    clock.now = 110
+    writer.tick()
+    assert len(read_lines(storage, "0x02")) == 4
+    writer.close()
+
+
+def test_fsync_schedule(tmp_path):
+    clock = Clock()
+    storage = SyncCounter(tmp_path, keep_open=True)
+    writer = BufferedWriter(storage, flush_rows=1, fsync_interval=300, clock=clock)
+    writer.write("0x01", make_row(0))
+    clock.now = 299
+    writer.write("0x01", make_row(1))
+    assert storage.syncs == 0
+
+    clock.now = 300
+    writer.write("0x01", make_row(2))
+    assert storage.syncs == 1
+    writer.close()
+    assert storage.syncs == 2
+    assert len(read_lines(storage, "0x01")) == 4
+
+
+def test_file_handles_stay_open(tmp_path):
+    storage = get_storage("columnar", tmp_path, keep_open=True)
+    with BufferedWriter(storage, flush_rows=1) as writer:
+        writer.write("0x01", make_row(0))
+        handles = dict(storage._files)
+        writer.write("0x01", make_row(1))
+        assert storage._files == handles
+    assert storage._files == {}
+    assert u256_to_ints(storage.read("0x01")["Timestamp"]) == [
+        make_row(0)[0],
+        make_row(1)[0],
+    ]
+
+
+def test_existing_file_is_appended(tmp_path):
+    CsvStorage(tmp_path).append("0x01", [make_row(0)])
+    with BufferedWriter(CsvStorage(tmp_path, keep_open=True)) as writer:
+        writer.write("0x01", make_row(1))
+    lines = read_lines(CsvStorage(tmp_path), "0x01")
+    assert lines.count(CSV_HEADER.strip()) == 1
+    assert len(lines) == 3
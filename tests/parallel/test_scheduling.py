@@ -0,0 +1,25 @@
+from scripts.parallel.scheduling import split_group
+
+
+def test_tests_of_protocol_and_token_share_group():
+    assert split_group("tests/aave/test_setup_aave.py::test_deposit[USDT]") == (
+        "tests/aave[USDT]"
+    )
+    assert split_group("tests/aave/test_gas_aave.py::test_harvest_gas[USDT]") == (
+        "tests/aave[USDT]"
+    )
+    assert split_group("tests/compound/test_migration.py::test_migration[USDT]") == (
+        "tests/compound[USDT]"
+    )
+    assert split_group("tests/compound/test_gas.py::test_tend_gas[WBTC-extra]") == (
+        "tests/compound[WBTC]"
+    )
+
+
+def test_tests_without_token_are_grouped_by_module():
+    assert split_group("tests/gas/test_gas_profile.py::test_regression_fails") == (
+        "tests/gas/test_gas_profile.py"
+    )
+    assert split_group("tests/liquidity/test_rows.py::TestRows::test_row") == (
+        "tests/liquidity/test_rows.py"
+    )
@@ -0,0 +1,105 @@
+import numpy as np
+
+from scripts.liquidity.analytics import LiquidityData
+from scripts.liquidity.apr_curve import AprCurve
+from scripts.liquidity.rows import COLUMNS
+from scripts.simulation.keeper import (
+    SECONDS_PER_YEAR,
+    apr_from_curves,
+    best_schedule,
+    gas_cost_in_want,
+    simulate_keeper,
+)
+
+HOUR = 3600
+DAY = 24 * HOUR
+
+
+def liquidity(timestamps, balance):
+    values = np.zeros((len(timestamps), len(COLUMNS)))
+    values[:, COLUMNS.index("Timestamp")] = timestamps
+    values[:, COLUMNS.index("Strategy Total Balance")] = balance
+    return LiquidityData(values)
+
+
+def simulate_one(data, apr, interval, threshold, cost, reward_apr, reward_price):
+    # straightforward loop over one combination, reference for the vectorized simulation
+    timestamps = data["Timestamp"]
+    balance = data["Strategy Total Balance"]
+    pending = reinvested = gas = 0.0
+    last = timestamps[0]
+    for row in range(1, len(timestamps)):
+        period = (timestamps[row] - timestamps[row - 1]) / SECONDS_PER_YEAR
+        reinvested *= 1 + apr[row - 1] / 1e18 * period
+        pending += (balance[row - 1] + reinvested) * reward_apr * period / reward_price
+        if timestamps[row] - last >= interval:
+            gas += cost
+            last = timestamps[row]
+            if pending > threshold:
+                reinvested += pending * reward_price
+                pending = 0.0
+    return reinvested, gas
+
+
+def test_interest_and_gas():
+    timestamps = np.arange(0, SECONDS_PER_YEAR + 1, HOUR)
+    data = liquidity(timestamps, 10**24)
+    result = simulate_keeper(
+        data, 5 * 10**16, [DAY, 7 * DAY], [0], harvest_cost=10**20
+    )
+    assert np.allclose(result.interest, 5e22)
+    assert result.harvests[:, 0].tolist() == [365, 52]
+    assert np.allclose(result.gas_cost[:, 0], [365e20, 52e20])
+    assert np.all(result.rewards == 0)
+    assert np.allclose(result.net_yield, result.interest - result.gas_cost)
+    assert np.allclose(result.net_apr[1, 0], 0.05 - 52e20 / 1e24, rtol=1e-3)
+
+
+def test_matches_reference_loop():
+    rng = np.random.default_rng(1)
+    timestamps = np.cumsum(rng.integers(HOUR, 6 * HOUR, 500))
+    data = liquidity(timestamps, rng.uniform(10**23, 10**24, 500))
+    apr = rng.uniform(2 * 10**16, 6 * 10**16, 500)
+    intervals = [HOUR, DAY, 3 * DAY]
+    thresholds = [0, 10**20, 10**21, 10**30]
+    result = simulate_keeper(
+        data, apr, intervals, thresholds, 10**19, reward_apr=0.02, reward_price=2
+    )
+    for i, interval in enumerate(intervals):
+        for j, threshold in enumerate(thresholds):
+            rewards, gas = simulate_one(
+                data, apr, interval, threshold, 10**19, 0.02, 2
+            )
+            assert np.isclose(result.rewards[i, j], rewards)
+            assert np.isclose(result.gas_cost[i, j], gas)
+    # rewards above every balance are never claimed
+    assert np.all(result.rewards[:, -1] == 0)
+
+
+def test_best_schedule():
+    timestamps = np.arange(0, 90 * DAY + 1, HOUR)
+    data = liquidity(timestamps, 10**24)
+    intervals = np.array([HOUR, DAY, 30 * DAY])
+    thresholds = np.array([0, 10**21])
+    result = simulate_keeper(
+        data, 3 * 10**16, intervals, thresholds, 10**20, reward_apr=0.01
+    )
+    assert result.net_yield.shape == (3, 2)
+    interval, threshold, net_yield = best_schedule(result, intervals, thresholds)
+    # gas of a harvest dominates the interest of compounded rewards
+    assert (interval, threshold) == (30 * DAY, 0)
+    assert net_yield == result.net_yield.max()
+
+
+def test_apr_from_curves_and_gas_cost():
+    curves = [
+        AprCurve("0x01", block, [0, 10], [0, 5], [0, 5], [apr, apr / 2])
+        for block, apr in ((1, 4e16), (2, 2e16))
+    ]
+    assert apr_from_curves(curves, [0, 100], [0, 50, 100]).tolist() == [
+        4e16,
+        3e16,
+        2e16,
+    ]
+    # 200k gas at 50 gwei with 2000 USDC for 1 ETH
+    assert gas_cost_in_want(200_000, 50 * 10**9, 2000 * 10**6) == 20 * 10**6
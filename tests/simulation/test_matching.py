@@ -0,0 +1,54 @@
+import numpy as np
+
+from scripts.simulation.matching import OrderBook, max_matches
+
+
+def test_max_matches():
+    assert max_matches(0, 100).tolist() == 0
+    assert max_matches([1, 100, 101, 250], 100).tolist() == [1, 1, 2, 3]
+    assert max_matches([100, 150], 100, base_gas=50).tolist() == [1, 1]
+
+
+def test_matches_largest_borrowers_first():
+    book = OrderBook([10, 50, 30, 5], gas_per_match=100)
+    result = book.supply(70, max_gas=200)
+    assert result.balance_in_p2p == 70
+    assert result.balance_on_pool == 0
+    assert result.matches == 2
+    assert result.gas_used == 200
+    # 50 fully matched, 30 partially
+    assert len(book) == 3
+    assert book.supply(100, max_gas=10**6).balance_in_p2p == 25
+
+
+def test_gas_limits_matching():
+    book = OrderBook([10] * 10, gas_per_match=100)
+    result = book.supply(100, max_gas=300)
+    assert result.balance_in_p2p == 30
+    assert result.balance_on_pool == 70
+    assert book.supply(100, max_gas=0).balance_in_p2p == 0
+
+
+def test_borrow_delta_is_matched_without_gas():
+    book = OrderBook([10], p2p_borrow_delta=15, gas_per_match=100)
+    assert book.supply(20, max_gas=0).balance_in_p2p == 15
+    assert book.supply(20, max_gas=100).balance_in_p2p == 10
+
+
+def test_sweep_matches_heap_simulation():
+    rng = np.random.default_rng(1)
+    borrowers = rng.integers(1, 10**6, size=500).tolist()
+    amounts = np.geomspace(10**3, 10**9, 40)
+    max_gas = np.linspace(0, 2 * 10**6, 50)
+
+    book = OrderBook(borrowers, p2p_borrow_delta=1000, gas_per_match=21_000)
+    p2p = book.sweep(amounts, max_gas)
+    assert p2p.shape == (40, 50)
+    for i in range(0, 40, 7):
+        for j in range(0, 50, 9):
+            expected = OrderBook(
+                borrowers, p2p_borrow_delta=1000, gas_per_match=21_000
+            ).supply(amounts[i], max_gas[j])
+            assert np.isclose(p2p[i, j], expected.balance_in_p2p)
+    # sweep doesn't change the order book
+    assert len(book) == 500